@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-17 03:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='message',
+            name='attachment_sha256',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+    ]
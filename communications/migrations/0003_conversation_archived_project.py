@@ -0,0 +1,20 @@
+# Generated by Django 5.1.4 on 2026-10-17 04:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communications', '0002_message_attachment_sha256'),
+        ('projects', '0012_project_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='conversation',
+            name='archived_project',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='conversations', to='projects.archivedproject'),
+        ),
+    ]
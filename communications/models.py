@@ -1,7 +1,8 @@
 from django.db import models
 from django.conf import settings
 from users.models import User
-from projects.models import Project
+from projects.models import ArchivedProject, Project
+from projects.downloads import file_sha256
 
 class Conversation(models.Model):
     participants = models.ManyToManyField(User, related_name='conversations')
@@ -12,6 +13,14 @@ class Conversation(models.Model):
         null=True,
         blank=True
     )
+    # Set in place of project once projects.archive moves the project out
+    archived_project = models.ForeignKey(
+        ArchivedProject,
+        on_delete=models.SET_NULL,
+        related_name='conversations',
+        null=True,
+        blank=True
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -45,12 +54,20 @@ class Message(models.Model):
         null=True,
         blank=True
     )
+    attachment_sha256 = models.CharField(max_length=64, blank=True, editable=False)
+
+    def save(self, *args, **kwargs):
+        if self.attachment and not self.attachment_sha256:
+            self.attachment_sha256 = file_sha256(self.attachment)
+        super().save(*args, **kwargs)
 
     class Meta:
         ordering = ['created_at']
         indexes = [
             models.Index(fields=['created_at']),
             models.Index(fields=['sender']),
+            # A conversation's messages by time, for its first and latest message
+            models.Index(fields=['conversation', 'created_at']),
         ]
 
 class Notification(models.Model):
@@ -78,7 +95,8 @@ class Notification(models.Model):
     class Meta:
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['recipient']),
+            # A user's notifications, newest first; also covers the recipient lookups
+            models.Index(fields=['recipient', '-created_at']),
             models.Index(fields=['type']),
             models.Index(fields=['read']),
             models.Index(fields=['created_at']),
@@ -0,0 +1,24 @@
+from django.db.models import Count, Max, Q
+
+from freelancerPlatform.query_shapes import query_shape
+from .models import Conversation, Message, Notification
+
+PAGE_SIZE = 20
+
+
+@query_shape('conversation listing')
+def conversation_listing(sample):
+    return Conversation.objects.filter(participants=sample.client).annotate(
+        last_message_time=Max('messages__created_at'),
+        unread_count=Count('messages', filter=~Q(messages__read_by=sample.client))
+    ).order_by('-last_message_time')[:PAGE_SIZE]
+
+
+@query_shape('first message of a conversation')
+def first_message(sample):
+    return Message.objects.filter(conversation_id=sample.conversation_id).order_by('created_at')[:1]
+
+
+@query_shape('notification listing')
+def notification_listing(sample):
+    return Notification.objects.filter(recipient=sample.client).order_by('-created_at')[:PAGE_SIZE]
@@ -1,18 +1,29 @@
 from rest_framework import serializers
 
 from users.models import User
+from projects.thumbnails import is_image, thumbnail_urls
 from .models import Conversation, Message, Notification
 from users.serializers import UserSerializer
 
 class MessageSerializer(serializers.ModelSerializer):
     sender = UserSerializer(read_only=True)
     read_by = UserSerializer(many=True, read_only=True)
+    thumbnails = serializers.SerializerMethodField()
 
     class Meta:
         model = Message
         fields = '__all__'
         read_only_fields = ('conversation', 'sender', 'created_at', 'read_by')
 
+    def get_thumbnails(self, obj):
+        if not obj.attachment or not obj.attachment_sha256 or not is_image(obj.attachment.name):
+            return None
+        return thumbnail_urls(
+            'conversation-messages-thumbnail',
+            {'conversation_pk': obj.conversation_id, 'pk': obj.pk},
+            self.context.get('request')
+        )
+
 class ConversationSerializer(serializers.ModelSerializer):
     participants = UserSerializer(many=True, read_only=True)
     last_message = serializers.SerializerMethodField()
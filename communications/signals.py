@@ -0,0 +1,14 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from projects.thumbnails import is_image
+from .models import Message
+from .tasks import generate_attachment_thumbnails
+
+
+@receiver(post_save, sender=Message)
+def queue_attachment_thumbnails(sender, instance, created, **kwargs):
+    """Render previews for image attachments once the message is committed"""
+    if created and instance.attachment and is_image(instance.attachment.name):
+        transaction.on_commit(lambda: generate_attachment_thumbnails.delay(instance.pk))
@@ -1,8 +1,11 @@
 from celery import shared_task
 from django.core.mail import send_mail
 from django.conf import settings
+from projects.thumbnails import is_image, render_thumbnails
 from .models import Message, Notification
 
+NOTIFICATION_BATCH_SIZE = 1000
+
 
 @shared_task
 def notify_new_message(message_id):
@@ -118,6 +121,45 @@ def notify_project_update(project_id, update_type, message):
         pass
 
 
+@shared_task
+def notify_projects_expired(project_ids, bidders):
+    """
+    In-app notifications for one chunk of expired projects: the client of
+    each project and every freelancer whose pending bid was withdrawn.
+    bidders holds [project_id, freelancer_id] pairs.
+    """
+    from projects import metrics
+    from projects.models import Project
+
+    projects = {
+        pk: (title, client_id)
+        for pk, title, client_id in Project.objects.filter(pk__in=project_ids).values_list('id', 'title', 'client_id')
+    }
+    notifications = [
+        Notification(
+            recipient_id=client_id,
+            type='PROJECT',
+            title=f'Project expired: {title}',
+            message='The deadline passed before a bid was accepted, so the project is no longer open.',
+            link=f'/projects/{pk}/'
+        )
+        for pk, (title, client_id) in projects.items()
+    ]
+    notifications.extend(
+        Notification(
+            recipient_id=freelancer_id,
+            type='BID',
+            title=f'Bid withdrawn: {projects[project_id][0]}',
+            message='The project expired before a bid was accepted, so your bid was withdrawn.',
+            link=f'/projects/{project_id}/'
+        )
+        for project_id, freelancer_id in bidders if project_id in projects
+    )
+    Notification.objects.bulk_create(notifications, batch_size=NOTIFICATION_BATCH_SIZE)
+    metrics.increment('expiry_notifications', len(notifications))
+    return len(notifications)
+
+
 @shared_task
 def notify_milestone_update(milestone_id, update_type):
     """
@@ -156,4 +198,17 @@ def notify_milestone_update(milestone_id, update_type):
                         fail_silently=True
                     )
     except Milestone.DoesNotExist:
-        pass
\ No newline at end of file
+        pass
+
+
+@shared_task
+def generate_attachment_thumbnails(message_id):
+    """
+    Render preview sizes for an image attached to a message
+    """
+    message = Message.objects.filter(pk=message_id).first()
+    if message is None or not message.attachment or not message.attachment_sha256:
+        return 0
+    if not is_image(message.attachment.name):
+        return 0
+    return render_thumbnails(message.attachment.storage, message.attachment.name, message.attachment_sha256)
@@ -0,0 +1,99 @@
+import hashlib
+import io
+import shutil
+import tempfile
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from users.models import User
+from communications.models import Conversation, Message
+from communications.tasks import generate_attachment_thumbnails
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class AttachmentDownloadTests(APITestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.sender = User.objects.create_user(
+            username='attachsender',
+            email='attachsender@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        self.outsider = User.objects.create_user(
+            username='attachoutsider',
+            email='attachoutsider@example.com',
+            password='testpass123',
+            role='FR'
+        )
+        self.conversation = Conversation.objects.create()
+        self.conversation.participants.add(self.sender)
+        self.content = b'attachment body' * 100
+        self.message = Message.objects.create(
+            conversation=self.conversation,
+            sender=self.sender,
+            content='See attached',
+            attachment=SimpleUploadedFile('brief.txt', self.content)
+        )
+        self.url = reverse('conversation-messages-download', kwargs={
+            'conversation_pk': self.conversation.id,
+            'pk': self.message.id
+        })
+
+    def test_hash_recorded_on_save(self):
+        """Test the attachment hash is stored with the message"""
+        self.assertEqual(self.message.attachment_sha256, hashlib.sha256(self.content).hexdigest())
+
+    def test_download_with_range_and_etag(self):
+        """Test participants can download ranges and revalidate"""
+        self.client.force_authenticate(user=self.sender)
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9')
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(b''.join(response.streaming_content), self.content[:10])
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.force_authenticate(user=self.outsider)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_image_attachment_thumbnails(self):
+        """Test image attachments get thumbnail URLs that serve once rendered"""
+        buffer = io.BytesIO()
+        Image.new('RGB', (800, 600), 'teal').save(buffer, 'JPEG')
+        message = Message.objects.create(
+            conversation=self.conversation,
+            sender=self.sender,
+            content='Screenshot',
+            attachment=SimpleUploadedFile('screen.jpg', buffer.getvalue())
+        )
+        self.client.force_authenticate(user=self.sender)
+        response = self.client.get(reverse('conversation-messages-detail', kwargs={
+            'conversation_pk': self.conversation.id,
+            'pk': message.id
+        }))
+        self.assertIsNone(
+            self.client.get(reverse('conversation-messages-detail', kwargs={
+                'conversation_pk': self.conversation.id,
+                'pk': self.message.id
+            })).data['thumbnails']
+        )
+
+        url = response.data['thumbnails']['small']['jpg']
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        generate_attachment_thumbnails(message.id)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
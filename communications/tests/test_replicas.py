@@ -0,0 +1,122 @@
+from datetime import timedelta
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction
+from django.apps import apps
+from django.core.cache import cache
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITransactionTestCase
+from rest_framework import status
+
+from users.models import User
+from communications.models import Notification
+from freelancerPlatform.replicas import (
+    PIN_KEY, ReplicaPinningMiddleware, ReplicaRouter, ais_pinned, is_pinned, replica_reads
+)
+from projects.models import Project
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'])
+class ReplicaRouterTests(SimpleTestCase):
+    def test_reads_routed_only_inside_replica_block(self):
+        """Test reads go to a replica only when asked and writes stay on the primary"""
+        router = ReplicaRouter()
+        self.assertIsNone(router.db_for_read(Project))
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Project), 'replica1')
+            self.assertEqual(router.db_for_write(Project), 'default')
+            with mock.patch.object(connections['default'], 'in_atomic_block', True):
+                self.assertIsNone(router.db_for_read(Project))
+        self.assertFalse(router.allow_migrate('replica1', 'projects'))
+
+    async def test_pinning_middleware_runs_async(self):
+        """Test the pinning middleware stays async under ASGI and pins after a write"""
+        async def get_response(request):
+            return HttpResponse(status=201)
+
+        middleware = ReplicaPinningMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        request = RequestFactory().post('/')
+        request.user = User(pk=4242, username='asyncpin')
+        await cache.adelete(PIN_KEY.format(4242))
+        await middleware(request)
+        self.assertTrue(await ais_pinned(request.user))
+
+
+# No atomic wrapper per test, so the router's open-transaction guard stays out of the way
+@override_settings(DATABASE_REPLICAS=['replica1'])
+class ReplicaReadTests(APITransactionTestCase):
+    @classmethod
+    def setUpClass(cls):
+        # A real second database with the schema but none of the rows, i.e.
+        # a replica lagging far behind the primary. It is added only now, so
+        # the runner does not give it a test database of its own
+        connections.settings['replica1'] = connections.configure_settings({
+            'default': connections.settings['default'],
+            'replica1': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'},
+        })['replica1']
+        with connections['replica1'].schema_editor() as editor:
+            for model in apps.get_models():
+                editor.create_model(model)
+        cls.databases = {'default', 'replica1'}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections['replica1'].close()
+        del connections['replica1']
+        del connections.settings['replica1']
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='replicauser',
+            email='replicauser@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        Notification.objects.create(
+            recipient=self.user,
+            type='SYSTEM',
+            title='Welcome',
+            message='Hello'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_safe_reads_use_replica_until_user_writes(self):
+        """Test list reads hit the replica and a write pins the user to the primary"""
+        response = self.client.get(reverse('notification-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [])
+
+        response = self.client.post(reverse('notification-mark-all-read'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(is_pinned(self.user))
+
+        response = self.client.get(reverse('notification-list'))
+        self.assertEqual(len(response.data), 1)
+        self.assertTrue(response.data[0]['read'])
+
+    def test_cached_listing_built_from_primary(self):
+        """Test a listing page cached under the current generation never holds lagging replica rows"""
+        project = Project.objects.create(
+            title='Replica Project',
+            description='Test Description',
+            client=self.user,
+            budget_min=100.00,
+            budget_max=500.00,
+            deadline=timezone.now() + timedelta(days=30)
+        )
+        # Reads outside the cache fill still go to the replica
+        response = self.client.get(reverse('project-detail', kwargs={'pk': project.id}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        for _ in range(2):
+            response = self.client.get(reverse('project-list'))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual([item['id'] for item in response.data['results']], [project.id])
@@ -8,14 +8,17 @@ from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
+from freelancerPlatform.replicas import ReplicaReadMixin
 
+from projects.downloads import file_download_response, file_sha256
+from projects.thumbnails import THUMBNAIL_FORMAT_PATTERN, THUMBNAIL_SIZE_PATTERN, thumbnail_response
 from .models import Conversation, Message, Notification
 from .serializers import (
     ConversationSerializer, ConversationCreateSerializer,
     MessageSerializer, NotificationSerializer
 )
 
-class ConversationViewSet(viewsets.ModelViewSet):
+class ConversationViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing conversations.
     """
@@ -104,7 +107,53 @@ class MessageViewSet(viewsets.ModelViewSet):
         # Update conversation timestamp
         conversation.save()  # This updates the updated_at field
 
-class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
+    @swagger_auto_schema(
+        operation_summary="Download Attachment",
+        responses={
+            200: "Attachment content",
+            206: "Requested byte range",
+            304: "Not Modified",
+            404: "Message has no attachment"
+        }
+    )
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None, conversation_pk=None):
+        message = self.get_object()
+        if not message.attachment:
+            return Response({'detail': 'Message has no attachment'}, status=status.HTTP_404_NOT_FOUND)
+
+        if not message.attachment_sha256:
+            # Attachments stored before hashes were recorded
+            message.attachment_sha256 = file_sha256(message.attachment)
+            Message.objects.filter(pk=message.pk).update(attachment_sha256=message.attachment_sha256)
+        return file_download_response(
+            request, message.attachment.storage, message.attachment.name,
+            f'"{message.attachment_sha256}"'
+        )
+
+    @swagger_auto_schema(
+        operation_summary="Attachment Thumbnail",
+        responses={
+            200: "Thumbnail image",
+            304: "Not Modified",
+            404: "Not an image, or the thumbnail has not been rendered yet"
+        }
+    )
+    @action(
+        detail=True,
+        methods=['get'],
+        url_path=rf'thumbnails/(?P<size>{THUMBNAIL_SIZE_PATTERN})\.(?P<ext>{THUMBNAIL_FORMAT_PATTERN})'
+    )
+    def thumbnail(self, request, pk=None, conversation_pk=None, size=None, ext=None):
+        message = self.get_object()
+        response = None
+        if message.attachment_sha256:
+            response = thumbnail_response(request, message.attachment_sha256, size, ext)
+        if response is None:
+            return Response({'detail': 'Thumbnail not available'}, status=status.HTTP_404_NOT_FOUND)
+        return response
+
+class NotificationViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for managing user notifications.
     """
@@ -25,4 +25,26 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'communications.tasks.send_unread_messages_summary',
         'schedule': crontab(hour="9", minute="0"),  # Run daily at 9 AM
     },
-}
\ No newline at end of file
+    'purge-stale-upload-sessions': {
+        'task': 'projects.tasks.purge_stale_upload_sessions',
+        'schedule': timedelta(hours=1),
+    },
+    'expire-overdue-projects': {
+        'task': 'projects.tasks.expire_overdue_projects',
+        'schedule': timedelta(minutes=15),
+    },
+    'refresh-analytics-rollups': {
+        'task': 'projects.tasks.refresh_analytics_rollups',
+        'schedule': timedelta(hours=1),
+    },
+    'refresh-skill-price-stats': {
+        'task': 'projects.tasks.refresh_skill_price_stats',
+        'schedule': crontab(hour="3", minute="0"),  # Nightly
+    },
+    'archive-finished-projects': {
+        'task': 'projects.tasks.archive_finished_projects',
+        'schedule': crontab(hour="4", minute="0"),  # Nightly, after the price stats
+    },
+}
+
+app.conf.beat_schedule = CELERY_BEAT_SCHEDULE
@@ -0,0 +1,42 @@
+"""
+Registry of the hot query shapes that explain_queries reports on. Each app
+lists its shapes in a query_shapes module:
+
+    @query_shape('notifications')
+    def notifications(sample):
+        return Notification.objects.filter(recipient=sample.client).order_by('-created_at')[:20]
+
+A shape takes a Sample and returns the queryset a view or task would run.
+"""
+from django.utils.module_loading import autodiscover_modules
+
+QUERY_SHAPES = {}
+
+
+def query_shape(name):
+    def register(build):
+        QUERY_SHAPES[name] = build
+        return build
+    return register
+
+
+def discover():
+    autodiscover_modules('query_shapes')
+    return QUERY_SHAPES
+
+
+class Sample:
+    """
+    Representative rows to fill the shapes' parameters. On an empty table
+    the ids fall back to 0, which still yields a plan.
+    """
+
+    def __init__(self):
+        from users.models import User
+        from projects.models import Project
+        from communications.models import Conversation
+
+        self.client = User.objects.filter(role='CL').first() or User(pk=0, role='CL')
+        self.freelancer = User.objects.filter(role='FR').first() or User(pk=0, role='FR')
+        self.project_id = Project.objects.values_list('pk', flat=True).first() or 0
+        self.conversation_id = Conversation.objects.values_list('pk', flat=True).first() or 0
@@ -0,0 +1,155 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+PIN_KEY = 'db_pin_user_{}'
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+@contextmanager
+def _routed_reads(to_replica):
+    token = _replica_reads.set(to_replica)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def replica_reads():
+    """Route reads made inside the block to a replica"""
+    return _routed_reads(True)
+
+
+def primary_reads():
+    """
+    Keep reads made inside the block on the primary. Whatever fills a
+    generation-keyed cache reads here: rows from a lagging replica would be
+    stored under the current generation and served long after the lag.
+    """
+    return _routed_reads(False)
+
+
+def choose_replica():
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+def pin_to_primary(user):
+    """Keep the user's reads on the primary until replicas have caught up with their write"""
+    cache.set(PIN_KEY.format(user.pk), True, timeout=settings.REPLICA_PIN_SECONDS)
+
+
+async def apin_to_primary(user):
+    await cache.aset(PIN_KEY.format(user.pk), True, timeout=settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user):
+    return user.is_authenticated and bool(cache.get(PIN_KEY.format(user.pk)))
+
+
+async def ais_pinned(user):
+    return user.is_authenticated and bool(await cache.aget(PIN_KEY.format(user.pk)))
+
+
+class ReplicaRouter:
+    """
+    Reads go to a replica only inside replica_reads(), and never while the
+    primary has a transaction open, since that transaction may already have
+    written what is about to be read. Writes always go to the primary, even
+    for objects that were loaded from a replica.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get() or not settings.DATABASE_REPLICAS:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return choose_replica()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema through replication
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class ReplicaReadMixin:
+    """
+    For DRF views: handle GET, HEAD and OPTIONS requests with reads from a
+    replica, unless the user wrote something within REPLICA_PIN_SECONDS.
+    Authentication and view-level permission checks still read the primary.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (settings.DATABASE_REPLICAS and request.method in SAFE_METHODS
+                and not is_pinned(request.user)):
+            self._replica_token = _replica_reads.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_replica_token', None)
+        if token is not None:
+            _replica_reads.reset(token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class ReplicaPinningMiddleware:
+    """
+    After a successful unsafe request by an authenticated user, pin that
+    user's reads to the primary so they see their own writes. Runs natively
+    under both WSGI and ASGI, so async views are not bounced through a thread.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if self.should_pin(request, response):
+            user = self.authenticated_user(request)
+            if user is not None:
+                pin_to_primary(user)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if self.should_pin(request, response):
+            # An unevaluated lazy user would query the database on access
+            user = await sync_to_async(self.authenticated_user)(request)
+            if user is not None:
+                await apin_to_primary(user)
+        return response
+
+    def should_pin(self, request, response):
+        return (bool(settings.DATABASE_REPLICAS) and request.method not in SAFE_METHODS
+                and response.status_code < 400)
+
+    def authenticated_user(self, request):
+        # DRF copies the user it authenticated onto the Django request
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return user
+        return None
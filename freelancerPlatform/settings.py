@@ -49,6 +49,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'freelancerPlatform.replicas.ReplicaPinningMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -78,6 +79,23 @@ DATABASES = {
     'default': env.db('DATABASE_URL')
 }
 
+# Read replicas as comma-separated DATABASE_URL-style URLs, e.g.
+# DATABASE_REPLICA_URLS=postgres://replica1/db,postgres://replica2/db
+# (two SQLite files work for local testing). Safe-method reads of views
+# using ReplicaReadMixin are spread across them.
+DATABASE_REPLICAS = []
+for index, url in enumerate(env.list('DATABASE_REPLICA_URLS', default=[]), start=1):
+    alias = f'replica{index}'
+    DATABASES[alias] = env.db_url_config(url)
+    # Tests run against the primary's test database
+    DATABASES[alias]['TEST'] = {'MIRROR': 'default'}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['freelancerPlatform.replicas.ReplicaRouter']
+
+# After writing, a user's reads stay on the primary this long (read-your-writes)
+REPLICA_PIN_SECONDS = env.int('REPLICA_PIN_SECONDS', default=5)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -151,6 +169,9 @@ SIMPLE_JWT = {
 
 AUTH_USER_MODEL = 'users.User'
 
+# Accepts a username or an email address as the login
+AUTHENTICATION_BACKENDS = ['users.backends.UsernameOrEmailBackend']
+
 # Celery Configuration
 CELERY_BROKER_URL = env('REDIS_URL')
 CELERY_RESULT_BACKEND = env('REDIS_URL')
@@ -181,6 +202,24 @@ EMAIL_VERIFICATION_TIMEOUT_DAYS = 1
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Resumable uploads: partial files live here until their last chunk arrives
+CHUNKED_UPLOAD_DIR = env('CHUNKED_UPLOAD_DIR', default=os.path.join(MEDIA_ROOT, 'uploads'))
+CHUNKED_UPLOAD_MAX_SIZE = env.int('CHUNKED_UPLOAD_MAX_SIZE', default=2 * 1024 ** 3)
+
+# Authenticated downloads: '' streams from Django, 'x-accel-redirect' hands
+# the file to nginx (internal location FILE_DOWNLOAD_ACCEL_PREFIX -> MEDIA_ROOT),
+# 'x-sendfile' to Apache mod_xsendfile or lighttpd
+FILE_DOWNLOAD_OFFLOAD = env('FILE_DOWNLOAD_OFFLOAD', default='')
+FILE_DOWNLOAD_ACCEL_PREFIX = env('FILE_DOWNLOAD_ACCEL_PREFIX', default='/protected-media/')
+
+# How freelancers' project listings are filtered: 'union' (index-friendly
+# subqueries) or 'join' (the original OR over a bids join with DISTINCT)
+PROJECT_VISIBILITY_STRATEGY = env('PROJECT_VISIBILITY_STRATEGY', default='union')
+
+# Completed, cancelled and expired projects untouched for this many days are
+# moved to the archive tables; keep it well past the analytics refresh window
+PROJECT_ARCHIVE_AFTER_DAYS = env.int('PROJECT_ARCHIVE_AFTER_DAYS', default=180)
+
 # Cache configuration
 if DEBUG:
     CACHES = {
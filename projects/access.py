@@ -0,0 +1,84 @@
+from django.db.models import CharField, Value
+
+from .models import Project, ProjectBid
+
+CLIENT = 'client'
+FREELANCER = 'freelancer'
+BIDDER = 'bidder'
+
+
+class ProjectAccess:
+    """
+    The user's relationship to every project, loaded with one UNION query
+    on first use and memoized on the request. Permission classes and
+    serializers consult it instead of querying per object; it is a snapshot,
+    so changes made later in the same request are not reflected.
+    """
+    request_attr = '_project_access'
+
+    def __init__(self, user):
+        self.user = user
+        self._roles = None
+
+    @classmethod
+    def for_request(cls, request):
+        access = getattr(request, cls.request_attr, None)
+        if access is None or access.user != request.user:
+            access = cls(request.user)
+            setattr(request, cls.request_attr, access)
+        return access
+
+    @property
+    def roles(self):
+        if self._roles is None:
+            self._roles = {CLIENT: set(), FREELANCER: set(), BIDDER: set()}
+            if self.user.is_authenticated:
+                for project_id, role in self._load():
+                    self._roles[role].add(project_id)
+        return self._roles
+
+    async def aload(self):
+        """Load the roles from async code, where the lazy roles property cannot query"""
+        if self._roles is None:
+            roles = {CLIENT: set(), FREELANCER: set(), BIDDER: set()}
+            if self.user.is_authenticated:
+                async for project_id, role in self._load():
+                    roles[role].add(project_id)
+            self._roles = roles
+        return self
+
+    def _load(self):
+        def role(name):
+            return Value(name, output_field=CharField())
+
+        # Default Meta orderings are not allowed inside a UNION
+        projects = Project.objects.order_by()
+        return projects.filter(client=self.user).values_list('id', role(CLIENT)).union(
+            projects.filter(freelancer=self.user).values_list('id', role(FREELANCER)),
+            ProjectBid.objects.order_by().filter(freelancer=self.user).values_list('project_id', role(BIDDER)),
+        )
+
+    def is_client(self, project_id):
+        return project_id in self.roles[CLIENT]
+
+    def is_freelancer(self, project_id):
+        return project_id in self.roles[FREELANCER]
+
+    def has_bid(self, project_id):
+        return project_id in self.roles[BIDDER]
+
+    def is_member(self, project_id):
+        """Client or awarded freelancer"""
+        return self.is_client(project_id) or self.is_freelancer(project_id)
+
+    def is_participant(self, project_id):
+        """Client, awarded freelancer or bidder"""
+        return self.is_member(project_id) or self.has_bid(project_id)
+
+    def can_bid(self, project):
+        return project.can_submit_bid(self.user, access=self)
+
+
+def project_id_of(obj):
+    """The project an object belongs to: a project itself or anything with a project FK"""
+    return obj.pk if isinstance(obj, Project) else obj.project_id
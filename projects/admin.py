@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Project, ProjectBid, ProjectFile, Milestone
+from .models import (
+    Project, ProjectBid, ProjectFile, Milestone, DailyRollup, DailySkillRollup, ArchivedProject
+)
 
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
@@ -29,4 +31,24 @@ class MilestoneAdmin(admin.ModelAdmin):
     list_filter = ('status', 'due_date', 'completed_at')
     search_fields = ('project__title', 'title', 'description')
     raw_id_fields = ('project',)
-    date_hierarchy = 'due_date'
\ No newline at end of file
+    date_hierarchy = 'due_date'
+
+@admin.register(DailyRollup)
+class DailyRollupAdmin(admin.ModelAdmin):
+    list_display = ('date', 'projects_created', 'projects_awarded', 'projects_completed', 'bid_count', 'refreshed_at')
+    date_hierarchy = 'date'
+
+@admin.register(DailySkillRollup)
+class DailySkillRollupAdmin(admin.ModelAdmin):
+    list_display = ('date', 'skill', 'projects_created', 'projects_awarded', 'projects_completed', 'bid_count')
+    list_filter = ('skill',)
+    raw_id_fields = ('skill',)
+    date_hierarchy = 'date'
+
+@admin.register(ArchivedProject)
+class ArchivedProjectAdmin(admin.ModelAdmin):
+    list_display = ('title', 'client', 'freelancer', 'status', 'completed_at', 'archived_at')
+    list_filter = ('status', 'archived_at')
+    search_fields = ('title', 'client__email', 'freelancer__email')
+    raw_id_fields = ('client', 'freelancer', 'required_skills')
+    date_hierarchy = 'archived_at'
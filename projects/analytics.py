@@ -0,0 +1,166 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, DecimalField, DurationField, ExpressionWrapper, F, Max, Min, Sum
+from django.utils import timezone
+
+from freelancerPlatform.replicas import primary_reads
+from .cache import analytics_generation, bump_analytics_generation
+from .models import DailyRollup, DailySkillRollup, Project, ProjectBid, RollupMetrics
+
+# Days before the last rolled-up day that are recomputed, for rows that
+# committed late with an earlier timestamp
+ROLLUP_LOOKBACK_DAYS = 1
+# Days per run; the task re-queues itself while older days remain
+ROLLUP_MAX_DAYS = 31
+ANALYTICS_KEY = 'projects_analytics_{}_{}_{}_{}'
+ANALYTICS_CACHE_TIMEOUT = 15 * 60
+
+BUDGET_MIDPOINT = ExpressionWrapper(
+    (F('project__budget_min') + F('project__budget_max')) * Decimal('0.5'),
+    output_field=DecimalField(max_digits=16, decimal_places=2)
+)
+AWARD_TIME = ExpressionWrapper(F('awarded_at') - F('created_at'), output_field=DurationField())
+
+
+def _day_range(day):
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def _day_sources(start, end):
+    """(queryset, path to the skill id, aggregates) for every metric group of a day"""
+    return (
+        (Project.objects.filter(created_at__gte=start, created_at__lt=end),
+         'required_skills', {'projects_created': Count('id')}),
+        (Project.objects.filter(awarded_at__gte=start, awarded_at__lt=end),
+         'required_skills', {'projects_awarded': Count('id'), 'award_seconds_sum': Sum(AWARD_TIME)}),
+        (Project.objects.filter(completed_at__gte=start, completed_at__lt=end),
+         'required_skills', {'projects_completed': Count('id')}),
+        (ProjectBid.objects.filter(created_at__gte=start, created_at__lt=end),
+         'project__required_skills', {
+             'bid_count': Count('id'),
+             'bid_amount_sum': Sum('amount'),
+             'bid_budget_sum': Sum(BUDGET_MIDPOINT),
+         }),
+    )
+
+
+def _clean(values):
+    values = {field: value or 0 for field, value in values.items()}
+    if isinstance(values.get('award_seconds_sum'), timedelta):
+        values['award_seconds_sum'] = int(values['award_seconds_sum'].total_seconds())
+    return values
+
+
+def day_metrics(day):
+    """
+    Aggregate one day straight from the source tables: eight grouped
+    queries over the rows timestamped that day, all on indexed columns.
+    Returns (totals, {skill_id: metrics}).
+    """
+    start, end = _day_range(day)
+    totals = {}
+    by_skill = defaultdict(dict)
+    for queryset, skill_path, aggregates in _day_sources(start, end):
+        totals.update(_clean(queryset.aggregate(**aggregates)))
+        rows = (
+            queryset.order_by()
+            .filter(**{f'{skill_path}__isnull': False})
+            .values(skill_id=F(skill_path))
+            .annotate(**aggregates)
+        )
+        for row in rows:
+            skill_id = row.pop('skill_id')
+            by_skill[skill_id].update(_clean(row))
+    return totals, by_skill
+
+
+def rollup_day(day):
+    """Replace the stored rollups of one day with freshly aggregated ones"""
+    totals, by_skill = day_metrics(day)
+    with transaction.atomic():
+        DailyRollup.objects.update_or_create(date=day, defaults=totals)
+        DailySkillRollup.objects.filter(date=day).delete()
+        DailySkillRollup.objects.bulk_create(
+            DailySkillRollup(date=day, skill_id=skill_id, **metrics)
+            for skill_id, metrics in by_skill.items()
+        )
+
+
+def _first_activity_day():
+    first = Project.objects.aggregate(first=Min('created_at'))['first']
+    return timezone.localdate(first) if first else None
+
+
+def refresh_rollups(start=None, end=None, max_days=ROLLUP_MAX_DAYS):
+    """
+    Recompute daily rollups from start through end, oldest first. Without
+    a start, resume just before the last rolled-up day, so a regular run
+    only revisits yesterday and today. Returns (days_refreshed, more_remaining).
+    """
+    end = end or timezone.localdate()
+    if start is None:
+        last = DailyRollup.objects.aggregate(last=Max('date'))['last']
+        start = last - timedelta(days=ROLLUP_LOOKBACK_DAYS) if last else _first_activity_day()
+        if start is None:
+            return 0, False
+
+    days = 0
+    day = start
+    while day <= end and days < max_days:
+        rollup_day(day)
+        days += 1
+        day += timedelta(days=1)
+    if days:
+        bump_analytics_generation()
+    return days, day <= end
+
+
+def _derived(totals):
+    """Averages that only make sense over the summed totals"""
+    bid_count = totals['bid_count']
+    awarded = totals['projects_awarded']
+    return {
+        **totals,
+        'average_bid': (totals['bid_amount_sum'] / bid_count).quantize(Decimal('0.01')) if bid_count else None,
+        'bid_to_budget_ratio': (
+            (totals['bid_amount_sum'] / totals['bid_budget_sum']).quantize(Decimal('0.0001'))
+            if totals['bid_budget_sum'] else None
+        ),
+        'average_hours_to_award': round(totals['award_seconds_sum'] / awarded / 3600, 2) if awarded else None,
+    }
+
+
+def analytics_summary(start, end, skill_id=None):
+    """
+    Daily series and range totals from the rollup tables, cached until the
+    next refresh. Reads at most one row per day in the range.
+    """
+    key = ANALYTICS_KEY.format(analytics_generation(), start, end, skill_id)
+    summary = cache.get(key)
+    if summary is not None:
+        return summary
+
+    if skill_id is None:
+        rollups = DailyRollup.objects.all()
+    else:
+        rollups = DailySkillRollup.objects.filter(skill_id=skill_id)
+    rollups = rollups.filter(date__gte=start, date__lte=end)
+    fields = RollupMetrics.METRIC_FIELDS
+
+    with primary_reads():
+        days = [_derived(row) for row in rollups.values('date', *fields)]
+        totals = _clean(rollups.aggregate(**{field: Sum(field) for field in fields}))
+    summary = {
+        'start': start,
+        'end': end,
+        'skill': skill_id,
+        'totals': _derived(totals),
+        'days': days,
+    }
+    cache.set(key, summary, timeout=ANALYTICS_CACHE_TIMEOUT)
+    return summary
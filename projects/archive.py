@@ -0,0 +1,120 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from communications.models import Conversation
+from .cache import bump_global_generation, bump_recommendation_generation
+from .counters import counters_paused
+from .models import (
+    ArchivedMilestone, ArchivedProject, ArchivedProjectBid, ArchivedProjectFile,
+    Milestone, Project, ProjectBid, ProjectFile
+)
+
+ARCHIVABLE_STATUSES = ('COMPLETED', 'CANCELLED', 'EXPIRED')
+ARCHIVE_CHUNK_SIZE = 200
+# Chunks per run; the task re-queues itself while archivable projects remain
+ARCHIVE_MAX_CHUNKS = 20
+
+# Hot model -> archive model, copied in this order so every FK target exists
+ARCHIVED_MODELS = (
+    (Project, ArchivedProject),
+    (ProjectBid, ArchivedProjectBid),
+    (Milestone, ArchivedMilestone),
+    (ProjectFile, ArchivedProjectFile),
+)
+
+
+def archive_cutoff():
+    return timezone.now() - timedelta(days=settings.PROJECT_ARCHIVE_AFTER_DAYS)
+
+
+def archivable_projects(cutoff):
+    """Finished projects that have not changed since cutoff"""
+    return Project.objects.filter(status__in=ARCHIVABLE_STATUSES, updated_at__lt=cutoff)
+
+
+def _copy_rows(queryset, archive_model):
+    """Insert the queryset's rows into archive_model, keeping their ids"""
+    source_fields = {field.attname for field in queryset.model._meta.concrete_fields}
+    names = [field.attname for field in archive_model._meta.concrete_fields if field.attname in source_fields]
+    return archive_model.objects.bulk_create([
+        archive_model(**values) for values in queryset.order_by().values(*names)
+    ])
+
+
+def _copy_required_skills(project_ids):
+    through = ArchivedProject.required_skills.through
+    through.objects.bulk_create([
+        through(archivedproject_id=project_id, skill_id=skill_id)
+        for project_id, skill_id in Project.required_skills.through.objects.filter(
+            project_id__in=project_ids
+        ).values_list('project_id', 'skill_id')
+    ])
+
+
+def archive_chunk(cutoff, chunk_size=ARCHIVE_CHUNK_SIZE):
+    """
+    Move up to chunk_size archivable projects, with their bids, milestones
+    and file metadata, into the archive tables in one transaction. Stored
+    files are not touched. Conversations are re-pointed at the archived
+    project rather than deleted with the hot row. Returns the moved ids.
+    """
+    with transaction.atomic():
+        project_ids = list(
+            archivable_projects(cutoff)
+            .order_by('updated_at', 'id')
+            .select_for_update(skip_locked=True)
+            .values_list('id', flat=True)[:chunk_size]
+        )
+        if not project_ids:
+            return []
+
+        for model, archive_model in ARCHIVED_MODELS:
+            lookup = 'pk__in' if model is Project else 'project_id__in'
+            _copy_rows(model.objects.filter(**{lookup: project_ids}), archive_model)
+        _copy_required_skills(project_ids)
+
+        Conversation.objects.filter(project_id__in=project_ids).update(
+            archived_project_id=F('project_id'), project=None
+        )
+
+        # Each cascaded bid and milestone would otherwise update the counters
+        # of a project that is being deleted with it
+        with counters_paused():
+            Project.objects.filter(pk__in=project_ids).delete()
+
+        transaction.on_commit(bump_global_generation)
+        transaction.on_commit(bump_recommendation_generation)
+    return project_ids
+
+
+def run_archive(cutoff=None, chunk_size=ARCHIVE_CHUNK_SIZE, max_chunks=ARCHIVE_MAX_CHUNKS):
+    """
+    Archive finished projects chunk by chunk, each in its own transaction.
+    Returns (archived_count, more_remaining).
+    """
+    cutoff = cutoff or archive_cutoff()
+    archived = 0
+    for _ in range(max_chunks):
+        project_ids = archive_chunk(cutoff, chunk_size)
+        archived += len(project_ids)
+        if len(project_ids) < chunk_size:
+            return archived, False
+    # Every chunk was full, so there may be more left for a follow-up run
+    return archived, archivable_projects(cutoff).exists()
+
+
+def archived_projects_for(user):
+    """Archived projects the user may read, scoped by role like the live listing"""
+    queryset = ArchivedProject.objects.select_related('client', 'freelancer').prefetch_related('required_skills')
+    if user.role == 'FR':
+        return queryset.filter(
+            Q(freelancer=user) |
+            Q(pk__in=ArchivedProjectBid.objects.filter(freelancer=user).values('project_id'))
+        )
+    if user.role == 'CL':
+        return queryset.filter(client=user)
+    return queryset
@@ -0,0 +1,146 @@
+"""
+Async read endpoints for projects and bids. Under ASGI they wait on the
+database and cache without holding a worker thread, so one worker can serve
+many slow clients at once. They return the same payloads as the list and
+retrieve actions of ProjectViewSet and ProjectBidViewSet, without ?search=,
+?ordering= and ?q=, and with throttling left to the sync endpoints.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Q
+from django.http import HttpResponseNotModified, JsonResponse
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAuthenticated, NotFound, PermissionDenied
+from rest_framework.request import Request
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from freelancerPlatform.replicas import ais_pinned, primary_reads, replica_reads
+from .access import ProjectAccess
+from .archive import archived_projects_for
+from .cache import alisting_cache_key, aget_cached_listing, aset_cached_listing
+from .conditional import ProjectValidators, Validators
+from .models import Project, ProjectBid
+from .pagination import BidCursorPagination, ProjectCursorPagination
+from .permissions import CanSubmitBid
+from .serializers import (
+    ArchivedProjectSerializer, ProjectBidSerializer, ProjectListSerializer, ProjectSerializer
+)
+from .views import archived_prefetches, nested_prefetches
+from .visibility import filter_project_listing
+
+ASYNC_LISTING_PREFIX = 'projects_alist'
+
+
+async def authenticate(request):
+    """The JWT user the API views would see, else the session user"""
+    result = await sync_to_async(JWTAuthentication().authenticate)(request)
+    if result is not None:
+        return result[0]
+    return await request.auser()
+
+
+def _json(data, status_code=status.HTTP_200_OK):
+    return JsonResponse(data, status=status_code, encoder=JSONEncoder, safe=False)
+
+
+def async_api_view(view):
+    """
+    Authenticate, wrap the request for the serializers and paginators, send
+    reads to a replica like ReplicaReadMixin does, and render API errors the
+    way DRF would.
+    """
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return _json({'detail': f'Method "{request.method}" not allowed.'}, status.HTTP_405_METHOD_NOT_ALLOWED)
+        try:
+            user = await authenticate(request)
+            if not user.is_authenticated:
+                raise NotAuthenticated()
+            api_request = Request(request)
+            api_request.user = user
+            if settings.DATABASE_REPLICAS and not await ais_pinned(user):
+                with replica_reads():
+                    return await view(api_request, *args, **kwargs)
+            return await view(api_request, *args, **kwargs)
+        except APIException as exc:
+            return _json({'detail': exc.detail}, exc.status_code)
+    return wrapper
+
+
+async def _retrieve(request, queryset, pk, validators, serializer_class, permission=None):
+    try:
+        instance = await queryset.aget(pk=pk)
+    except queryset.model.DoesNotExist:
+        raise NotFound()
+    # The object check the viewset's get_object() makes after its lookup
+    if permission is not None and not permission.has_object_permission(request, None, instance):
+        raise PermissionDenied(permission.message)
+    if validators.not_modified(request, instance):
+        return validators.apply(HttpResponseNotModified(), instance)
+    data = serializer_class(instance, context={'request': request}).data
+    return validators.apply(_json(data), instance)
+
+
+def _project_queryset(request):
+    return filter_project_listing(
+        Project.objects.select_related('client', 'freelancer'), request.user, request.query_params
+    )
+
+
+@async_api_view
+async def project_list(request):
+    cache_key = await alisting_cache_key(request.user, request.query_params, ASYNC_LISTING_PREFIX)
+    payload = await aget_cached_listing(cache_key)
+    if payload is None:
+        with primary_reads():
+            queryset = _project_queryset(request).prefetch_related('required_skills')
+            paginator = ProjectCursorPagination()
+            page = await paginator.apaginate_queryset(queryset, request)
+            # can_bid reads the preloaded roles instead of querying
+            await ProjectAccess.for_request(request).aload()
+            serializer = ProjectListSerializer(page, many=True, context={'request': request})
+            payload = paginator.get_paginated_response(serializer.data).data
+        await aset_cached_listing(cache_key, payload)
+    return _json(payload)
+
+
+@async_api_view
+async def project_detail(request, pk):
+    embedded = ProjectSerializer.embedded_fields(request)
+    queryset = _project_queryset(request).prefetch_related('required_skills', *nested_prefetches(embedded))
+    await ProjectAccess.for_request(request).aload()
+    try:
+        return await _retrieve(request, queryset, pk, ProjectValidators(), ProjectSerializer)
+    except NotFound:
+        pass
+    queryset = archived_projects_for(request.user).prefetch_related(*archived_prefetches(request))
+    return await _retrieve(request, queryset, pk, ProjectValidators(), ArchivedProjectSerializer)
+
+
+def _bid_queryset(request):
+    permission = CanSubmitBid()
+    if not permission.has_permission(request, None):
+        raise PermissionDenied(permission.message)
+    return ProjectBid.objects.select_related('freelancer').filter(
+        Q(project__client=request.user) |
+        Q(freelancer=request.user)
+    )
+
+
+@async_api_view
+async def bid_list(request):
+    paginator = BidCursorPagination()
+    page = await paginator.apaginate_queryset(_bid_queryset(request), request)
+    serializer = ProjectBidSerializer(page, many=True, context={'request': request})
+    return _json(paginator.get_paginated_response(serializer.data).data)
+
+
+@async_api_view
+async def bid_detail(request, pk):
+    return await _retrieve(
+        request, _bid_queryset(request), pk, Validators(), ProjectBidSerializer, CanSubmitBid()
+    )
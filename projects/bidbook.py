@@ -0,0 +1,84 @@
+from bisect import bisect_left
+from decimal import Decimal
+
+from django.core.cache import cache
+
+from freelancerPlatform.replicas import primary_reads
+
+from .cache import bid_book_generation
+from .models import ProjectBid
+
+BID_BOOK_KEY = 'projects_bid_book_{}_{}'
+BID_BOOK_TIMEOUT = 60 * 60
+# Bids still competing, or the one that won
+BOOK_STATUSES = ('PENDING', 'ACCEPTED')
+PERCENTILES = (25, 50, 75, 90)
+CENT = Decimal('0.01')
+
+
+class BidBook:
+    """
+    A project's active bids as parallel lists sorted by (amount, id). Ranks
+    are binary searches and percentiles are index lookups, so neither
+    touches every bid once the book is built.
+    """
+
+    def __init__(self, rows):
+        # rows: (amount, bid_id, freelancer_id) already sorted by amount, id
+        self.amounts = [amount for amount, _, _ in rows]
+        self.bid_ids = [bid_id for _, bid_id, _ in rows]
+        self.freelancer_amounts = {freelancer_id: amount for amount, _, freelancer_id in rows}
+
+    def __len__(self):
+        return len(self.amounts)
+
+    def rank_of_amount(self, amount):
+        """1-based rank a bid of this amount has or would have; ties share a rank"""
+        return bisect_left(self.amounts, amount) + 1
+
+    def rank_of_freelancer(self, freelancer_id):
+        amount = self.freelancer_amounts.get(freelancer_id)
+        return None if amount is None else self.rank_of_amount(amount)
+
+    def percentile(self, q):
+        """Linearly interpolated percentile, q in 0..100"""
+        if not self.amounts:
+            return None
+        position = (len(self.amounts) - 1) * Decimal(q) / 100
+        lower = int(position)
+        upper = min(lower + 1, len(self.amounts) - 1)
+        fraction = position - lower
+        value = self.amounts[lower] + (self.amounts[upper] - self.amounts[lower]) * fraction
+        return value.quantize(CENT)
+
+    def top(self, n):
+        return self.bid_ids[:n]
+
+    def stats(self):
+        if not self.amounts:
+            return {'count': 0, 'lowest': None, 'highest': None, 'median': None, 'percentiles': {}}
+        return {
+            'count': len(self.amounts),
+            'lowest': self.amounts[0],
+            'highest': self.amounts[-1],
+            'median': self.percentile(50),
+            'percentiles': {f'p{q}': self.percentile(q) for q in PERCENTILES},
+        }
+
+
+def load_bid_book(project_id):
+    """
+    The project's bid book from the cache, rebuilt from one ordered query on
+    a miss. Bid writes bump the project's generation after commit, so a book
+    built from an older snapshot is never served under the new key.
+    """
+    key = BID_BOOK_KEY.format(project_id, bid_book_generation(project_id))
+    book = cache.get(key)
+    if book is None:
+        with primary_reads():
+            rows = list(ProjectBid.objects.filter(
+                project_id=project_id, status__in=BOOK_STATUSES
+            ).order_by('amount', 'id').values_list('amount', 'id', 'freelancer_id'))
+        book = BidBook(rows)
+        cache.set(key, book, timeout=BID_BOOK_TIMEOUT)
+    return book
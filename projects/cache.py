@@ -0,0 +1,115 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+LISTING_CACHE_TIMEOUT = getattr(settings, 'PROJECT_LISTING_CACHE_TIMEOUT', 300)
+
+GLOBAL_GENERATION_KEY = 'projects_gen_global'
+USER_GENERATION_KEY = 'projects_gen_user_{}'
+RECOMMENDATION_GENERATION_KEY = 'projects_gen_recommendations'
+BID_BOOK_GENERATION_KEY = 'projects_gen_bid_book_{}'
+ANALYTICS_GENERATION_KEY = 'projects_gen_analytics'
+
+
+def _bump(key):
+    """Increment a generation counter, creating it if it has expired"""
+    if cache.add(key, 1, timeout=None):
+        return 1
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Evicted between add() and incr()
+        cache.set(key, 1, timeout=None)
+        return 1
+
+
+def bump_global_generation():
+    """Invalidate every cached project listing"""
+    return _bump(GLOBAL_GENERATION_KEY)
+
+
+def bump_user_generation(user_id):
+    """Invalidate the cached project listings of a single user"""
+    return _bump(USER_GENERATION_KEY.format(user_id))
+
+
+def bump_recommendation_generation():
+    """Invalidate the cached skill matrix of open projects"""
+    return _bump(RECOMMENDATION_GENERATION_KEY)
+
+
+def recommendation_generation():
+    return cache.get(RECOMMENDATION_GENERATION_KEY) or 0
+
+
+def bump_bid_book_generation(project_id):
+    """Invalidate the cached bid book of one project"""
+    return _bump(BID_BOOK_GENERATION_KEY.format(project_id))
+
+
+def bid_book_generation(project_id):
+    return cache.get(BID_BOOK_GENERATION_KEY.format(project_id)) or 0
+
+
+def bump_analytics_generation():
+    """Invalidate every cached analytics summary"""
+    return _bump(ANALYTICS_GENERATION_KEY)
+
+
+def analytics_generation():
+    return cache.get(ANALYTICS_GENERATION_KEY) or 0
+
+
+def filter_signature(query_params):
+    """Stable digest of the query string, independent of parameter order"""
+    items = sorted(
+        (key, sorted(query_params.getlist(key)))
+        for key in query_params.keys()
+    )
+    return hashlib.md5(repr(items).encode()).hexdigest()
+
+
+def _listing_key(user_id, generations, query_params, prefix):
+    global_gen = generations.get(GLOBAL_GENERATION_KEY) or 0
+    user_gen = generations.get(USER_GENERATION_KEY.format(user_id)) or 0
+    return (
+        f'{prefix}_{global_gen}_{user_gen}_{user_id}_'
+        f'{filter_signature(query_params)}'
+    )
+
+
+def _generation_keys(user):
+    return [GLOBAL_GENERATION_KEY, USER_GENERATION_KEY.format(user.id)]
+
+
+def listing_cache_key(user, query_params, prefix='projects_list'):
+    """
+    Build the cache key for a project listing. Bumping either generation
+    counter orphans all previous keys, so invalidation never scans the cache.
+    Listings whose payloads differ, such as the async endpoint's with its
+    own page links, use their own prefix.
+    """
+    generations = cache.get_many(_generation_keys(user))
+    return _listing_key(user.id, generations, query_params, prefix)
+
+
+async def alisting_cache_key(user, query_params, prefix='projects_list'):
+    generations = await cache.aget_many(_generation_keys(user))
+    return _listing_key(user.id, generations, query_params, prefix)
+
+
+def get_cached_listing(key):
+    return cache.get(key)
+
+
+def set_cached_listing(key, payload):
+    cache.set(key, payload, timeout=LISTING_CACHE_TIMEOUT)
+
+
+async def aget_cached_listing(key):
+    return await cache.aget(key)
+
+
+async def aset_cached_listing(key, payload):
+    await cache.aset(key, payload, timeout=LISTING_CACHE_TIMEOUT)
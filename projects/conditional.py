@@ -0,0 +1,143 @@
+import hashlib
+
+from django.db import transaction
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import Project
+from .serializers import CAPPED_ATTR, ProjectSerializer
+
+
+def version_etag(*parts):
+    """Strong ETag over the values a representation is built from"""
+    return '"{}"'.format(hashlib.md5(repr(parts).encode()).hexdigest())
+
+
+def _tags(header):
+    return [tag.strip() for tag in header.split(',')]
+
+
+def none_match_fails(header, etag):
+    """True when If-None-Match names the current ETag; weak comparison"""
+    if header.strip() == '*':
+        return True
+    return etag in [tag.removeprefix('W/') for tag in _tags(header)]
+
+
+def if_match_passes(header, etag):
+    """If-Match uses strong comparison, so weak tags never match"""
+    if header.strip() == '*':
+        return True
+    return etag in _tags(header)
+
+
+def not_modified(request, etag, last_modified):
+    """
+    Evaluate If-None-Match, falling back to If-Modified-Since only when no
+    ETag was sent, as RFC 9110 requires. The ETag is the precise validator;
+    Last-Modified has one-second resolution and may not cover every part
+    of the representation.
+    """
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        return none_match_fails(if_none_match, etag)
+    since = parse_http_date_safe(request.headers.get('If-Modified-Since') or '')
+    return since is not None and int(last_modified.timestamp()) <= since
+
+
+class Validators:
+    """ETag and Last-Modified of an object with an updated_at column"""
+
+    def etag_parts(self, obj):
+        return (obj.updated_at,)
+
+    def last_modified(self, obj):
+        return obj.updated_at
+
+    def etag(self, obj):
+        return version_etag(obj._meta.label, obj.pk, *self.etag_parts(obj))
+
+    def not_modified(self, request, obj):
+        return not_modified(request, self.etag(obj), self.last_modified(obj))
+
+    def apply(self, response, obj):
+        response['ETag'] = self.etag(obj)
+        response['Last-Modified'] = http_date(self.last_modified(obj).timestamp())
+        # Clients may keep the body but must revalidate before reusing it
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class ProjectValidators(Validators):
+    """Also covers the counters and the collections the payload embeds"""
+
+    def expanded_items(self, obj):
+        return {
+            name: items for name in ProjectSerializer.expandable_fields
+            if (items := getattr(obj, CAPPED_ATTR.format(name), None)) is not None
+        }
+
+    def etag_parts(self, obj):
+        # Counter updates leave updated_at alone, so they are part of the tag
+        counters = tuple(getattr(obj, field) for field in Project.COUNTER_FIELDS)
+        expanded = tuple(
+            (name, tuple((item.pk, getattr(item, 'updated_at', None)) for item in items))
+            for name, items in sorted(self.expanded_items(obj).items())
+        )
+        return (obj.updated_at, counters, expanded)
+
+    def last_modified(self, obj):
+        return max([obj.updated_at] + [
+            item.updated_at for items in self.expanded_items(obj).values()
+            for item in items if hasattr(item, 'updated_at')
+        ])
+
+
+class ConditionalMixin:
+    """
+    ETag and Last-Modified validators for a viewset's detail endpoints.
+    retrieve answers a matching If-None-Match or If-Modified-Since with 304
+    before serializing. update compares If-Match with the ETag of the row
+    locked for the write and answers a stale tag with 412, so concurrent
+    edits cannot silently overwrite each other.
+    """
+    validators = Validators()
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        if self.validators.not_modified(request, instance):
+            return self.validators.apply(Response(status=status.HTTP_304_NOT_MODIFIED), instance)
+        serializer = self.get_serializer(instance)
+        return self.validators.apply(Response(serializer.data), instance)
+
+    def lock_object(self):
+        """Lock the addressed row so the If-Match check and the write see the same version"""
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        model = self.get_queryset().model
+        list(model.objects.select_for_update().filter(**{self.lookup_field: lookup}).values_list('pk'))
+
+    def update(self, request, *args, **kwargs):
+        partial = kwargs.pop('partial', False)
+        if_match = request.headers.get('If-Match')
+        with transaction.atomic():
+            if if_match:
+                self.lock_object()
+            instance = self.get_object()
+            if if_match and not if_match_passes(if_match, self.validators.etag(instance)):
+                response = Response(
+                    {'detail': 'The resource was modified since it was fetched'},
+                    status=status.HTTP_412_PRECONDITION_FAILED
+                )
+                return self.validators.apply(response, instance)
+
+            serializer = self.get_serializer(instance, data=request.data, partial=partial)
+            serializer.is_valid(raise_exception=True)
+            self.perform_update(serializer)
+
+        if getattr(instance, '_prefetched_objects_cache', None):
+            instance._prefetched_objects_cache = {}
+        # Reload so the new ETag reflects what was actually stored
+        instance.refresh_from_db()
+        return self.validators.apply(Response(serializer.data), instance)
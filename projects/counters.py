@@ -0,0 +1,181 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Decimal
+
+from django.db.models import Case, Count, DecimalField, F, IntegerField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Milestone, Project, ProjectBid
+
+_paused = ContextVar('counters_paused', default=False)
+
+
+@contextmanager
+def counters_paused():
+    """
+    Skip counter updates inside the block, for rows deleted together with
+    their project, whose counters are about to go anyway.
+    """
+    token = _paused.set(True)
+    try:
+        yield
+    finally:
+        _paused.reset(token)
+
+
+def _bid_contribution(status, amount):
+    """Counter values a single bid contributes to its project"""
+    pending = status == 'PENDING'
+    return {
+        'bid_count': 1,
+        'bid_amount_sum': amount,
+        'pending_bid_count': 1 if pending else 0,
+        'pending_bid_amount_sum': amount if pending else Decimal('0'),
+    }
+
+
+def _apply(project_id, contribution, sign):
+    changes = {
+        field: F(field) + sign * value
+        for field, value in contribution.items() if value
+    }
+    if changes and not _paused.get():
+        Project.objects.filter(pk=project_id).update(**changes)
+
+
+def apply_bid_change(old_state, new_state):
+    """
+    Move a bid's contribution from its old (project_id, status, amount) state
+    to its new one with F() updates. Either state may be None for
+    creations and deletions.
+    """
+    if old_state == new_state:
+        return
+
+    if old_state and new_state and old_state[0] == new_state[0]:
+        old = _bid_contribution(old_state[1], Decimal(old_state[2]))
+        new = _bid_contribution(new_state[1], Decimal(new_state[2]))
+        _apply(new_state[0], {field: new[field] - old[field] for field in new}, 1)
+        return
+
+    if old_state:
+        _apply(old_state[0], _bid_contribution(old_state[1], Decimal(old_state[2])), -1)
+    if new_state:
+        _apply(new_state[0], _bid_contribution(new_state[1], Decimal(new_state[2])), 1)
+
+
+def _actual_bid_counters():
+    bids = ProjectBid.objects.filter(project=OuterRef('pk')).order_by().values('project')
+    pending = bids.filter(status='PENDING')
+    amount = DecimalField(max_digits=14, decimal_places=2)
+
+    def total(queryset, aggregate, output_field=None):
+        subquery = Subquery(queryset.annotate(value=aggregate).values('value'))
+        if output_field is None:
+            return Coalesce(subquery, 0)
+        return Coalesce(subquery, Value(Decimal('0')), output_field=output_field)
+
+    return {
+        'bid_count': total(bids, Count('pk')),
+        'bid_amount_sum': total(bids, Sum('amount'), amount),
+        'pending_bid_count': total(pending, Count('pk')),
+        'pending_bid_amount_sum': total(pending, Sum('amount'), amount),
+    }
+
+
+def recount_bid_counters(queryset):
+    """Recompute the bid counters of every project in queryset in one UPDATE"""
+    return queryset.update(**_actual_bid_counters())
+
+
+def stale_bid_counters(queryset):
+    """Projects whose stored counters disagree with their bids"""
+    actual = {f'actual_{field}': expression for field, expression in _actual_bid_counters().items()}
+    mismatch = Q()
+    for field in Project.BID_COUNTER_FIELDS:
+        mismatch |= ~Q(**{field: F(f'actual_{field}')})
+    return queryset.annotate(**actual).filter(mismatch)
+
+
+def _milestone_contribution(status):
+    return {
+        'milestone_count': 1,
+        'completed_milestone_count': 1 if status == 'COMPLETED' else 0,
+    }
+
+
+def apply_milestone_change(old_state, new_state):
+    """Like apply_bid_change, for (project_id, status) milestone states"""
+    if old_state == new_state:
+        return
+
+    if old_state and new_state and old_state[0] == new_state[0]:
+        old = _milestone_contribution(old_state[1])
+        new = _milestone_contribution(new_state[1])
+        _apply(new_state[0], {field: new[field] - old[field] for field in new}, 1)
+        return
+
+    if old_state:
+        _apply(old_state[0], _milestone_contribution(old_state[1]), -1)
+    if new_state:
+        _apply(new_state[0], _milestone_contribution(new_state[1]), 1)
+
+
+def add_milestones(project_id, statuses):
+    """Count newly bulk-created milestones, which skip the post_save signal"""
+    statuses = list(statuses)
+    _apply(project_id, {
+        'milestone_count': len(statuses),
+        'completed_milestone_count': statuses.count('COMPLETED'),
+    }, 1)
+
+
+def adjust_completed_milestones(deltas):
+    """Apply {project_id: delta} to completed_milestone_count in one UPDATE"""
+    deltas = {project_id: delta for project_id, delta in deltas.items() if delta}
+    if not deltas:
+        return 0
+    return Project.objects.filter(pk__in=deltas).update(
+        completed_milestone_count=F('completed_milestone_count') + Case(
+            *[When(pk=project_id, then=Value(delta)) for project_id, delta in deltas.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    )
+
+
+def _actual_milestone_counters():
+    milestones = Milestone.objects.filter(project=OuterRef('pk')).order_by().values('project')
+    completed = milestones.filter(status='COMPLETED')
+    return {
+        'milestone_count': Coalesce(Subquery(milestones.annotate(value=Count('pk')).values('value')), 0),
+        'completed_milestone_count': Coalesce(Subquery(completed.annotate(value=Count('pk')).values('value')), 0),
+    }
+
+
+def recount_milestone_counters(queryset):
+    """Recompute the milestone counters of every project in queryset in one UPDATE"""
+    return queryset.update(**_actual_milestone_counters())
+
+
+def stale_milestone_counters(queryset):
+    actual = {f'actual_{field}': expression for field, expression in _actual_milestone_counters().items()}
+    mismatch = Q()
+    for field in Project.MILESTONE_COUNTER_FIELDS:
+        mismatch |= ~Q(**{field: F(f'actual_{field}')})
+    return queryset.annotate(**actual).filter(mismatch)
+
+
+def complete_finished_projects(project_ids):
+    """
+    Mark in-progress projects whose milestones are all completed as
+    COMPLETED with one conditional UPDATE. Returns the number completed.
+    """
+    now = timezone.now()
+    return Project.objects.filter(
+        pk__in=project_ids,
+        status='IN_PROGRESS',
+        milestone_count__gt=0,
+        completed_milestone_count=F('milestone_count'),
+    ).update(status='COMPLETED', completed_at=now, updated_at=now)
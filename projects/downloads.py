@@ -0,0 +1,152 @@
+import hashlib
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils.http import content_disposition_header
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+HASH_BLOCK_SIZE = 1024 * 1024
+
+OFFLOAD_ACCEL = 'x-accel-redirect'
+OFFLOAD_SENDFILE = 'x-sendfile'
+
+
+def file_sha256(field_file):
+    """SHA-256 of a (possibly not yet saved) file, read in blocks"""
+    digest = hashlib.sha256()
+    for chunk in field_file.chunks(HASH_BLOCK_SIZE):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+class _BoundedReader:
+    """File-like view of the next length bytes of a file"""
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def _etag_matches(header, etag):
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    # Weak comparison, as If-None-Match requires
+    candidates = [tag.strip().removeprefix('W/') for tag in header.split(',')]
+    return etag.removeprefix('W/') in candidates
+
+
+def _parse_range(header, size):
+    """
+    Return (start, end) for a single satisfiable byte range, None to serve
+    the whole file, or False when the range cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.replace(' ', ''))
+    if not match:
+        # Multiple or malformed ranges; a full response is always allowed
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def stored_name_etag(name):
+    """
+    Weak ETag for files stored before content hashes were recorded. Storage
+    never reuses a name for different content, so the name identifies it.
+    """
+    return 'W/"%s"' % hashlib.md5(name.encode()).hexdigest()
+
+
+def _offload_response(storage, name, etag, disposition):
+    response = HttpResponse()
+    if settings.FILE_DOWNLOAD_OFFLOAD == OFFLOAD_ACCEL:
+        # nginx serves an internal location mapped onto MEDIA_ROOT
+        response['X-Accel-Redirect'] = settings.FILE_DOWNLOAD_ACCEL_PREFIX + quote(name)
+    else:
+        response['X-Sendfile'] = storage.path(name)
+    # Let the web server work out the type, length and ranges
+    del response['Content-Type']
+    response['ETag'] = etag
+    response['Content-Disposition'] = disposition
+    return response
+
+
+def file_download_response(request, storage, name, etag, filename=None, as_attachment=True):
+    """
+    Serve a stored file with ETag revalidation and single byte ranges.
+
+    With FILE_DOWNLOAD_OFFLOAD set the response only carries an
+    X-Accel-Redirect or X-Sendfile header and the web server sends the
+    bytes. Otherwise FileResponse hands the open file to the WSGI server's
+    file_wrapper, which can use sendfile() for whole files and open-ended
+    ranges.
+    """
+    filename = filename or os.path.basename(name)
+    disposition = content_disposition_header(as_attachment, filename)
+
+    if _etag_matches(request.headers.get('If-None-Match'), etag):
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    if settings.FILE_DOWNLOAD_OFFLOAD:
+        return _offload_response(storage, name, etag, disposition)
+
+    file = storage.open(name, 'rb')
+    size = storage.size(name)
+
+    byte_range = None
+    range_header = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
+    # If-Range needs a strong validator match, otherwise send the whole file
+    if range_header and (not if_range or (if_range.strip() == etag and not etag.startswith('W/'))):
+        byte_range = _parse_range(range_header, size)
+
+    if byte_range is False:
+        file.close()
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if byte_range is None:
+        response = FileResponse(file, as_attachment=as_attachment, filename=filename)
+    else:
+        start, end = byte_range
+        file.seek(start)
+        length = end - start + 1
+        # Open-ended ranges keep the real file so sendfile() still applies
+        body = file if end == size - 1 else _BoundedReader(file, length)
+        response = FileResponse(body, as_attachment=as_attachment, filename=filename, status=206)
+        response['Content-Length'] = length
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    return response
@@ -0,0 +1,90 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from communications.tasks import notify_projects_expired
+from . import metrics
+from .cache import bump_bid_book_generation, bump_global_generation, bump_recommendation_generation
+from .models import Project, ProjectBid
+
+EXPIRY_CHUNK_SIZE = 500
+# Chunks per run; the task re-queues itself while overdue projects remain
+EXPIRY_MAX_CHUNKS = 20
+
+
+def overdue_projects(cutoff):
+    return Project.objects.filter(status='OPEN', deadline__lt=cutoff)
+
+
+def _invalidate(project_ids):
+    bump_global_generation()
+    bump_recommendation_generation()
+    for project_id in project_ids:
+        bump_bid_book_generation(project_id)
+
+
+def expire_chunk(cutoff, chunk_size=EXPIRY_CHUNK_SIZE):
+    """
+    Expire up to chunk_size OPEN projects whose deadline is before cutoff
+    and withdraw their pending bids, in one transaction. Rows locked by a
+    concurrent award or another worker are skipped rather than waited on.
+    Returns (project_ids, withdrawn_bid_count).
+    """
+    with transaction.atomic():
+        project_ids = list(
+            overdue_projects(cutoff)
+            .order_by('deadline', 'id')
+            .select_for_update(skip_locked=True)
+            .values_list('id', flat=True)[:chunk_size]
+        )
+        if not project_ids:
+            return [], 0
+
+        pending = ProjectBid.objects.filter(project_id__in=project_ids, status='PENDING')
+        bidders = list(pending.values_list('project_id', 'freelancer_id'))
+
+        now = timezone.now()
+        # Withdrawn bids no longer count as pending; the totals are unchanged
+        Project.objects.filter(pk__in=project_ids, status='OPEN').update(
+            status='EXPIRED',
+            pending_bid_count=0,
+            pending_bid_amount_sum=0,
+            updated_at=now,
+        )
+        withdrawn = pending.update(status='WITHDRAWN', updated_at=now)
+
+        # The bulk updates bypass the model signals
+        transaction.on_commit(lambda: _invalidate(project_ids))
+        transaction.on_commit(lambda: notify_projects_expired.delay(project_ids, bidders))
+    return project_ids, withdrawn
+
+
+def run_expiry(cutoff=None, chunk_size=EXPIRY_CHUNK_SIZE, max_chunks=EXPIRY_MAX_CHUNKS):
+    """
+    Expire overdue projects chunk by chunk. Each chunk commits on its own,
+    so an interrupted run loses at most one chunk and the next run resumes
+    where it stopped. Returns (expired_count, more_remaining).
+    """
+    cutoff = cutoff or timezone.now()
+    metrics.increment('expiry_runs')
+    expired = 0
+    more = False
+    for _ in range(max_chunks):
+        project_ids, withdrawn = expire_chunk(cutoff, chunk_size)
+        expired += len(project_ids)
+        if project_ids:
+            metrics.increment('expiry_chunks')
+            metrics.increment('expiry_projects', len(project_ids))
+            metrics.increment('expiry_bids_withdrawn', withdrawn)
+        if len(project_ids) < chunk_size:
+            break
+    else:
+        # Every chunk was full, so there may be more left for a follow-up run
+        more = overdue_projects(cutoff).exists()
+
+    cache.set(metrics.EXPIRY_LAST_RUN_KEY, {
+        'finished_at': timezone.now().isoformat(),
+        'cutoff': cutoff.isoformat(),
+    }, timeout=None)
+    return expired, more
+
@@ -0,0 +1,143 @@
+import asyncio
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from projects.counters import recount_bid_counters
+from projects.models import Project, ProjectBid
+from users.models import User
+
+ENDPOINTS = {
+    'project-detail': ('project-detail', 'async-project-detail'),
+    'project-list': ('project-list', 'async-project-list'),
+    'bid-detail': ('project-bid-detail', 'async-bid-detail'),
+    'bid-list': ('project-bid-list', 'async-bid-list'),
+}
+
+BENCH_USERNAMES = ('async-bench-client', 'async-bench-freelancer')
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the sync viewset endpoints, served by a pool of WSGI threads, "
+        "with the async endpoints on one ASGI event loop, then delete the data"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoint', choices=sorted(ENDPOINTS), default='project-detail')
+        parser.add_argument('--projects', type=int, default=200)
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--threads', type=int, default=8,
+                            help='WSGI worker threads for the sync endpoint')
+        parser.add_argument('--concurrency', type=int, default=100,
+                            help='Requests in flight on the event loop for the async endpoint')
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        # Lets the test clients' Host through and keeps notification mail in memory
+        setup_test_environment()
+        try:
+            # Both servers read through their own connections, so the data is committed
+            client, freelancer = self.generate(options['projects'])
+            user = client if options['endpoint'].startswith('project') else freelancer
+            headers = {'Authorization': f'Bearer {AccessToken.for_user(user)}'}
+            sync_name, async_name = ENDPOINTS[options['endpoint']]
+            if options['endpoint'].startswith('project'):
+                pks = list(Project.objects.filter(client=client).values_list('pk', flat=True))
+            else:
+                pks = list(ProjectBid.objects.filter(freelancer=freelancer).values_list('pk', flat=True))
+            urls = [self.url(name, pks) for name in (sync_name, async_name)
+                    for _ in range(options['requests'])]
+            sync_urls, async_urls = urls[:options['requests']], urls[options['requests']:]
+
+            self.report(f"sync WSGI, {options['threads']} thread(s)", *self.run_sync(
+                sync_urls, headers, options['threads']
+            ))
+            self.report(f"async ASGI, {options['concurrency']} in flight", *asyncio.run(self.run_async(
+                async_urls, headers, options['concurrency']
+            )))
+        finally:
+            User.objects.filter(username__in=BENCH_USERNAMES).delete()
+            teardown_test_environment()
+
+    def url(self, name, pks):
+        if name.endswith('detail'):
+            return reverse(name, kwargs={'pk': random.choice(pks)})
+        return reverse(name)
+
+    def generate(self, total):
+        client, freelancer = (
+            User.objects.create_user(username=username, email=f'{username}@example.com', role=role)
+            for username, role in zip(BENCH_USERNAMES, ('CL', 'FR'))
+        )
+        projects = Project.objects.bulk_create([
+            Project(
+                title=f'Benchmark project {i}',
+                description='Generated for benchmark_async',
+                client=client,
+                budget_min=100,
+                budget_max=500,
+                deadline=timezone.now() + timedelta(days=30),
+            )
+            for i in range(total)
+        ])
+        ProjectBid.objects.bulk_create([
+            ProjectBid(project=project, freelancer=freelancer, amount=200,
+                       proposal='Benchmark bid', delivery_time=7)
+            for project in projects
+        ])
+        # bulk_create skips the signals that keep the counters in step
+        recount_bid_counters(Project.objects.filter(client=client))
+        self.stdout.write(f"Generated {total} project(s) with one bid each")
+        return client, freelancer
+
+    def run_sync(self, urls, headers, threads):
+        local = threading.local()
+
+        def fetch(url):
+            if not hasattr(local, 'client'):
+                local.client = Client()
+            started = time.perf_counter()
+            response = local.client.get(url, headers=headers)
+            return time.perf_counter() - started, response.status_code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            results = list(executor.map(fetch, urls))
+        return results, time.perf_counter() - started
+
+    async def run_async(self, urls, headers, concurrency):
+        client = AsyncClient()
+        slots = asyncio.Semaphore(concurrency)
+
+        async def fetch(url):
+            async with slots:
+                started = time.perf_counter()
+                response = await client.get(url, headers=headers)
+                return time.perf_counter() - started, response.status_code
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(fetch(url) for url in urls))
+        return results, time.perf_counter() - started
+
+    def report(self, label, results, elapsed):
+        latencies = sorted(latency for latency, _ in results)
+        errors = sum(1 for _, status_code in results if status_code != 200)
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\n== {label} =="))
+        self.stdout.write(
+            f"{len(results) / elapsed:.0f} req/s, "
+            f"p50 {statistics.median(latencies) * 1000:.1f} ms, "
+            f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f} ms, "
+            f"{errors} non-200 response(s)"
+        )
@@ -0,0 +1,123 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from projects.models import Project, ProjectBid
+from projects.pagination import ProjectCursorPagination, branch_windows, merge_windows
+from projects.visibility import (
+    VISIBILITY_STRATEGIES, filter_visible_to_freelancer, freelancer_listing_branches,
+)
+from users.models import User
+
+PAGE_SIZE = 20
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare freelancer visibility strategies on a generated dataset: "
+        "prints each query plan and its timings, then rolls the data back"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=1_000_000)
+        parser.add_argument('--open-ratio', type=float, default=0.1,
+                            help='Share of generated projects that are OPEN')
+        parser.add_argument('--bids', type=int, default=500,
+                            help='Bids placed by the measured freelancer')
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--batch-size', type=int, default=10_000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        with transaction.atomic():
+            freelancer = self.generate(options)
+            for strategy in VISIBILITY_STRATEGIES:
+                self.measure(strategy, freelancer, options['runs'])
+            # Leave the database exactly as it was
+            transaction.set_rollback(True)
+
+    def generate(self, options):
+        started = time.perf_counter()
+        client = User.objects.create_user(
+            username='visibility-bench-client', email='visibility-bench-client@example.com', role='CL'
+        )
+        freelancer = User.objects.create_user(
+            username='visibility-bench-freelancer', email='visibility-bench-freelancer@example.com', role='FR'
+        )
+        now = timezone.now()
+
+        total, batch_size = options['projects'], options['batch_size']
+        for start in range(0, total, batch_size):
+            Project.objects.bulk_create([
+                Project(
+                    title=f'Benchmark project {i}',
+                    description='Generated for benchmark_visibility',
+                    client=client,
+                    budget_min=100,
+                    budget_max=500,
+                    deadline=now + timedelta(days=30),
+                    status='OPEN' if random.random() < options['open_ratio'] else 'COMPLETED',
+                )
+                for i in range(start, min(start + batch_size, total))
+            ], batch_size=batch_size)
+
+        # Bid on closed projects, so the bid branch changes the result
+        closed = Project.objects.filter(client=client).exclude(status='OPEN').values_list('id', flat=True)
+        bid_on = random.sample(list(closed), min(options['bids'], len(closed)))
+        ProjectBid.objects.bulk_create([
+            ProjectBid(project_id=pk, freelancer=freelancer, amount=200,
+                       proposal='Benchmark bid', delivery_time=7, status='REJECTED')
+            for pk in bid_on
+        ], batch_size=batch_size)
+
+        if connection.vendor in ('postgresql', 'sqlite'):
+            # Fresh statistics, or the planner guesses from an empty table and
+            # takes any equality index over the ordered partial one
+            with connection.cursor() as cursor:
+                for model in (Project, ProjectBid):
+                    cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+
+        self.stdout.write(
+            f"Generated {total} project(s) and {len(bid_on)} bid(s) "
+            f"in {time.perf_counter() - started:.1f}s"
+        )
+        return freelancer
+
+    def measure(self, strategy, freelancer, runs):
+        ordering = ProjectCursorPagination.ordering
+        queryset = filter_visible_to_freelancer(
+            Project.objects.all(), freelancer, strategy
+        ).order_by(*ordering)
+        # The page as ProjectCursorPagination fetches it: whole, or per branch
+        windows = branch_windows(
+            queryset.values('id', 'created_at'),
+            freelancer_listing_branches(freelancer, strategy),
+            PAGE_SIZE + 1,
+        )
+
+        explain_options = {'analyze': True, 'buffers': True} if connection.vendor == 'postgresql' else {}
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\n== {strategy} =="))
+        for window in windows:
+            self.stdout.write(window.explain(**explain_options))
+
+        timings = {'first page': [], 'count': []}
+        for _ in range(runs):
+            started = time.perf_counter()
+            merge_windows([list(window.all()) for window in windows], ordering)[:PAGE_SIZE]
+            timings['first page'].append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            queryset.count()
+            timings['count'].append(time.perf_counter() - started)
+
+        for label, samples in timings.items():
+            self.stdout.write(
+                f"{label}: median {statistics.median(samples) * 1000:.1f} ms, "
+                f"best {min(samples) * 1000:.1f} ms over {runs} run(s)"
+            )
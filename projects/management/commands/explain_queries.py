@@ -0,0 +1,91 @@
+import re
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from freelancerPlatform.query_shapes import Sample, discover
+
+# Index names and full table scans in PostgreSQL and SQLite plans
+INDEX_PATTERN = re.compile(
+    r'(?:Index (?:Only )?Scan (?:Backward )?using|Bitmap Index Scan on|USING (?:COVERING )?INDEX) "?(\w+)"?'
+)
+FULL_SCAN_PATTERN = re.compile(r'(?:Seq Scan on "?(\w+)"?|\bSCAN (\w+)\s*$)', re.MULTILINE)
+
+
+def plan_usage(plan):
+    """(indexes used, tables read in full) in a textual query plan"""
+    indexes = set(INDEX_PATTERN.findall(plan))
+    full_scans = {next(name for name in match if name) for match in FULL_SCAN_PATTERN.findall(plan)}
+    return indexes, full_scans
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN every registered query shape against the current data and "
+        "report which indexes each plan uses and which declared ones none do"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--shape', action='append', default=[],
+                            help='Only shapes whose name contains this; repeatable')
+        parser.add_argument('--analyze', action='store_true',
+                            help='EXPLAIN ANALYZE on PostgreSQL, which runs the queries')
+        parser.add_argument('--quiet-plans', action='store_true',
+                            help='Print the index summary only')
+
+    def handle(self, *args, **options):
+        shapes = {
+            name: build for name, build in sorted(discover().items())
+            if not options['shape'] or any(part in name for part in options['shape'])
+        }
+        if not shapes:
+            raise CommandError('No query shape matches')
+
+        explain_options = {}
+        if connection.vendor == 'postgresql' and options['analyze']:
+            explain_options = {'analyze': True, 'buffers': True}
+
+        sample = Sample()
+        used_by = defaultdict(list)
+        tables = set()
+        for name, build in shapes.items():
+            queryset = build(sample)
+            plan = queryset.explain(**explain_options)
+            indexes, full_scans = plan_usage(plan)
+            for index in indexes:
+                used_by[index].append(name)
+            tables.add(queryset.model._meta.db_table)
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n== {name} =="))
+            if not options['quiet_plans']:
+                self.stdout.write(plan)
+            self.stdout.write(f"indexes: {', '.join(sorted(indexes)) or 'none'}")
+            if full_scans:
+                self.stdout.write(self.style.WARNING(f"full scans: {', '.join(sorted(full_scans))}"))
+
+        self.stdout.write(self.style.MIGRATE_HEADING('\n== Declared indexes =='))
+        scans = self.index_scan_counts()
+        for table in sorted(tables):
+            for index in self.declared_indexes(table):
+                shapes_using = used_by.get(index)
+                line = f"{table}.{index}: " + (f"{len(shapes_using)} shape(s)" if shapes_using else 'unused')
+                if index in scans:
+                    line += f", {scans[index]} scan(s) since the statistics were reset"
+                self.stdout.write(line if shapes_using else self.style.WARNING(line))
+
+    def declared_indexes(self, table):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, table)
+        return sorted(
+            name for name, details in constraints.items()
+            if details['index'] and not details['primary_key']
+        )
+
+    def index_scan_counts(self):
+        """Live idx_scan counters, which PostgreSQL alone keeps"""
+        if connection.vendor != 'postgresql':
+            return {}
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT indexrelname, idx_scan FROM pg_stat_user_indexes')
+            return dict(cursor.fetchall())
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.export import (
+    EXPORTS, EXPORT_FORMATS, EXPORT_CHUNK_SIZE, ExportError, parse_window, stream_export
+)
+
+
+class Command(BaseCommand):
+    help = "Stream projects, bids or milestones as NDJSON or CSV, optionally limited to an updated_at window"
+
+    def add_arguments(self, parser):
+        parser.add_argument('resource', choices=list(EXPORTS))
+        parser.add_argument('--format', dest='export_format', choices=EXPORT_FORMATS, default='ndjson')
+        parser.add_argument('--since', help='Only rows updated at or after this ISO 8601 timestamp')
+        parser.add_argument('--until', help='Only rows updated before this ISO 8601 timestamp (default: now)')
+        parser.add_argument('--output', help='Write to this file instead of stdout')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            since, until = parse_window(options['since'], options['until'])
+            stream = stream_export(
+                options['resource'], options['export_format'], since, until,
+                chunk_size=options['chunk_size']
+            )
+        except ExportError as e:
+            raise CommandError(str(e))
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+                for chunk in stream:
+                    output.write(chunk)
+        else:
+            for chunk in stream:
+                self.stdout.write(chunk, ending='')
+
+        # Pass this back as --since to pull only what changed afterwards
+        self.stderr.write(f"Exported up to {until.isoformat()}")
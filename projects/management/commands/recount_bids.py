@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from projects.counters import recount_bid_counters, stale_bid_counters
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    help = "Backfill or repair the denormalized bid counters on Project"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Recount every project instead of only those that disagree with their bids'
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Report stale projects without writing'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options['all']:
+            queryset = Project.objects.all()
+        else:
+            queryset = stale_bid_counters(Project.objects.all())
+
+        project_ids = list(queryset.order_by('pk').values_list('pk', flat=True))
+        self.stdout.write(f"{len(project_ids)} project(s) to recount")
+        if options['dry_run'] or not project_ids:
+            return
+
+        batch_size = options['batch_size']
+        updated = 0
+        for start in range(0, len(project_ids), batch_size):
+            batch = project_ids[start:start + batch_size]
+            updated += recount_bid_counters(Project.objects.filter(pk__in=batch))
+
+        self.stdout.write(self.style.SUCCESS(f"Recounted bids for {updated} project(s)"))
@@ -0,0 +1,56 @@
+from django.core.cache import cache
+
+METRIC_KEY = 'projects_metric_{}'
+
+AWARD_METRICS = (
+    'award_attempts',
+    'award_successes',
+    'award_conflicts',
+    'award_lock_wait_ms',
+)
+
+EXPIRY_METRICS = (
+    'expiry_runs',
+    'expiry_chunks',
+    'expiry_projects',
+    'expiry_bids_withdrawn',
+    'expiry_notifications',
+)
+EXPIRY_LAST_RUN_KEY = 'projects_metric_expiry_last_run'
+
+
+def increment(name, amount=1):
+    """Add amount to a shared counter, creating it on first use"""
+    key = METRIC_KEY.format(name)
+    if cache.add(key, amount, timeout=None):
+        return
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        # Evicted between add() and incr()
+        cache.set(key, amount, timeout=None)
+
+
+def snapshot(names):
+    values = cache.get_many([METRIC_KEY.format(name) for name in names])
+    return {name: values.get(METRIC_KEY.format(name), 0) for name in names}
+
+
+def award_metrics():
+    """Bid award counters plus the derived conflict rate and mean lock wait"""
+    metrics = snapshot(AWARD_METRICS)
+    attempts = metrics['award_attempts']
+    metrics['conflict_rate'] = round(metrics['award_conflicts'] / attempts, 4) if attempts else 0.0
+    metrics['avg_lock_wait_ms'] = round(metrics['award_lock_wait_ms'] / attempts, 2) if attempts else 0.0
+    return metrics
+
+
+def expiry_metrics():
+    """Deadline expiry counters plus when the last run finished and its cutoff"""
+    metrics = snapshot(EXPIRY_METRICS)
+    metrics['last_run'] = cache.get(EXPIRY_LAST_RUN_KEY)
+    return metrics
+
+
+def reset(names):
+    cache.delete_many([METRIC_KEY.format(name) for name in names])
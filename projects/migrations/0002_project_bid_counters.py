@@ -0,0 +1,60 @@
+# Generated by Django 5.1.4 on 2026-10-17 03:31
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_bid_counters(apps, schema_editor):
+    Project = apps.get_model('projects', 'Project')
+    ProjectBid = apps.get_model('projects', 'ProjectBid')
+
+    bids = ProjectBid.objects.filter(project=OuterRef('pk')).order_by().values('project')
+    pending = bids.filter(status='PENDING')
+    amount = models.DecimalField(max_digits=14, decimal_places=2)
+
+    Project.objects.update(
+        bid_count=Coalesce(Subquery(bids.annotate(value=Count('pk')).values('value')), 0),
+        bid_amount_sum=Coalesce(
+            Subquery(bids.annotate(value=Sum('amount')).values('value')),
+            Value(Decimal('0')), output_field=amount
+        ),
+        pending_bid_count=Coalesce(Subquery(pending.annotate(value=Count('pk')).values('value')), 0),
+        pending_bid_amount_sum=Coalesce(
+            Subquery(pending.annotate(value=Sum('amount')).values('value')),
+            Value(Decimal('0')), output_field=amount
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='bid_amount_sum',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='bid_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='pending_bid_amount_sum',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=14),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='pending_bid_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_bid_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.4 on 2026-10-17 03:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_project_bid_counters'),
+        ('users', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='project',
+            name='projects_pr_created_6b02e3_idx',
+        ),
+        migrations.AddIndex(
+            model_name='milestone',
+            index=models.Index(fields=['due_date', 'id'], name='projects_mi_due_dat_7a9cec_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['created_at', 'id'], name='projects_pr_created_3ed563_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectbid',
+            index=models.Index(fields=['amount', 'id'], name='projects_pr_amount_b75469_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.4 on 2026-10-17 03:37
+
+import django.db.models.deletion
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def backfill_skill_vectors(apps, schema_editor):
+    Project = apps.get_model('projects', 'Project')
+    ProjectSkillVector = apps.get_model('projects', 'ProjectSkillVector')
+
+    skills = defaultdict(list)
+    through = Project.required_skills.through.objects.values_list('project_id', 'skill_id')
+    for project_id, skill_id in through.iterator():
+        skills[project_id].append(skill_id)
+
+    vectors = []
+    for project_id, skill_ids in skills.items():
+        # Same layout as numpy.packbits(..., bitorder='little')
+        bits = bytearray(max(skill_ids) // 8 + 1)
+        for skill_id in skill_ids:
+            bits[skill_id // 8] |= 1 << (skill_id % 8)
+        vectors.append(ProjectSkillVector(
+            project_id=project_id, bits=bytes(bits), skill_count=len(skill_ids)
+        ))
+    ProjectSkillVector.objects.bulk_create(vectors, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0004_project_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectSkillVector',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='skill_vector', serialize=False, to='projects.project')),
+                ('bits', models.BinaryField(default=b'')),
+                ('skill_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_skill_vectors, migrations.RunPython.noop),
+    ]
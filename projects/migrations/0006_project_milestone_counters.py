@@ -0,0 +1,39 @@
+# Generated by Django 5.1.4 on 2026-10-17 03:41
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_milestone_counters(apps, schema_editor):
+    Project = apps.get_model('projects', 'Project')
+    Milestone = apps.get_model('projects', 'Milestone')
+
+    milestones = Milestone.objects.filter(project=OuterRef('pk')).order_by().values('project')
+    completed = milestones.filter(status='COMPLETED')
+
+    Project.objects.update(
+        milestone_count=Coalesce(Subquery(milestones.annotate(value=Count('pk')).values('value')), 0),
+        completed_milestone_count=Coalesce(Subquery(completed.annotate(value=Count('pk')).values('value')), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0005_project_skill_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='completed_milestone_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='milestone_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_milestone_counters, migrations.RunPython.noop),
+    ]
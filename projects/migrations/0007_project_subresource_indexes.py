@@ -0,0 +1,27 @@
+# Generated by Django 5.1.4 on 2026-10-17 03:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0006_project_milestone_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='milestone',
+            index=models.Index(fields=['project', 'due_date', 'id'], name='projects_mi_project_959d22_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectbid',
+            index=models.Index(fields=['project', 'amount', 'id'], name='projects_pr_project_d97288_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectfile',
+            index=models.Index(fields=['project', 'uploaded_at', 'id'], name='projects_pr_project_951d3c_idx'),
+        ),
+    ]
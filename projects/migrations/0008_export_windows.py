@@ -0,0 +1,33 @@
+# Generated by Django 5.1.4 on 2026-10-17 03:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_project_subresource_indexes'),
+        ('users', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='milestone',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='milestone',
+            index=models.Index(fields=['updated_at', 'id'], name='projects_mi_updated_bd4e01_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['updated_at', 'id'], name='projects_pr_updated_8fb9d7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectbid',
+            index=models.Index(fields=['updated_at', 'id'], name='projects_pr_updated_a5f2d2_idx'),
+        ),
+    ]
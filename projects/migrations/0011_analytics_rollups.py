@@ -0,0 +1,97 @@
+# Generated by Django 5.1.4 on 2026-10-17 04:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery
+
+
+def backfill_lifecycle_timestamps(apps, schema_editor):
+    Project = apps.get_model('projects', 'Project')
+    ProjectBid = apps.get_model('projects', 'ProjectBid')
+
+    # Best available estimates: when the winning bid was accepted, and the
+    # last update of a completed project
+    accepted = ProjectBid.objects.filter(project=OuterRef('pk'), status='ACCEPTED').order_by().values('updated_at')
+    Project.objects.filter(freelancer__isnull=False).update(awarded_at=Subquery(accepted[:1]))
+    Project.objects.filter(status='COMPLETED').update(completed_at=F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0010_project_expiry'),
+        ('users', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('projects_created', models.PositiveIntegerField(default=0)),
+                ('projects_awarded', models.PositiveIntegerField(default=0)),
+                ('projects_completed', models.PositiveIntegerField(default=0)),
+                ('bid_count', models.PositiveIntegerField(default=0)),
+                ('bid_amount_sum', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('bid_budget_sum', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('award_seconds_sum', models.BigIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+                ('date', models.DateField(unique=True)),
+            ],
+            options={
+                'ordering': ['date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='DailySkillRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('projects_created', models.PositiveIntegerField(default=0)),
+                ('projects_awarded', models.PositiveIntegerField(default=0)),
+                ('projects_completed', models.PositiveIntegerField(default=0)),
+                ('bid_count', models.PositiveIntegerField(default=0)),
+                ('bid_amount_sum', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('bid_budget_sum', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('award_seconds_sum', models.BigIntegerField(default=0)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+                ('date', models.DateField()),
+            ],
+            options={
+                'ordering': ['date'],
+            },
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='awarded_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['awarded_at'], name='projects_pr_awarded_b0911e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['completed_at'], name='projects_pr_complet_5f4dda_idx'),
+        ),
+        migrations.AddField(
+            model_name='dailyskillrollup',
+            name='skill',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='users.skill'),
+        ),
+        migrations.AddIndex(
+            model_name='dailyskillrollup',
+            index=models.Index(fields=['skill', 'date'], name='projects_da_skill_i_74b81c_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='dailyskillrollup',
+            unique_together={('date', 'skill')},
+        ),
+        migrations.RunPython(backfill_lifecycle_timestamps, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,110 @@
+# Generated by Django 5.1.4 on 2026-10-17 04:55
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0011_analytics_rollups'),
+        ('users', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedProject',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('budget_min', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('budget_max', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('deadline', models.DateTimeField()),
+                ('status', models.CharField(choices=[('OPEN', 'Open for Bids'), ('IN_PROGRESS', 'In Progress'), ('COMPLETED', 'Completed'), ('CANCELLED', 'Cancelled'), ('EXPIRED', 'Expired')], max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('awarded_at', models.DateTimeField(blank=True, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('bid_count', models.PositiveIntegerField(default=0)),
+                ('bid_amount_sum', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('pending_bid_count', models.PositiveIntegerField(default=0)),
+                ('pending_bid_amount_sum', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('milestone_count', models.PositiveIntegerField(default=0)),
+                ('completed_milestone_count', models.PositiveIntegerField(default=0)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('client', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_projects', to=settings.AUTH_USER_MODEL)),
+                ('freelancer', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('required_skills', models.ManyToManyField(related_name='+', to='users.skill')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedMilestone',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField()),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('due_date', models.DateTimeField()),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('IN_PROGRESS', 'In Progress'), ('COMPLETED', 'Completed'), ('CANCELLED', 'Cancelled')], max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='milestones', to='projects.archivedproject')),
+            ],
+            options={
+                'ordering': ['due_date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedProjectBid',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('proposal', models.TextField()),
+                ('delivery_time', models.IntegerField()),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('ACCEPTED', 'Accepted'), ('REJECTED', 'Rejected'), ('WITHDRAWN', 'Withdrawn')], max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('freelancer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_bids', to=settings.AUTH_USER_MODEL)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bids', to='projects.archivedproject')),
+            ],
+            options={
+                'ordering': ['amount'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedProjectFile',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('file', models.FileField(upload_to='project_files/%Y/%m/%d/')),
+                ('filename', models.CharField(blank=True, max_length=255)),
+                ('size', models.BigIntegerField(blank=True, null=True)),
+                ('description', models.CharField(blank=True, max_length=255)),
+                ('uploaded_at', models.DateTimeField()),
+                ('blob', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='archived_files', to='projects.fileblob')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='files', to='projects.archivedproject')),
+                ('uploaded_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-uploaded_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedproject',
+            index=models.Index(fields=['client'], name='projects_ar_client__6660c5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedproject',
+            index=models.Index(fields=['freelancer'], name='projects_ar_freelan_852727_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedprojectbid',
+            index=models.Index(fields=['freelancer'], name='projects_ar_freelan_e97686_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.4 on 2026-10-17 04:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0012_project_archive'),
+        ('users', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='project',
+            name='projects_pr_status_f023cb_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='project',
+            name='projects_pr_client__06571b_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='project',
+            name='projects_pr_freelan_0a8042_idx',
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['client', 'created_at', 'id'], name='projects_pr_client__bc1369_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('status', 'OPEN')), fields=['created_at', 'id'], name='project_open_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('status', 'OPEN')), fields=['budget_max', 'budget_min'], name='project_open_budget_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectbid',
+            index=models.Index(fields=['project', 'status'], name='projects_pr_project_ada2db_idx'),
+        ),
+    ]
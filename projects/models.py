@@ -1,16 +1,22 @@
+import os
+import uuid
+
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Q
 from django.conf import settings
 from django.utils import timezone
 
 from users.models import User, Skill
+from .downloads import stored_name_etag
 
 class Project(models.Model):
     STATUS_CHOICES = [
         ('OPEN', 'Open for Bids'),
         ('IN_PROGRESS', 'In Progress'),
         ('COMPLETED', 'Completed'),
-        ('CANCELLED', 'Cancelled')
+        ('CANCELLED', 'Cancelled'),
+        ('EXPIRED', 'Expired')
     ]
 
     title = models.CharField(max_length=200)
@@ -30,6 +36,50 @@ class Project(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='OPEN')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    awarded_at = models.DateTimeField(null=True, blank=True, editable=False)
+    completed_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    # Denormalized bid and milestone aggregates, maintained by projects.counters
+    bid_count = models.PositiveIntegerField(default=0, editable=False)
+    bid_amount_sum = models.DecimalField(max_digits=14, decimal_places=2, default=0, editable=False)
+    pending_bid_count = models.PositiveIntegerField(default=0, editable=False)
+    pending_bid_amount_sum = models.DecimalField(max_digits=14, decimal_places=2, default=0, editable=False)
+    milestone_count = models.PositiveIntegerField(default=0, editable=False)
+    completed_milestone_count = models.PositiveIntegerField(default=0, editable=False)
+
+    BID_COUNTER_FIELDS = ('bid_count', 'bid_amount_sum', 'pending_bid_count', 'pending_bid_amount_sum')
+    MILESTONE_COUNTER_FIELDS = ('milestone_count', 'completed_milestone_count')
+    COUNTER_FIELDS = BID_COUNTER_FIELDS + MILESTONE_COUNTER_FIELDS
+    # Columns the cached open-project recommendation matrix is built from
+    MATRIX_FIELDS = ('status', 'budget_max', 'created_at')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the persisted state so saves can tell whether the matrix changed
+        instance._loaded_matrix_state = instance.matrix_state()
+        return instance
+
+    def matrix_state(self):
+        if self.get_deferred_fields() & set(self.MATRIX_FIELDS):
+            return None
+        return tuple(getattr(self, field) for field in self.MATRIX_FIELDS)
+
+    def save(self, *args, **kwargs):
+        # Counters are only ever written with F() updates; never write back
+        # the possibly stale values held by this instance.
+        if not self._state.adding and self.pk and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    @property
+    def average_bid(self):
+        if not self.bid_count:
+            return 0
+        return self.bid_amount_sum / self.bid_count
 
     def clean(self):
         if self.budget_min > self.budget_max:
@@ -37,12 +87,17 @@ class Project(models.Model):
         if self.deadline and self.deadline < timezone.now():
             raise ValidationError("Deadline cannot be in the past")
 
-    def can_submit_bid(self, user):
+    def can_submit_bid(self, user, access=None):
+        """Pass the request's ProjectAccess to answer without querying bids"""
+        if access is not None:
+            has_bid = access.has_bid(self.pk)
+        else:
+            has_bid = self.bids.filter(freelancer=user).exists()
         return (
                 self.status == 'OPEN' and
                 user.role == 'FR' and
-                user != self.client and
-                not self.bids.filter(freelancer=user).exists()
+                user.id != self.client_id and
+                not has_bid
         )
 
     def award_to_freelancer(self, freelancer):
@@ -50,15 +105,30 @@ class Project(models.Model):
             raise ValidationError("Can only award open projects")
         self.freelancer = freelancer
         self.status = 'IN_PROGRESS'
+        self.awarded_at = timezone.now()
         self.save()
 
     class Meta:
         ordering = ['-created_at']
+        # client and freelancer are covered by their foreign key indexes, and
+        # status by the (status, deadline) prefix
         indexes = [
-            models.Index(fields=['status']),
-            models.Index(fields=['client']),
-            models.Index(fields=['freelancer']),
-            models.Index(fields=['created_at']),
+            # Matches the (created_at, id) keyset used by ProjectCursorPagination
+            models.Index(fields=['created_at', 'id']),
+            # A client's own listing, already in page order
+            models.Index(fields=['client', 'created_at', 'id']),
+            # Open projects in page order: the freelancer listing's open branch and ?status=OPEN
+            models.Index(fields=['created_at', 'id'], condition=Q(status='OPEN'), name='project_open_created_idx'),
+            # ?budget_min=/?budget_max= overlap on open projects
+            models.Index(
+                fields=['budget_max', 'budget_min'], condition=Q(status='OPEN'), name='project_open_budget_idx'
+            ),
+            models.Index(fields=['updated_at', 'id']),
+            # Lets the expiry task find overdue OPEN projects in deadline order
+            models.Index(fields=['status', 'deadline']),
+            # Day ranges scanned by the analytics rollups
+            models.Index(fields=['awarded_at']),
+            models.Index(fields=['completed_at']),
         ]
 
 class ProjectBid(models.Model):
@@ -78,23 +148,80 @@ class ProjectBid(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the persisted state so counter deltas can be computed on save
+        instance._loaded_counter_state = instance.counter_state()
+        return instance
+
+    def counter_state(self):
+        if self.get_deferred_fields() & {'project_id', 'status', 'amount'}:
+            return None
+        return self.project_id, self.status, self.amount
+
     class Meta:
         unique_together = ['project', 'freelancer']
         ordering = ['amount']
         indexes = [
             models.Index(fields=['status']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['amount', 'id']),
+            models.Index(fields=['project', 'amount', 'id']),
+            # Pending bids of a project, rejected or withdrawn on award and expiry
+            models.Index(fields=['project', 'status']),
+            models.Index(fields=['updated_at', 'id']),
         ]
 
+class FileBlob(models.Model):
+    """Content-addressed file body shared by every upload with the same bytes"""
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    file = models.FileField(upload_to='blobs/')
+    size = models.BigIntegerField()
+    uploaded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+
+class UploadSession(models.Model):
+    """A resumable upload whose chunks are appended to a partial file on disk"""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='upload_sessions')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='upload_sessions')
+    filename = models.CharField(max_length=255)
+    description = models.CharField(max_length=255, blank=True)
+    size = models.BigIntegerField()
+    sha256 = models.CharField(max_length=64, blank=True, help_text="Hash declared by the client")
+    offset = models.BigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def part_path(self):
+        return os.path.join(settings.CHUNKED_UPLOAD_DIR, f'{self.id}.part')
+
+
 class ProjectFile(models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='files')
     file = models.FileField(upload_to='project_files/%Y/%m/%d/')
+    # Set for chunked uploads; file then points at the shared blob's storage name
+    blob = models.ForeignKey(FileBlob, on_delete=models.PROTECT, null=True, blank=True, related_name='project_files')
+    filename = models.CharField(max_length=255, blank=True)
+    size = models.BigIntegerField(null=True, blank=True)
     uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE)
     description = models.CharField(max_length=255, blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
+    @property
+    def etag(self):
+        if self.blob_id:
+            return f'"{self.blob_id}"'
+        return stored_name_etag(self.file.name)
+
     class Meta:
         ordering = ['-uploaded_at']
+        indexes = [
+            models.Index(fields=['project', 'uploaded_at', 'id']),
+        ]
 
 class Milestone(models.Model):
     STATUS_CHOICES = [
@@ -111,7 +238,195 @@ class Milestone(models.Model):
     due_date = models.DateTimeField()
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     completed_at = models.DateTimeField(null=True, blank=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the persisted state so counter deltas can be computed on save
+        instance._loaded_counter_state = instance.counter_state()
+        return instance
+
+    def counter_state(self):
+        if self.get_deferred_fields() & {'project_id', 'status'}:
+            return None
+        return self.project_id, self.status
+
+    class Meta:
+        ordering = ['due_date']
+        indexes = [
+            models.Index(fields=['due_date', 'id']),
+            models.Index(fields=['project', 'due_date', 'id']),
+            models.Index(fields=['updated_at', 'id']),
+        ]
+
+class ProjectSearchDocument(models.Model):
+    """Per-project statistics for the local full-text index"""
+    project = models.OneToOneField(
+        Project,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='search_document'
+    )
+    length = models.PositiveIntegerField(default=0)
+
+
+class ProjectSearchPosting(models.Model):
+    """Weighted frequency of one term in one project"""
+    term = models.CharField(max_length=64)
+    document = models.ForeignKey(
+        ProjectSearchDocument,
+        on_delete=models.CASCADE,
+        related_name='postings'
+    )
+    frequency = models.PositiveIntegerField()
+
     class Meta:
-        ordering = ['due_date']
\ No newline at end of file
+        unique_together = ['term', 'document']
+
+
+class ProjectSkillVector(models.Model):
+    """Required skills of a project packed as a bitset indexed by skill id"""
+    project = models.OneToOneField(
+        Project,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='skill_vector'
+    )
+    bits = models.BinaryField(default=b'')
+    skill_count = models.PositiveIntegerField(default=0)
+
+
+class RollupMetrics(models.Model):
+    """Additive marketplace totals for one day; averages are derived from the sums"""
+    projects_created = models.PositiveIntegerField(default=0)
+    projects_awarded = models.PositiveIntegerField(default=0)
+    projects_completed = models.PositiveIntegerField(default=0)
+    bid_count = models.PositiveIntegerField(default=0)
+    bid_amount_sum = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    # Budget midpoints of the projects the counted bids were placed on
+    bid_budget_sum = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    # Creation to award, summed over the projects awarded that day
+    award_seconds_sum = models.BigIntegerField(default=0)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    METRIC_FIELDS = (
+        'projects_created', 'projects_awarded', 'projects_completed', 'bid_count',
+        'bid_amount_sum', 'bid_budget_sum', 'award_seconds_sum',
+    )
+
+    class Meta:
+        abstract = True
+
+
+class DailyRollup(RollupMetrics):
+    """Marketplace-wide totals per day, maintained by projects.analytics"""
+    date = models.DateField(unique=True)
+
+    class Meta:
+        ordering = ['date']
+
+
+class DailySkillRollup(RollupMetrics):
+    """Per-skill totals per day; a project counts once for each required skill"""
+    date = models.DateField()
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='daily_rollups')
+
+    class Meta:
+        ordering = ['date']
+        unique_together = ['date', 'skill']
+        indexes = [
+            models.Index(fields=['skill', 'date']),
+        ]
+
+
+class ArchivedProject(models.Model):
+    """
+    A finished project moved out of the hot tables by projects.archive. It
+    keeps its original id, so detail reads and conversations still find it.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField()
+    client = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_projects')
+    freelancer = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    required_skills = models.ManyToManyField(Skill, related_name='+')
+    budget_min = models.DecimalField(max_digits=10, decimal_places=2)
+    budget_max = models.DecimalField(max_digits=10, decimal_places=2)
+    deadline = models.DateTimeField()
+    status = models.CharField(max_length=20, choices=Project.STATUS_CHOICES)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    awarded_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    bid_count = models.PositiveIntegerField(default=0)
+    bid_amount_sum = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    pending_bid_count = models.PositiveIntegerField(default=0)
+    pending_bid_amount_sum = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    milestone_count = models.PositiveIntegerField(default=0)
+    completed_milestone_count = models.PositiveIntegerField(default=0)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    @property
+    def average_bid(self):
+        if not self.bid_count:
+            return 0
+        return self.bid_amount_sum / self.bid_count
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['client']),
+            models.Index(fields=['freelancer']),
+        ]
+
+
+class ArchivedProjectBid(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    project = models.ForeignKey(ArchivedProject, on_delete=models.CASCADE, related_name='bids')
+    freelancer = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_bids')
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    proposal = models.TextField()
+    delivery_time = models.IntegerField()
+    status = models.CharField(max_length=20, choices=ProjectBid.STATUS_CHOICES)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['amount']
+        indexes = [
+            models.Index(fields=['freelancer']),
+        ]
+
+
+class ArchivedMilestone(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    project = models.ForeignKey(ArchivedProject, on_delete=models.CASCADE, related_name='milestones')
+    title = models.CharField(max_length=200)
+    description = models.TextField()
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    due_date = models.DateTimeField()
+    status = models.CharField(max_length=20, choices=Milestone.STATUS_CHOICES)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['due_date']
+
+
+class ArchivedProjectFile(models.Model):
+    """Metadata only; the stored file and its blob stay where they were"""
+    id = models.BigIntegerField(primary_key=True)
+    project = models.ForeignKey(ArchivedProject, on_delete=models.CASCADE, related_name='files')
+    file = models.FileField(upload_to='project_files/%Y/%m/%d/')
+    blob = models.ForeignKey(FileBlob, on_delete=models.PROTECT, null=True, blank=True, related_name='archived_files')
+    filename = models.CharField(max_length=255, blank=True)
+    size = models.BigIntegerField(null=True, blank=True)
+    uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    description = models.CharField(max_length=255, blank=True)
+    uploaded_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-uploaded_at']
@@ -0,0 +1,209 @@
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination, _reverse_ordering
+
+from .visibility import freelancer_listing_branches
+
+
+def _row_value(row, field):
+    return row[field] if isinstance(row, dict) else getattr(row, field)
+
+
+def branch_windows(queryset, branches, limit):
+    """
+    Slices of an ordered queryset to fetch for one page: the queryset itself,
+    or one per branch predicate so each branch reads its own index and stops
+    at the limit
+    """
+    if not branches:
+        return [queryset[:limit]]
+    return [queryset.filter(branch)[:limit] for branch in branches]
+
+
+def merge_windows(windows, ordering):
+    """Rows of the fetched windows in ordering, each row once, as UNION ... ORDER BY would"""
+    if len(windows) == 1:
+        return list(windows[0])
+    rows = list({_row_value(row, 'id'): row for window in windows for row in window}.values())
+    # Stable sorts from the last key to the first give the composite order
+    for order in reversed(ordering):
+        rows.sort(key=lambda row: _row_value(row, order.lstrip('-')), reverse=order.startswith('-'))
+    return rows
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination over a composite, unique ordering such as
+    (created_at, id). The cursor stores the full key of the boundary row and
+    pages are fetched with an expanded row-value comparison whose leading
+    column is bounded, so every page costs one index range scan no matter
+    how deep it is.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    tiebreaker = 'id'
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        fields = [field.lstrip('-') for field in ordering]
+        if self.tiebreaker not in fields and 'pk' not in fields:
+            # Make the ordering unique so positions never need an offset
+            descending = ordering[0].startswith('-')
+            ordering = ordering + (('-' if descending else '') + self.tiebreaker,)
+        return ordering
+
+    def get_branches(self, request):
+        """
+        Predicates splitting the queryset into parts that are cheaper to page
+        one by one; each is fetched up to the page size and the results are
+        merged. None pages the queryset as a whole.
+        """
+        return None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        windows = self._page_windows(queryset, request, view)
+        if windows is None:
+            return None
+        return self._set_page(self._merge([list(window) for window in windows]))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset for async views; rows are fetched with aiterator()"""
+        windows = self._page_windows(queryset, request, view)
+        if windows is None:
+            return None
+        # aiterator() only honours prefetch_related() when given a chunk size
+        return self._set_page(self._merge([
+            [row async for row in window.aiterator(chunk_size=self.page_size + 1)]
+            for window in windows
+        ]))
+
+    def _page_windows(self, queryset, request, view):
+        """The queryset slices holding the requested page plus one lookahead row"""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+        self._offset, self._reverse, self._current_position = offset, reverse, current_position
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            queryset = queryset.filter(self._after_position(queryset.model, current_position, reverse))
+
+        return branch_windows(queryset, self.get_branches(request), offset + self.page_size + 1)
+
+    def _merge(self, windows):
+        ordering = _reverse_ordering(self.ordering) if self._reverse else self.ordering
+        return merge_windows(windows, ordering)[self._offset:]
+
+    def _set_page(self, results):
+        offset, reverse, current_position = self._offset, self._reverse, self._current_position
+        self.page = list(results[:self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def _after_position(self, model, position, reverse):
+        """Expand (a, b) > (x, y) into a >= x AND (a > x OR (a = x AND b > y))"""
+        try:
+            values = json.loads(position)
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise NotFound(self.invalid_cursor_message)
+            # Tampered values must not reach the database as bad comparisons
+            fields = [order.lstrip('-') for order in self.ordering]
+            values = [
+                (model._meta.pk if field == 'pk' else model._meta.get_field(field)).to_python(value)
+                for field, value in zip(fields, values)
+            ]
+        except (ValueError, ValidationError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+        if None in values:
+            raise NotFound(self.invalid_cursor_message)
+
+        condition = Q()
+        equal = {}
+        for order, value in zip(self.ordering, values):
+            field = order.lstrip('-')
+            lookup = 'lt' if order.startswith('-') != reverse else 'gt'
+            condition |= Q(**equal, **{f'{field}__{lookup}': value})
+            equal[field] = value
+        # The OR alone has no bound the planner can seek to; a <= x (or >=)
+        # makes the leading column an index range starting at the cursor
+        leading = self.ordering[0]
+        bound = 'lte' if leading.startswith('-') != reverse else 'gte'
+        return Q(**{f'{leading.lstrip("-")}__{bound}': values[0]}) & condition
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for order in ordering:
+            field = order.lstrip('-')
+            attr = instance[field] if isinstance(instance, dict) else getattr(instance, field)
+            values.append(str(attr))
+        return json.dumps(values)
+
+
+class ProjectCursorPagination(KeysetCursorPagination):
+    ordering = ('-created_at', '-id')
+
+    def get_branches(self, request):
+        return freelancer_listing_branches(request.user)
+
+
+class BidCursorPagination(KeysetCursorPagination):
+    ordering = ('amount', 'id')
+
+
+class MilestoneCursorPagination(KeysetCursorPagination):
+    ordering = ('due_date', 'id')
+
+
+class FileCursorPagination(KeysetCursorPagination):
+    ordering = ('-uploaded_at', '-id')
+
+
+class SearchResultPagination(PageNumberPagination):
+    """Ranked search results have no stable key, so they page by number"""
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -1,18 +1,18 @@
 from rest_framework import permissions
 
+from projects.access import ProjectAccess, project_id_of
 from projects.models import ProjectBid
 
 
 class IsProjectOwner(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
-        return obj.client == request.user
+        return ProjectAccess.for_request(request).is_client(project_id_of(obj))
 
 
 class IsProjectParticipant(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
-        return (obj.client == request.user or
-                obj.freelancer == request.user or
-                obj.bids.filter(freelancer=request.user).exists())
+        # Works for projects and for files and milestones through their project
+        return ProjectAccess.for_request(request).is_participant(project_id_of(obj))
 
 
 class CanSubmitBid(permissions.BasePermission):
@@ -26,7 +26,7 @@ class CanSubmitBid(permissions.BasePermission):
         # For GET requests and bid withdrawal
         if request.method in permissions.SAFE_METHODS or view.action == 'withdraw_bid':
             if isinstance(obj, ProjectBid):
-                return obj.freelancer == request.user
+                return obj.freelancer_id == request.user.id
             return True
 
         return True
@@ -34,8 +34,10 @@ class CanSubmitBid(permissions.BasePermission):
 
 class CanManageMilestones(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
-        # Only project owner can create/update milestones
-        if request.method in ['POST', 'PUT', 'PATCH']:
-            return obj.client == request.user
+        access = ProjectAccess.for_request(request)
+        project_id = project_id_of(obj)
+        # Only project owner can create, update or delete milestones
+        if request.method not in permissions.SAFE_METHODS:
+            return access.is_client(project_id)
         # Both client and freelancer can view milestones
-        return obj.client == request.user or obj.freelancer == request.user
\ No newline at end of file
+        return access.is_member(project_id)
@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+import numpy as np
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import ArchivedProjectBid, ProjectBid
+
+SKILL_PRICES_KEY = 'projects_skill_prices_{}'
+# Refreshed nightly; the margin covers a late or slow refresh run
+SKILL_PRICES_TIMEOUT = 26 * 60 * 60
+# Only recent bids reflect current prices
+PRICE_WINDOW_DAYS = 365
+PRICE_PERCENTILES = (10, 25, 50, 75, 90)
+HISTOGRAM_BINS = 10
+# The histogram spans these percentiles so a few outliers don't flatten it
+HISTOGRAM_RANGE = (1, 99)
+PRICED_STATUSES = ('PENDING', 'ACCEPTED', 'REJECTED')
+
+
+def priced_bids(fields, **filters):
+    """
+    Rows of fields for the bids in the price window. Finished projects are
+    archived before their bids leave the window, so the archive is read too.
+    """
+    since = timezone.now() - timedelta(days=PRICE_WINDOW_DAYS)
+    hot, archived = (
+        model.objects.filter(status__in=PRICED_STATUSES, created_at__gte=since, **filters)
+        .order_by().values_list(*fields)
+        for model in (ProjectBid, ArchivedProjectBid)
+    )
+    return hot.union(archived, all=True)
+
+
+def price_distribution(amounts, delivery_days):
+    """Summary of bid amounts and their relation to delivery time, from two float arrays"""
+    count = len(amounts)
+    if not count:
+        return {'count': 0}
+
+    percentiles = np.percentile(amounts, PRICE_PERCENTILES)
+    low, high = np.percentile(amounts, HISTOGRAM_RANGE)
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    counts, edges = np.histogram(np.clip(amounts, low, high), bins=HISTOGRAM_BINS, range=(low, high))
+
+    correlation = None
+    # Pearson r is undefined when either column is constant
+    if count > 1 and np.ptp(amounts) > 0 and np.ptp(delivery_days) > 0:
+        correlation = round(float(np.corrcoef(amounts, delivery_days)[0, 1]), 4)
+
+    return {
+        'count': count,
+        'mean': round(float(amounts.mean()), 2),
+        'std': round(float(amounts.std()), 2),
+        'min': round(float(amounts.min()), 2),
+        'max': round(float(amounts.max()), 2),
+        'percentiles': {f'p{q}': round(float(v), 2) for q, v in zip(PRICE_PERCENTILES, percentiles)},
+        'histogram': [
+            {'lower': round(float(lo), 2), 'upper': round(float(hi), 2), 'count': int(n)}
+            for lo, hi, n in zip(edges[:-1], edges[1:], counts)
+        ],
+        'delivery_correlation': correlation,
+    }
+
+
+def _columns(rows, width):
+    return np.array(rows, dtype=np.float64).reshape(-1, width)
+
+
+def compute_skill_prices(skill_id):
+    """Price distribution of bids on projects that require one skill"""
+    rows = priced_bids(('amount', 'delivery_time'), project__required_skills=skill_id)
+    columns = _columns(list(rows), 2)
+    stats = price_distribution(columns[:, 0], columns[:, 1])
+    stats['computed_at'] = timezone.now()
+    return stats
+
+
+def skill_prices(skill_ids):
+    """Cached price distributions for several skills; misses are computed and cached"""
+    keys = {skill_id: SKILL_PRICES_KEY.format(skill_id) for skill_id in skill_ids}
+    cached = cache.get_many(keys.values())
+    result = {}
+    for skill_id, key in keys.items():
+        stats = cached.get(key)
+        if stats is None:
+            stats = compute_skill_prices(skill_id)
+            cache.set(key, stats, timeout=SKILL_PRICES_TIMEOUT)
+        result[skill_id] = stats
+    return result
+
+
+def refresh_skill_prices():
+    """
+    Recompute every skill's distribution from a single query: the (skill,
+    amount, delivery time) columns of all recent bids are sorted by skill
+    and split into per-skill slices. Returns the number of skills cached.
+    """
+    rows = priced_bids(
+        ('project__required_skills', 'amount', 'delivery_time'), project__required_skills__isnull=False
+    )
+    columns = _columns(list(rows), 3)
+    columns = columns[np.argsort(columns[:, 0], kind='stable')]
+    skill_ids, starts = np.unique(columns[:, 0], return_index=True)
+
+    now = timezone.now()
+    entries = {}
+    for skill_id, part in zip(skill_ids, np.split(columns, starts[1:])):
+        stats = price_distribution(part[:, 1], part[:, 2])
+        stats['computed_at'] = now
+        entries[SKILL_PRICES_KEY.format(int(skill_id))] = stats
+    cache.set_many(entries, timeout=SKILL_PRICES_TIMEOUT)
+    return len(entries)
@@ -0,0 +1,73 @@
+from django.db.models import Q
+from django.http import QueryDict
+from django.utils import timezone
+
+from freelancerPlatform.query_shapes import query_shape
+from .archive import ARCHIVE_CHUNK_SIZE, archivable_projects, archive_cutoff
+from .bidbook import BOOK_STATUSES
+from .expiry import EXPIRY_CHUNK_SIZE, overdue_projects
+from .models import Milestone, Project, ProjectBid
+from .pagination import BidCursorPagination, ProjectCursorPagination
+from .visibility import filter_project_listing
+
+PAGE_SIZE = ProjectCursorPagination.page_size
+
+
+def _listing(user, query_string=''):
+    """The first page of ProjectViewSet.list for user and query_string"""
+    queryset = filter_project_listing(Project.objects.all(), user, QueryDict(query_string))
+    return queryset.order_by(*ProjectCursorPagination.ordering)[:PAGE_SIZE]
+
+
+@query_shape('project listing, freelancer')
+def freelancer_listing(sample):
+    return _listing(sample.freelancer)
+
+
+@query_shape('project listing, freelancer, ?status=OPEN')
+def open_listing(sample):
+    return _listing(sample.freelancer, 'status=OPEN')
+
+
+@query_shape('project listing, freelancer, ?budget_min=&budget_max=')
+def budget_listing(sample):
+    return _listing(sample.freelancer, 'status=OPEN&budget_min=100&budget_max=500')
+
+
+@query_shape('project listing, client')
+def client_listing(sample):
+    return _listing(sample.client)
+
+
+@query_shape('bid listing')
+def bid_listing(sample):
+    return ProjectBid.objects.filter(
+        Q(project__client=sample.freelancer) | Q(freelancer=sample.freelancer)
+    ).order_by(*BidCursorPagination.ordering)[:PAGE_SIZE]
+
+
+@query_shape('bid book')
+def bid_book(sample):
+    return ProjectBid.objects.filter(
+        project_id=sample.project_id, status__in=BOOK_STATUSES
+    ).order_by('amount', 'id')
+
+
+@query_shape('pending bids of a project')
+def pending_bids(sample):
+    return ProjectBid.objects.filter(project_id=sample.project_id, status='PENDING')
+
+
+@query_shape('project milestones')
+def project_milestones(sample):
+    return Milestone.objects.filter(project_id=sample.project_id).order_by('due_date', 'id')[:PAGE_SIZE]
+
+
+@query_shape('overdue open projects')
+def overdue(sample):
+    return overdue_projects(timezone.now()).order_by('deadline', 'id')[:EXPIRY_CHUNK_SIZE]
+
+
+@query_shape('archivable projects')
+def archivable(sample):
+    return archivable_projects(archive_cutoff()).order_by('updated_at', 'id')[:ARCHIVE_CHUNK_SIZE]
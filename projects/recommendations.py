@@ -0,0 +1,118 @@
+import math
+
+import numpy as np
+from django.core.cache import cache
+from django.utils import timezone
+
+from freelancerPlatform.replicas import primary_reads
+from users.models import Profile
+from .cache import recommendation_generation
+from .models import ProjectBid, ProjectSkillVector
+
+MATRIX_CACHE_KEY = 'project_skill_matrix_{}'
+MATRIX_CACHE_TIMEOUT = 60 * 60
+
+# Weights of the three score components; they sum to 1
+SKILL_WEIGHT = 0.6
+BUDGET_WEIGHT = 0.25
+RECENCY_WEIGHT = 0.15
+
+# A project fits the budget if it pays for this many hours at the freelancer's rate
+MIN_BILLABLE_HOURS = 10
+RECENCY_HALF_LIFE_DAYS = 7
+
+
+def pack_skills(skill_ids):
+    """Pack skill ids into a little bitset where bit n is skill n"""
+    skill_ids = list(skill_ids)
+    if not skill_ids:
+        return b''
+    flags = np.zeros(max(skill_ids) + 1, dtype=bool)
+    flags[skill_ids] = True
+    return np.packbits(flags, bitorder='little').tobytes()
+
+
+def refresh_skill_vector(project):
+    skill_ids = list(project.required_skills.values_list('id', flat=True))
+    ProjectSkillVector.objects.update_or_create(
+        project=project,
+        defaults={'bits': pack_skills(skill_ids), 'skill_count': len(skill_ids)}
+    )
+
+
+def _build_matrix():
+    rows = list(
+        ProjectSkillVector.objects
+        .filter(project__status='OPEN', skill_count__gt=0)
+        .values_list('project_id', 'bits', 'skill_count',
+                     'project__budget_max', 'project__created_at')
+    )
+    if not rows:
+        return None
+
+    width = max(len(bits) for _, bits, *_ in rows)
+    matrix = np.zeros((len(rows), width), dtype=np.uint8)
+    for row, (_, bits, *_) in enumerate(rows):
+        bits = bytes(bits)
+        matrix[row, :len(bits)] = np.frombuffer(bits, dtype=np.uint8)
+
+    return {
+        'ids': np.array([row[0] for row in rows], dtype=np.int64),
+        'bits': matrix,
+        'skill_count': np.array([row[2] for row in rows], dtype=np.float64),
+        'budget_max': np.array([float(row[3]) for row in rows], dtype=np.float64),
+        'created_at': np.array([row[4].timestamp() for row in rows], dtype=np.float64),
+    }
+
+
+def open_project_matrix():
+    """Skill bitsets and scoring columns of all open projects, cached per generation"""
+    key = MATRIX_CACHE_KEY.format(recommendation_generation())
+    matrix = cache.get(key)
+    if matrix is None:
+        with primary_reads():
+            matrix = _build_matrix()
+        cache.set(key, matrix or {}, timeout=MATRIX_CACHE_TIMEOUT)
+    return matrix or None
+
+
+def recommend_projects(user, limit=20):
+    """
+    Score every open project for a freelancer in one vectorized pass and
+    return up to limit (project_id, score) pairs, best first.
+    """
+    profile = Profile.objects.filter(user=user).first()
+    if profile is None:
+        return []
+    user_bits = pack_skills(profile.skills.values_list('id', flat=True))
+    if not user_bits:
+        return []
+
+    matrix = open_project_matrix()
+    if matrix is None:
+        return []
+
+    width = matrix['bits'].shape[1]
+    wanted = np.zeros(width, dtype=np.uint8)
+    user_bits = np.frombuffer(user_bits, dtype=np.uint8)[:width]
+    wanted[:len(user_bits)] = user_bits
+
+    overlap = np.unpackbits(matrix['bits'] & wanted, axis=1).sum(axis=1)
+    coverage = overlap / matrix['skill_count']
+
+    if profile.hourly_rate:
+        minimum = float(profile.hourly_rate) * MIN_BILLABLE_HOURS
+        budget_fit = np.clip(matrix['budget_max'] / minimum, 0, 1)
+    else:
+        budget_fit = np.ones_like(coverage)
+
+    age_days = (timezone.now().timestamp() - matrix['created_at']) / 86400
+    recency = np.exp(-np.clip(age_days, 0, None) * math.log(2) / RECENCY_HALF_LIFE_DAYS)
+
+    scores = SKILL_WEIGHT * coverage + BUDGET_WEIGHT * budget_fit + RECENCY_WEIGHT * recency
+
+    already_bid = list(ProjectBid.objects.filter(freelancer=user).values_list('project_id', flat=True))
+    candidates = np.flatnonzero((overlap > 0) & ~np.isin(matrix['ids'], already_bid))
+    best = candidates[np.argsort(-scores[candidates], kind='stable')][:limit]
+
+    return [(int(matrix['ids'][i]), float(scores[i])) for i in best]
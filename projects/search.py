@@ -0,0 +1,140 @@
+import math
+import re
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Avg, Case, Count, FloatField, Sum, Value, When
+from django.db.models.functions import Cast
+
+from .models import Project, ProjectSearchDocument, ProjectSearchPosting
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+STOP_WORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in',
+    'is', 'it', 'of', 'on', 'or', 'the', 'to', 'with',
+})
+MAX_TERM_LENGTH = 64
+
+# Title and skill matches count for more than matches in the description
+FIELD_WEIGHTS = {'title': 3, 'skills': 2, 'description': 1}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+MAX_CANDIDATES = 1000
+
+
+def tokenize(text):
+    return [
+        token[:MAX_TERM_LENGTH]
+        for token in TOKEN_RE.findall((text or '').lower())
+        if len(token) > 1 and token not in STOP_WORDS
+    ]
+
+
+def project_term_frequencies(project, skill_names):
+    frequencies = Counter()
+    fields = {
+        'title': [project.title],
+        'description': [project.description],
+        'skills': skill_names,
+    }
+    for field, texts in fields.items():
+        for text in texts:
+            for token in tokenize(text):
+                frequencies[token] += FIELD_WEIGHTS[field]
+    return frequencies
+
+
+def index_project(project):
+    """Bring the postings of a single project in line with its current text"""
+    skill_names = list(project.required_skills.values_list('name', flat=True))
+    frequencies = project_term_frequencies(project, skill_names)
+
+    with transaction.atomic():
+        document, _ = ProjectSearchDocument.objects.update_or_create(
+            project=project,
+            defaults={'length': sum(frequencies.values())}
+        )
+
+        existing = {
+            posting.term: posting
+            for posting in ProjectSearchPosting.objects.filter(document=document)
+        }
+
+        removed = [posting.pk for term, posting in existing.items() if term not in frequencies]
+        if removed:
+            ProjectSearchPosting.objects.filter(pk__in=removed).delete()
+
+        changed = []
+        created = []
+        for term, frequency in frequencies.items():
+            posting = existing.get(term)
+            if posting is None:
+                created.append(ProjectSearchPosting(term=term, document=document, frequency=frequency))
+            elif posting.frequency != frequency:
+                posting.frequency = frequency
+                changed.append(posting)
+
+        if changed:
+            ProjectSearchPosting.objects.bulk_update(changed, ['frequency'])
+        if created:
+            ProjectSearchPosting.objects.bulk_create(created)
+
+
+def rebuild_index(batch_size=500):
+    """Re-index every project; unchanged postings are left untouched"""
+    count = 0
+    for project in Project.objects.order_by('pk').iterator(chunk_size=batch_size):
+        index_project(project)
+        count += 1
+    return count
+
+
+def _idf(total, df):
+    return math.log(1 + (total - df + 0.5) / (df + 0.5))
+
+
+def search_projects(query, limit=MAX_CANDIDATES, projects=None):
+    """
+    Rank projects against query with BM25, scored and cut to limit by the
+    database. Only projects in the projects queryset, when given, are
+    ranked, so the cut never drops a visible match for invisible ones.
+    Returns up to limit (project_id, score) pairs, best first.
+    """
+    terms = set(tokenize(query))
+    if not terms:
+        return []
+
+    stats = ProjectSearchDocument.objects.aggregate(total=Count('pk'), avg_length=Avg('length'))
+    total = stats['total']
+    avg_length = stats['avg_length'] or 1
+    if not total:
+        return []
+
+    # One row per query term; scores use corpus-wide frequencies whoever asks
+    document_frequency = dict(
+        ProjectSearchPosting.objects.filter(term__in=terms)
+        .order_by().values('term').annotate(df=Count('pk')).values_list('term', 'df')
+    )
+    if not document_frequency:
+        return []
+
+    idf = Case(
+        *[When(term=term, then=Value(_idf(total, df))) for term, df in document_frequency.items()],
+        output_field=FloatField()
+    )
+    frequency = Cast('frequency', FloatField())
+    norm = K1 * (1 - B + B * Cast('document__length', FloatField()) / avg_length)
+
+    postings = ProjectSearchPosting.objects.filter(term__in=document_frequency)
+    if projects is not None:
+        postings = postings.filter(document_id__in=projects.values('pk'))
+    ranked = (
+        postings.order_by().values('document_id')
+        .annotate(score=Sum(idf * frequency * (K1 + 1) / (frequency + norm)))
+        .order_by('-score', 'document_id')
+        .values_list('document_id', 'score')[:limit]
+    )
+    return list(ranked)
@@ -1,15 +1,113 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
 from rest_framework import serializers
-from .models import Project, ProjectBid, ProjectFile, Milestone
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.reverse import reverse
+from .access import ProjectAccess
+from .models import ArchivedProject, ArchivedProjectFile, Project, ProjectBid, ProjectFile, Milestone, UploadSession
+from .thumbnails import is_image, thumbnail_urls
 from users.serializers import UserSerializer, SkillSerializer
 
+# Embedded collections hold at most this many rows; the rest is paged
+# through the sub-resource links
+NESTED_COLLECTION_LIMIT = 10
+# Attribute that a capped Prefetch(..., to_attr=...) stores a collection under
+CAPPED_ATTR = 'capped_{}'
+
+
+def requested_fields(request, param):
+    """Comma separated names from ?fields= or ?expand=, or None if absent"""
+    if request is None or param not in request.query_params:
+        return None
+    return {name.strip() for name in request.query_params[param].split(',') if name.strip()}
+
+
+class CappedListSerializer(serializers.ListSerializer):
+    """Serialize at most NESTED_COLLECTION_LIMIT related rows"""
+
+    def get_attribute(self, instance):
+        prefetched = getattr(instance, CAPPED_ATTR.format(self.field_name), None)
+        if prefetched is not None:
+            return prefetched
+        return super().get_attribute(instance).all()[:NESTED_COLLECTION_LIMIT]
+
+
+class SparseFieldsMixin:
+    """
+    Restrict output to the names in ?fields=. The collections in
+    expandable_fields are embedded unless ?fields= leaves them out, and
+    ?expand= adds them back to a trimmed payload.
+    """
+    expandable_fields = ()
+
+    @classmethod
+    def embedded_fields(cls, request):
+        """The expandable_fields a response to request embeds"""
+        only = requested_fields(request, 'fields')
+        if not only or request.method != 'GET':
+            return set(cls.expandable_fields)
+        expand = requested_fields(request, 'expand') or set()
+        return (only | expand) & set(cls.expandable_fields)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None:
+            return
+
+        embedded = self.embedded_fields(request)
+        for name in self.expandable_fields:
+            if name not in embedded:
+                self.fields.pop(name)
+
+        # Writable fields must stay, or their input would be silently dropped
+        only = requested_fields(request, 'fields')
+        if only and request.method == 'GET':
+            for name in set(self.fields) - only - embedded:
+                self.fields.pop(name)
+
+
+class CanBidMixin:
+    """
+    Adds get_can_bid for a can_bid field. Every row reads the request's
+    ProjectAccess, so a whole page costs one query rather than one per project.
+    """
+
+    def get_can_bid(self, obj):
+        request = self.context.get('request')
+        if request is None:
+            return None
+        return ProjectAccess.for_request(request).can_bid(obj)
+
 
 class ProjectFileSerializer(serializers.ModelSerializer):
     uploaded_by = UserSerializer(read_only=True)
+    sha256 = serializers.CharField(source='blob_id', read_only=True)
+    thumbnails = serializers.SerializerMethodField()
 
     class Meta:
         model = ProjectFile
         fields = '__all__'
-        read_only_fields = ('uploaded_by',)
+        # Blobs are only linked through the upload protocol, which checks access
+        read_only_fields = ('uploaded_by', 'blob', 'filename', 'size')
+
+    def get_thumbnails(self, obj):
+        if not obj.blob_id or not is_image(obj.filename or obj.file.name):
+            return None
+        return thumbnail_urls('project-file-thumbnail', {'pk': obj.pk}, self.context.get('request'))
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    size = serializers.IntegerField(min_value=1, max_value=settings.CHUNKED_UPLOAD_MAX_SIZE)
+    sha256 = serializers.RegexField(r'^[0-9a-fA-F]{64}$', required=False, allow_blank=True)
+
+    class Meta:
+        model = UploadSession
+        fields = ('id', 'project', 'filename', 'description', 'size', 'sha256',
+                  'offset', 'created_at', 'updated_at')
+        read_only_fields = ('id', 'offset', 'created_at', 'updated_at')
 
 
 class MilestoneSerializer(serializers.ModelSerializer):
@@ -19,6 +117,46 @@ class MilestoneSerializer(serializers.ModelSerializer):
         read_only_fields = ('created_at', 'completed_at')
 
 
+class MilestoneBatchItemSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Milestone
+        fields = ('title', 'description', 'amount', 'due_date', 'status')
+
+
+class MilestoneBatchCreateSerializer(serializers.Serializer):
+    project = serializers.PrimaryKeyRelatedField(queryset=Project.objects.all())
+    milestones = MilestoneBatchItemSerializer(many=True, allow_empty=False, max_length=100)
+
+    def validate_project(self, project):
+        # Runs before the schedule is validated, so a non-owner gets a 403
+        # without learning anything about the project from the errors
+        if project.client_id != self.context['request'].user.id:
+            raise PermissionDenied("Only project owner can create milestones")
+        return project
+
+    def validate(self, data):
+        project = data['project']
+        now = timezone.now()
+        errors = {}
+        for index, item in enumerate(data['milestones']):
+            if item['due_date'] < now:
+                errors[index] = {"due_date": "Due date cannot be in the past"}
+            elif item['amount'] > project.budget_max:
+                errors[index] = {"amount": "Milestone amount cannot exceed the project budget"}
+        if errors:
+            raise serializers.ValidationError({"milestones": errors})
+        return data
+
+
+class MilestoneBulkStatusSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=500
+    )
+    status = serializers.ChoiceField(choices=Milestone.STATUS_CHOICES)
+
+
 class ProjectBidSerializer(serializers.ModelSerializer):
     freelancer = UserSerializer(read_only=True)
 
@@ -36,6 +174,85 @@ class ProjectBidSerializer(serializers.ModelSerializer):
         return data
 
 
+class BidStatsSerializer(serializers.Serializer):
+    count = serializers.IntegerField()
+    lowest = serializers.DecimalField(max_digits=10, decimal_places=2, allow_null=True)
+    highest = serializers.DecimalField(max_digits=10, decimal_places=2, allow_null=True)
+    median = serializers.DecimalField(max_digits=10, decimal_places=2, allow_null=True)
+    percentiles = serializers.DictField(child=serializers.DecimalField(max_digits=10, decimal_places=2))
+    your_rank = serializers.IntegerField(allow_null=True)
+    # Only present for the project owner
+    top_bids = ProjectBidSerializer(many=True, required=False)
+
+
+class BidRankSerializer(serializers.Serializer):
+    amount = serializers.DecimalField(max_digits=10, decimal_places=2, allow_null=True)
+    rank = serializers.IntegerField(allow_null=True)
+    count = serializers.IntegerField()
+
+
+class AnalyticsQuerySerializer(serializers.Serializer):
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    skill = serializers.IntegerField(required=False, min_value=1)
+
+    # Longest range a single request may cover
+    MAX_DAYS = 366
+    DEFAULT_DAYS = 30
+
+    def validate(self, data):
+        end = data.get('end') or timezone.localdate()
+        start = data.get('start') or end - timedelta(days=self.DEFAULT_DAYS - 1)
+        if start > end:
+            raise serializers.ValidationError({'start': 'Start must not be after end'})
+        if (end - start).days >= self.MAX_DAYS:
+            raise serializers.ValidationError({'start': f'Range cannot exceed {self.MAX_DAYS} days'})
+        return {**data, 'start': start, 'end': end}
+
+
+class AnalyticsMetricsSerializer(serializers.Serializer):
+    projects_created = serializers.IntegerField()
+    projects_awarded = serializers.IntegerField()
+    projects_completed = serializers.IntegerField()
+    bid_count = serializers.IntegerField()
+    bid_amount_sum = serializers.DecimalField(max_digits=16, decimal_places=2)
+    average_bid = serializers.DecimalField(max_digits=16, decimal_places=2, allow_null=True)
+    bid_to_budget_ratio = serializers.DecimalField(max_digits=10, decimal_places=4, allow_null=True)
+    average_hours_to_award = serializers.FloatField(allow_null=True)
+
+
+class AnalyticsDaySerializer(AnalyticsMetricsSerializer):
+    date = serializers.DateField()
+
+
+class AnalyticsSerializer(serializers.Serializer):
+    start = serializers.DateField()
+    end = serializers.DateField()
+    skill = serializers.IntegerField(allow_null=True)
+    totals = AnalyticsMetricsSerializer()
+    days = AnalyticsDaySerializer(many=True)
+
+
+class PriceHistogramBinSerializer(serializers.Serializer):
+    lower = serializers.FloatField()
+    upper = serializers.FloatField()
+    count = serializers.IntegerField()
+
+
+class SkillPriceStatsSerializer(serializers.Serializer):
+    skill = serializers.IntegerField()
+    count = serializers.IntegerField()
+    mean = serializers.FloatField(required=False)
+    std = serializers.FloatField(required=False)
+    min = serializers.FloatField(required=False)
+    max = serializers.FloatField(required=False)
+    percentiles = serializers.DictField(child=serializers.FloatField(), required=False)
+    histogram = PriceHistogramBinSerializer(many=True, required=False)
+    # Pearson correlation of bid amount with delivery time in days
+    delivery_correlation = serializers.FloatField(allow_null=True, required=False)
+    computed_at = serializers.DateTimeField()
+
+
 class ProjectCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Project
@@ -50,42 +267,73 @@ class ProjectCreateSerializer(serializers.ModelSerializer):
         return data
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsMixin, CanBidMixin, serializers.ModelSerializer):
     client = UserSerializer(read_only=True)
     freelancer = UserSerializer(read_only=True)
     required_skills = SkillSerializer(many=True, read_only=True)
-    bids = ProjectBidSerializer(many=True, read_only=True)
-    files = ProjectFileSerializer(many=True, read_only=True)
-    milestones = MilestoneSerializer(many=True, read_only=True)
-    total_bids = serializers.SerializerMethodField()
+    bids = CappedListSerializer(child=ProjectBidSerializer(), read_only=True)
+    files = CappedListSerializer(child=ProjectFileSerializer(), read_only=True)
+    milestones = CappedListSerializer(child=MilestoneSerializer(), read_only=True)
+    total_bids = serializers.IntegerField(source='bid_count', read_only=True)
     average_bid = serializers.SerializerMethodField()
+    links = serializers.SerializerMethodField()
+    can_bid = serializers.SerializerMethodField()
+
+    expandable_fields = ('bids', 'files', 'milestones')
 
     class Meta:
         model = Project
-        fields = '__all__'
+        # The denormalized counters are internal; total_bids and
+        # average_bid are their public form
+        exclude = Project.COUNTER_FIELDS
         read_only_fields = ('status', 'created_at', 'updated_at', 'client',
                             'freelancer')
 
-    def get_total_bids(self, obj):
-        return obj.bids.count()
-
     def get_average_bid(self, obj):
-        bids = obj.bids.all()
-        if not bids:
-            return 0
-        return sum(bid.amount for bid in bids) / len(bids)
+        return obj.average_bid
+
+    def get_links(self, obj):
+        request = self.context.get('request')
+        return {
+            name: reverse(f'project-{name}', kwargs={'pk': obj.pk}, request=request)
+            for name in self.expandable_fields
+        }
+
 
+class ArchivedProjectFileSerializer(ProjectFileSerializer):
+    class Meta(ProjectFileSerializer.Meta):
+        model = ArchivedProjectFile
 
-class ProjectListSerializer(serializers.ModelSerializer):
+    def get_thumbnails(self, obj):
+        # The thumbnail endpoint only serves live files
+        return None
+
+
+class ArchivedProjectSerializer(ProjectSerializer):
+    """
+    An archived project in the shape of ProjectSerializer. The sub-resource
+    endpoints only serve live projects, so links is empty.
+    """
+    files = CappedListSerializer(child=ArchivedProjectFileSerializer(), read_only=True)
+
+    class Meta(ProjectSerializer.Meta):
+        model = ArchivedProject
+
+    def get_links(self, obj):
+        return {}
+
+    def get_can_bid(self, obj):
+        return False
+
+
+class ProjectListSerializer(SparseFieldsMixin, CanBidMixin, serializers.ModelSerializer):
     client = UserSerializer(read_only=True)
     required_skills = SkillSerializer(many=True, read_only=True)
-    total_bids = serializers.SerializerMethodField()
+    total_bids = serializers.IntegerField(source='bid_count', read_only=True)
+    can_bid = serializers.SerializerMethodField()
 
     class Meta:
         model = Project
         fields = ('id', 'title', 'status', 'budget_min', 'budget_max',
                   'created_at', 'deadline', 'total_bids', 'client',
-                  'required_skills')
-
-    def get_total_bids(self, obj):
-        return obj.bids.count()
\ No newline at end of file
+                  'required_skills', 'can_bid')
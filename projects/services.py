@@ -0,0 +1,146 @@
+import logging
+import time
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, Value, When
+from django.utils import timezone
+
+from communications.tasks import notify_project_update
+from . import metrics
+from .cache import bump_bid_book_generation, bump_global_generation, bump_recommendation_generation
+from .counters import add_milestones, adjust_completed_milestones, complete_finished_projects
+from .models import Milestone, Project, ProjectBid
+
+logger = logging.getLogger(__name__)
+
+# Lock waits above this are logged as contention
+SLOW_LOCK_WAIT_MS = 200
+
+
+class AwardError(Exception):
+    """The bid cannot be awarded; the message is safe to show to the client"""
+
+
+def award_bid(project_id, bid_id):
+    """
+    Accept a pending bid and reject the other pending bids of the project.
+
+    The project row is locked for the whole transaction, which issues one
+    project UPDATE and one bid UPDATE. Concurrent awards for the same
+    project serialize on the lock and all but the first fail with AwardError.
+    """
+    metrics.increment('award_attempts')
+    try:
+        with transaction.atomic():
+            started = time.monotonic()
+            project = Project.objects.select_for_update().only('id', 'status').filter(pk=project_id).first()
+            waited_ms = int((time.monotonic() - started) * 1000)
+            metrics.increment('award_lock_wait_ms', waited_ms)
+            if waited_ms >= SLOW_LOCK_WAIT_MS:
+                logger.warning('Waited %sms for the award lock on project %s', waited_ms, project_id)
+
+            if project is None:
+                raise AwardError('Project not found')
+            if project.status != 'OPEN':
+                raise AwardError('Project is not open for bidding')
+
+            bid = ProjectBid.objects.filter(pk=bid_id, project_id=project_id, status='PENDING') \
+                .values('freelancer_id').first()
+            if bid is None:
+                raise AwardError('Invalid bid ID or bid already processed')
+
+            now = timezone.now()
+            # The status filter also guards databases without row locks
+            updated = Project.objects.filter(pk=project_id, status='OPEN').update(
+                status='IN_PROGRESS',
+                freelancer_id=bid['freelancer_id'],
+                awarded_at=now,
+                pending_bid_count=0,
+                pending_bid_amount_sum=Decimal('0'),
+                updated_at=now,
+            )
+            if not updated:
+                raise AwardError('Project is not open for bidding')
+
+            # Every pending bid leaves the pending counters, which were zeroed above
+            ProjectBid.objects.filter(project_id=project_id, status='PENDING').update(
+                status=Case(
+                    When(pk=bid_id, then=Value('ACCEPTED')),
+                    default=Value('REJECTED'),
+                ),
+                updated_at=now,
+            )
+
+            # The bulk updates bypass the model signals
+            transaction.on_commit(bump_global_generation)
+            transaction.on_commit(bump_recommendation_generation)
+            transaction.on_commit(lambda: bump_bid_book_generation(project_id))
+            transaction.on_commit(lambda: notify_project_update.delay(
+                project_id, 'bid_accepted', 'A bid has been accepted and work can begin'
+            ))
+    except AwardError:
+        metrics.increment('award_conflicts')
+        raise
+
+    metrics.increment('award_successes')
+
+
+def bulk_update_milestone_status(milestones, new_status):
+    """
+    Set the status of every milestone in the queryset with one UPDATE,
+    without per-row signals. Completion counters are adjusted per project
+    in a single UPDATE and finished projects are completed in another.
+    Returns (milestones updated, projects completed).
+    """
+    with transaction.atomic():
+        rows = list(
+            Milestone.objects.select_for_update()
+            .filter(pk__in=milestones.values('pk'))
+            .exclude(status=new_status)
+            .values_list('pk', 'project_id', 'status')
+        )
+        if not rows:
+            return 0, 0
+
+        deltas = defaultdict(int)
+        for _, project_id, old_status in rows:
+            if new_status == 'COMPLETED':
+                deltas[project_id] += 1
+            elif old_status == 'COMPLETED':
+                deltas[project_id] -= 1
+
+        now = timezone.now()
+        locked = Milestone.objects.filter(pk__in=[pk for pk, _, _ in rows])
+        updated = locked.update(
+            status=new_status,
+            completed_at=now if new_status == 'COMPLETED' else None,
+            updated_at=now,
+        )
+        adjust_completed_milestones(deltas)
+
+        completed = 0
+        if new_status == 'COMPLETED':
+            completed = complete_finished_projects({project_id for _, project_id, _ in rows})
+        if completed:
+            transaction.on_commit(bump_global_generation)
+
+    return updated, completed
+
+
+def create_milestones(project, items):
+    """Insert validated milestone data for one project with a single bulk_create"""
+    now = timezone.now()
+    milestones = [Milestone(project=project, **item) for item in items]
+    for milestone in milestones:
+        if milestone.status == 'COMPLETED':
+            milestone.completed_at = now
+
+    with transaction.atomic():
+        Milestone.objects.bulk_create(milestones)
+        statuses = [milestone.status for milestone in milestones]
+        add_milestones(project.pk, statuses)
+        if 'COMPLETED' in statuses and complete_finished_projects([project.pk]):
+            transaction.on_commit(bump_global_generation)
+    return milestones
@@ -1,39 +1,171 @@
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_save, pre_save, post_delete, pre_delete, m2m_changed
+from django.db import transaction
 from django.dispatch import receiver
-from django.core.cache import cache
-from .models import Project, ProjectBid, Milestone
+from users.models import User, Skill
+from .cache import (
+    bump_global_generation, bump_user_generation, bump_recommendation_generation,
+    bump_bid_book_generation
+)
+from .counters import (
+    apply_bid_change, recount_bid_counters, apply_milestone_change,
+    recount_milestone_counters, complete_finished_projects
+)
+from .models import Project, ProjectBid, ProjectFile, Milestone
+from .recommendations import refresh_skill_vector
+from .search import index_project
+from .tasks import generate_project_file_thumbnails
+from .thumbnails import is_image
+
+
+@receiver(post_save, sender=ProjectBid)
+def update_bid_counters(sender, instance, created, **kwargs):
+    """Keep the project's denormalized bid counters in step with its bids"""
+    old_state = None if created else getattr(instance, '_loaded_counter_state', None)
+    new_state = instance.counter_state()
+    if not created and (old_state is None or new_state is None):
+        # Unknown previous state (e.g. deferred fields); recount from scratch
+        recount_bid_counters(Project.objects.filter(pk=instance.project_id))
+    else:
+        apply_bid_change(old_state, new_state)
+    instance._loaded_counter_state = new_state
+
+
+@receiver(post_delete, sender=ProjectBid)
+def remove_bid_from_counters(sender, instance, **kwargs):
+    """Subtract a deleted bid from its project's counters"""
+    state = getattr(instance, '_loaded_counter_state', None) or instance.counter_state()
+    apply_bid_change(state, None)
+
+
+@receiver(post_save, sender=ProjectBid)
+@receiver(post_delete, sender=ProjectBid)
+def clear_bid_book(sender, instance, **kwargs):
+    """Drop the project's cached bid book once the change is visible to readers"""
+    project_id = instance.project_id
+    transaction.on_commit(lambda: bump_bid_book_generation(project_id))
 
 
 @receiver(post_save, sender=Project)
-def clear_project_cache(sender, instance, **kwargs):
-    """Clear project-related cache when a project is saved"""
-    cache.delete(f'projects_query_{instance.client.id}_')
-    if instance.freelancer:
-        cache.delete(f'projects_query_{instance.freelancer.id}_')
+def update_search_index(sender, instance, **kwargs):
+    """Re-index a project's text when it is saved"""
+    index_project(instance)
+
+
+def refresh_skill_derivatives(projects):
+    """Re-derive everything computed from a project's required skills"""
+    for project in projects:
+        index_project(project)
+        refresh_skill_vector(project)
+    bump_recommendation_generation()
+
+
+@receiver(m2m_changed, sender=Project.required_skills.through)
+def update_on_skills_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Skill names are indexed text and skill ids feed recommendations"""
+    if action == 'pre_clear' and reverse:
+        # The affected projects are unknown once the rows are gone
+        instance._cleared_project_ids = list(instance.required_for_projects.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        refresh_skill_derivatives([instance])
+        return
+
+    if action == 'post_clear':
+        pk_set = getattr(instance, '_cleared_project_ids', [])
+    refresh_skill_derivatives(Project.objects.filter(pk__in=pk_set))
+
+
+@receiver(pre_delete, sender=Skill)
+def remember_skill_projects(sender, instance, **kwargs):
+    instance._affected_project_ids = list(instance.required_for_projects.values_list('pk', flat=True))
 
 
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+def update_on_skill_change(sender, instance, created=False, **kwargs):
+    """Re-derive projects whose skill was renamed or removed"""
+    if created:
+        return
+    project_ids = getattr(instance, '_affected_project_ids', None)
+    if project_ids is None:
+        projects = instance.required_for_projects.all()
+    else:
+        projects = Project.objects.filter(pk__in=project_ids)
+    refresh_skill_derivatives(projects)
+
+
+@receiver(post_save, sender=Project)
+def clear_recommendation_cache(sender, instance, created, **kwargs):
+    """Drop the open-project matrix only when a saved project's row in it changed"""
+    old_state = getattr(instance, '_loaded_matrix_state', None)
+    new_state = instance.matrix_state()
+    instance._loaded_matrix_state = new_state
+    if created:
+        # Not in the matrix until it has skills, and adding those bumps
+        return
+    if old_state is not None and new_state is not None:
+        if old_state == new_state or 'OPEN' not in (old_state[0], new_state[0]):
+            return
+    bump_recommendation_generation()
+
+
+@receiver(post_delete, sender=Project)
+def clear_recommendation_cache_on_delete(sender, instance, **kwargs):
+    if instance.status == 'OPEN':
+        bump_recommendation_generation()
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
 @receiver(post_save, sender=ProjectBid)
-def handle_bid_status_change(sender, instance, created, **kwargs):
-    """Handle actions when a bid status changes"""
-    if not created and instance.status == 'ACCEPTED':
-        # Update project status and freelancer
-        project = instance.project
-        project.status = 'IN_PROGRESS'
-        project.freelancer = instance.freelancer
-        project.save()
+@receiver(post_delete, sender=ProjectBid)
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+def clear_project_cache(sender, instance, **kwargs):
+    """Invalidate cached project listings when listed data changes"""
+    bump_global_generation()
 
-        # Reject other bids
-        ProjectBid.objects.filter(project=project) \
-            .exclude(id=instance.id) \
-            .update(status='REJECTED')
+
+@receiver(m2m_changed, sender=Project.required_skills.through)
+def clear_project_cache_on_skills_change(sender, instance, action, **kwargs):
+    """Invalidate cached project listings when required skills change"""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_global_generation()
+
+
+@receiver(post_save, sender=User)
+def clear_user_project_cache(sender, instance, **kwargs):
+    """A user's role decides which projects they see"""
+    bump_user_generation(instance.id)
 
 
 @receiver(post_save, sender=Milestone)
-def check_project_completion(sender, instance, **kwargs):
-    """Check if all milestones are completed to mark project as completed"""
-    project = instance.project
-    if project.status == 'IN_PROGRESS':
-        all_milestones = project.milestones.all()
-        if all_milestones and all(m.status == 'COMPLETED' for m in all_milestones):
-            project.status = 'COMPLETED'
-            project.save()
\ No newline at end of file
+def update_milestone_counters(sender, instance, created, **kwargs):
+    """Keep the project's milestone counters in step and complete finished projects"""
+    old_state = None if created else getattr(instance, '_loaded_counter_state', None)
+    new_state = instance.counter_state()
+    if not created and (old_state is None or new_state is None):
+        recount_milestone_counters(Project.objects.filter(pk=instance.project_id))
+    else:
+        apply_milestone_change(old_state, new_state)
+    instance._loaded_counter_state = new_state
+
+    if instance.status == 'COMPLETED' and complete_finished_projects([instance.project_id]):
+        # The conditional update bypasses the Project signals
+        bump_global_generation()
+
+
+@receiver(post_delete, sender=Milestone)
+def remove_milestone_from_counters(sender, instance, **kwargs):
+    state = getattr(instance, '_loaded_counter_state', None) or instance.counter_state()
+    apply_milestone_change(state, None)
+
+
+@receiver(post_save, sender=ProjectFile)
+def queue_file_thumbnails(sender, instance, created, **kwargs):
+    """Render image previews in the background once the upload is committed"""
+    if created and instance.blob_id and is_image(instance.filename or instance.file.name):
+        transaction.on_commit(lambda: generate_project_file_thumbnails.delay(instance.pk))
@@ -0,0 +1,78 @@
+from celery import shared_task
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .analytics import refresh_rollups
+from .archive import archive_cutoff, run_archive
+from .expiry import run_expiry
+from .models import ProjectFile
+from .pricing import refresh_skill_prices
+from .thumbnails import is_image, render_thumbnails
+from .uploads import purge_stale_uploads
+
+
+@shared_task
+def purge_stale_upload_sessions():
+    """
+    Remove abandoned resumable uploads and their partial files
+    """
+    return purge_stale_uploads()
+
+
+@shared_task
+def generate_project_file_thumbnails(project_file_id):
+    """
+    Render preview sizes for an uploaded image; files sharing a blob share them
+    """
+    project_file = ProjectFile.objects.filter(pk=project_file_id).first()
+    if project_file is None or not project_file.blob_id:
+        return 0
+    if not is_image(project_file.filename or project_file.file.name):
+        return 0
+    return render_thumbnails(project_file.file.storage, project_file.file.name, project_file.blob_id)
+
+
+@shared_task
+def expire_overdue_projects(cutoff=None):
+    """
+    Close OPEN projects past their deadline in bounded chunks. A run that
+    stops with work left re-queues itself with the same cutoff.
+    """
+    cutoff = parse_datetime(cutoff) if cutoff else timezone.now()
+    expired, more = run_expiry(cutoff)
+    if more:
+        expire_overdue_projects.delay(cutoff.isoformat())
+    return expired
+
+
+@shared_task
+def refresh_analytics_rollups():
+    """
+    Bring the daily analytics rollups up to date, revisiting only the last
+    few days. A first run over a long history continues in follow-ups.
+    """
+    days, more = refresh_rollups()
+    if more:
+        refresh_analytics_rollups.delay()
+    return days
+
+
+@shared_task
+def refresh_skill_price_stats():
+    """
+    Recompute the cached bid-price distribution of every skill
+    """
+    return refresh_skill_prices()
+
+
+@shared_task
+def archive_finished_projects(cutoff=None):
+    """
+    Move long-finished projects to the archive tables in bounded chunks. A
+    run that stops with work left re-queues itself with the same cutoff.
+    """
+    cutoff = parse_datetime(cutoff) if cutoff else archive_cutoff()
+    archived, more = run_archive(cutoff)
+    if more:
+        archive_finished_projects.delay(cutoff.isoformat())
+    return archived
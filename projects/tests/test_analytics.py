@@ -0,0 +1,127 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from users.models import User, Skill
+from projects.analytics import refresh_rollups
+from projects.models import DailyRollup, DailySkillRollup, Project, ProjectBid
+from projects.services import award_bid
+
+
+class AnalyticsRollupTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client_user = User.objects.create_user(
+            username='analyticsclient',
+            email='analyticsclient@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        self.freelancer = User.objects.create_user(
+            username='analyticsfreelancer',
+            email='analyticsfreelancer@example.com',
+            password='testpass123',
+            role='FR'
+        )
+        self.admin = User.objects.create_superuser(
+            username='analyticsadmin',
+            email='analyticsadmin@example.com',
+            password='testpass123'
+        )
+        self.python = Skill.objects.create(name='Python', category='Programming')
+        self.design = Skill.objects.create(name='Design', category='Creative')
+
+        self.today = timezone.localdate()
+        self.yesterday = self.today - timedelta(days=1)
+        now = timezone.now()
+
+        # Created yesterday, awarded today after a day of bidding
+        self.awarded = self.create_project([self.python, self.design])
+        bid = self.create_bid(self.awarded, '300.00')
+        Project.objects.filter(pk=self.awarded.pk).update(created_at=now - timedelta(days=1))
+        award_bid(self.awarded.pk, bid.pk)
+        Project.objects.filter(pk=self.awarded.pk).update(awarded_at=now)
+
+        self.open_project = self.create_project([self.python])
+        self.create_bid(self.open_project, '150.00')
+
+    def create_project(self, skills):
+        project = Project.objects.create(
+            title='Analytics Project',
+            description='Test Description',
+            client=self.client_user,
+            budget_min=100.00,
+            budget_max=500.00,
+            deadline=timezone.now() + timedelta(days=30),
+        )
+        project.required_skills.set(skills)
+        return project
+
+    def create_bid(self, project, amount):
+        return ProjectBid.objects.create(
+            project=project,
+            freelancer=self.freelancer,
+            amount=Decimal(amount),
+            proposal='Test proposal',
+            delivery_time=7
+        )
+
+    def test_rollups_aggregate_per_day_and_skill(self):
+        """Test totals land on the right day and projects count once per skill"""
+        self.assertEqual(refresh_rollups(), (2, False))
+
+        today = DailyRollup.objects.get(date=self.today)
+        self.assertEqual((today.projects_created, today.projects_awarded), (1, 1))
+        self.assertEqual((today.bid_count, today.bid_amount_sum), (2, Decimal('450.00')))
+        self.assertEqual(today.bid_budget_sum, Decimal('600.00'))
+        self.assertAlmostEqual(today.award_seconds_sum, 24 * 3600, delta=5)
+        self.assertEqual(DailyRollup.objects.get(date=self.yesterday).projects_created, 1)
+
+        python = DailySkillRollup.objects.get(date=self.today, skill=self.python)
+        design = DailySkillRollup.objects.get(date=self.today, skill=self.design)
+        self.assertEqual((python.bid_count, python.projects_awarded), (2, 1))
+        self.assertEqual((design.bid_count, design.projects_created), (1, 0))
+
+    def test_refresh_resumes_near_last_day(self):
+        """Test a later run recomputes only the lookback window and picks up new rows"""
+        old_day = self.today - timedelta(days=5)
+        DailyRollup.objects.create(date=old_day, projects_created=7)
+        self.assertEqual(refresh_rollups(), (7, False))
+
+        self.create_project([self.design])
+        self.assertEqual(refresh_rollups(), (2, False))
+        self.assertEqual(DailyRollup.objects.get(date=self.today).projects_created, 2)
+        self.assertEqual(DailyRollup.objects.get(date=old_day).projects_created, 0)
+
+    def test_analytics_endpoint_cached_until_refresh(self):
+        """Test the admin endpoint derives averages and serves cached summaries"""
+        refresh_rollups()
+        url = reverse('project-analytics')
+        params = {'start': self.yesterday.isoformat(), 'end': self.today.isoformat()}
+
+        self.client.force_authenticate(user=self.client_user)
+        self.assertEqual(self.client.get(url, params).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        totals = response.data['totals']
+        self.assertEqual(totals['projects_created'], 2)
+        self.assertEqual(totals['average_bid'], '225.00')
+        self.assertEqual(totals['bid_to_budget_ratio'], '0.7500')
+        self.assertAlmostEqual(totals['average_hours_to_award'], 24, delta=0.01)
+        self.assertEqual(len(response.data['days']), 2)
+
+        response = self.client.get(url, {**params, 'skill': self.design.id})
+        self.assertEqual(response.data['totals']['bid_count'], 1)
+
+        with self.assertNumQueries(0):
+            self.client.get(url, params)
+
+        response = self.client.get(url, {'start': self.today.isoformat(), 'end': self.yesterday.isoformat()})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
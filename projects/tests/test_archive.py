@@ -0,0 +1,147 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from communications.models import Conversation
+from users.models import User, Skill
+from projects.archive import run_archive
+from projects.models import (
+    ArchivedProject, ArchivedProjectBid, ArchivedProjectFile, Milestone, Project, ProjectBid, ProjectFile
+)
+
+
+class ProjectArchiveTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client_user = User.objects.create_user(
+            username='archiveclient',
+            email='archiveclient@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        self.freelancer = User.objects.create_user(
+            username='archivefreelancer',
+            email='archivefreelancer@example.com',
+            password='testpass123',
+            role='FR'
+        )
+        self.skill = Skill.objects.create(name='Archiving')
+        self.finished = [self.create_project(status) for status in ('COMPLETED', 'CANCELLED', 'EXPIRED')]
+        self.in_progress = self.create_project('IN_PROGRESS')
+        self.recent = self.create_project('COMPLETED')
+
+        self.project = self.finished[0]
+        self.project.required_skills.add(self.skill)
+        self.bid = ProjectBid.objects.create(
+            project=self.project,
+            freelancer=self.freelancer,
+            amount=Decimal('200.00'),
+            proposal='Test proposal',
+            delivery_time=7,
+            status='ACCEPTED'
+        )
+        Milestone.objects.create(
+            project=self.project,
+            title='Design',
+            description='Test Description',
+            amount=Decimal('100.00'),
+            due_date=timezone.now() + timedelta(days=10),
+            status='COMPLETED'
+        )
+        self.file = ProjectFile.objects.create(
+            project=self.project,
+            file='project_files/spec.txt',
+            uploaded_by=self.client_user,
+            description='Spec'
+        )
+        self.conversation = Conversation.objects.create(project=self.project)
+
+        # Everything but the recent project was last touched a year ago
+        Project.objects.exclude(pk=self.recent.pk).update(updated_at=timezone.now() - timedelta(days=365))
+
+    def create_project(self, status):
+        return Project.objects.create(
+            title=f'Archive Project {status}',
+            description='Test Description',
+            client=self.client_user,
+            budget_min=100.00,
+            budget_max=500.00,
+            deadline=timezone.now() + timedelta(days=30),
+            status=status
+        )
+
+    def test_archives_in_resumable_chunks(self):
+        """Test old finished projects move with their rows and a later run finishes the job"""
+        with self.captureOnCommitCallbacks(execute=True), CaptureQueriesContext(connection) as queries:
+            self.assertEqual(run_archive(chunk_size=2, max_chunks=1), (2, True))
+        # Cascaded bids and milestones leave the doomed projects' counters alone
+        self.assertFalse([query for query in queries if query['sql'].startswith('UPDATE "projects_project"')])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(run_archive(chunk_size=2, max_chunks=1), (1, False))
+
+        self.assertEqual(
+            set(Project.objects.values_list('id', flat=True)),
+            {self.in_progress.id, self.recent.id}
+        )
+        self.assertEqual(
+            set(ArchivedProject.objects.values_list('id', flat=True)),
+            {project.id for project in self.finished}
+        )
+
+        archived = ArchivedProject.objects.get(pk=self.project.pk)
+        self.assertEqual((archived.bid_count, archived.milestone_count), (1, 1))
+        self.assertEqual(list(archived.required_skills.all()), [self.skill])
+        self.assertEqual(ArchivedProjectBid.objects.get().pk, self.bid.pk)
+        self.assertEqual(ArchivedProjectFile.objects.get().file.name, self.file.file.name)
+        self.assertFalse(ProjectBid.objects.exists())
+        self.assertFalse(Milestone.objects.exists())
+
+        self.conversation.refresh_from_db()
+        self.assertIsNone(self.conversation.project_id)
+        self.assertEqual(self.conversation.archived_project_id, self.project.id)
+
+    def test_archived_detail_reads(self):
+        """Test detail endpoints serve an archived project as before, to the same users"""
+        url = reverse('project-detail', kwargs={'pk': self.project.id})
+        params = {'expand': 'bids,files,milestones'}
+        self.client.force_authenticate(user=self.client_user)
+        before = self.client.get(url, params).json()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            run_archive()
+
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        after = response.json()
+        self.assertTrue(after.pop('archived_at'))
+        self.assertEqual(after, {**before, 'links': {}})
+        self.assertEqual(
+            self.client.get(url, params, HTTP_IF_NONE_MATCH=response['ETag']).status_code,
+            status.HTTP_304_NOT_MODIFIED
+        )
+
+        # The bidder still sees it, through the async endpoint too
+        self.client.force_authenticate(user=self.freelancer)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        self.client.force_authenticate(user=None)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.freelancer)}')
+        response = self.client.get(reverse('async-project-detail', kwargs={'pk': self.project.id}), params)
+        self.assertEqual(response.json()['bids'], before['bids'])
+
+        other = User.objects.create_user(
+            username='archiveother',
+            email='archiveother@example.com',
+            password='testpass123',
+            role='FR'
+        )
+        self.client.credentials()
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
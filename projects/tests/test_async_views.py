@@ -0,0 +1,147 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction
+from django.core.cache import cache
+from django.urls import resolve, reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.models import User
+from projects.models import Project, ProjectBid
+from projects.pagination import ProjectCursorPagination
+
+
+class AsyncViewTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client_user = User.objects.create_user(
+            username='asyncclient',
+            email='asyncclient@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        self.freelancer = User.objects.create_user(
+            username='asyncfreelancer',
+            email='asyncfreelancer@example.com',
+            password='testpass123',
+            role='FR'
+        )
+        self.projects = [
+            Project.objects.create(
+                title=f'Async Project {i}',
+                description='Test Description',
+                client=self.client_user,
+                budget_min=100.00,
+                budget_max=500.00,
+                deadline=timezone.now() + timedelta(days=30),
+            )
+            for i in range(3)
+        ]
+        self.bid = ProjectBid.objects.create(
+            project=self.projects[0],
+            freelancer=self.freelancer,
+            amount=Decimal('200.00'),
+            proposal='Test proposal',
+            delivery_time=7
+        )
+
+    def authenticate(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+
+    def test_views_are_async(self):
+        """Test the endpoints run as coroutines under ASGI"""
+        for name in ('async-project-list', 'async-bid-list'):
+            self.assertTrue(iscoroutinefunction(resolve(reverse(name)).func))
+
+    def test_project_payloads_match_sync_endpoints(self):
+        """Test async list and detail return what the viewset returns"""
+        self.authenticate(self.freelancer)
+        sync_list = self.client.get(reverse('project-list'), {'page_size': 2}).json()
+        async_list = self.client.get(reverse('async-project-list'), {'page_size': 2}).json()
+        self.assertEqual(async_list['results'], sync_list['results'])
+        self.assertTrue(async_list['next'])
+        self.assertEqual(
+            self.client.get(async_list['next']).json()['results'],
+            self.client.get(sync_list['next']).json()['results']
+        )
+
+        pk = self.projects[0].id
+        sync_detail = self.client.get(reverse('project-detail', kwargs={'pk': pk}), {'expand': 'bids'})
+        async_detail = self.client.get(reverse('async-project-detail', kwargs={'pk': pk}), {'expand': 'bids'})
+        self.assertEqual(async_detail.json(), sync_detail.json())
+        self.assertFalse(async_detail.json()['can_bid'])
+        self.assertEqual(async_detail['ETag'], sync_detail['ETag'])
+
+        response = self.client.get(
+            reverse('async-project-detail', kwargs={'pk': pk}), {'expand': 'bids'},
+            HTTP_IF_NONE_MATCH=sync_detail['ETag']
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_bid_permissions_and_errors(self):
+        """Test bid endpoints follow the viewset permissions and render API errors"""
+        self.assertEqual(self.client.get(reverse('async-bid-list')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.authenticate(self.client_user)
+        self.assertEqual(self.client.get(reverse('async-bid-list')).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(
+            self.client.get(reverse('async-project-detail', kwargs={'pk': 0})).status_code,
+            status.HTTP_404_NOT_FOUND
+        )
+
+        self.authenticate(self.freelancer)
+        response = self.client.get(reverse('async-bid-list'))
+        self.assertEqual([bid['id'] for bid in response.json()['results']], [self.bid.id])
+        response = self.client.get(reverse('async-bid-detail', kwargs={'pk': self.bid.id}))
+        self.assertEqual(response.json()['amount'], '200.00')
+        self.assertEqual(
+            self.client.post(reverse('async-bid-list')).status_code,
+            status.HTTP_405_METHOD_NOT_ALLOWED
+        )
+
+    def test_bid_detail_checks_object_permission(self):
+        """Test a freelancer owning the project still cannot read another freelancer's bid"""
+        other = User.objects.create_user(
+            username='asyncother',
+            email='asyncother@example.com',
+            password='testpass123',
+            role='FR'
+        )
+        project = Project.objects.create(
+            title='Freelancer Owned Project',
+            description='Test Description',
+            client=self.freelancer,
+            budget_min=100.00,
+            budget_max=500.00,
+            deadline=timezone.now() + timedelta(days=30),
+        )
+        bid = ProjectBid.objects.create(
+            project=project,
+            freelancer=other,
+            amount=Decimal('150.00'),
+            proposal='Test proposal',
+            delivery_time=7
+        )
+
+        self.authenticate(self.freelancer)
+        sync_detail = self.client.get(reverse('project-bid-detail', kwargs={'pk': bid.id}))
+        async_detail = self.client.get(reverse('async-bid-detail', kwargs={'pk': bid.id}))
+        self.assertEqual(sync_detail.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(async_detail.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(async_detail.json(), sync_detail.json())
+
+    async def test_async_client_listing(self):
+        """Test the listing through the async test client, cached on the second call"""
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(self.freelancer)}'}
+        response = await self.async_client.get(reverse('async-project-list'), headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()['results']), 3)
+
+        with mock.patch.object(ProjectCursorPagination, 'apaginate_queryset') as paginate:
+            response = await self.async_client.get(reverse('async-project-list'), headers=headers)
+        self.assertFalse(paginate.called)
+        self.assertEqual(len(response.json()['results']), 3)
@@ -0,0 +1,124 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.utils import timezone
+from datetime import timedelta
+
+from communications.tasks import notify_project_update
+from users.models import User
+from projects.models import Project, ProjectBid
+from projects.services import award_bid, AwardError
+
+
+class BidAwardTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.client_user = User.objects.create_user(
+            username='awardclient',
+            email='awardclient@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        self.freelancer1 = User.objects.create_user(
+            username='awardfreelancer1',
+            email='awardfreelancer1@example.com',
+            password='testpass123',
+            role='FR'
+        )
+        self.freelancer2 = User.objects.create_user(
+            username='awardfreelancer2',
+            email='awardfreelancer2@example.com',
+            password='testpass123',
+            role='FR'
+        )
+        self.freelancer3 = User.objects.create_user(
+            username='awardfreelancer3',
+            email='awardfreelancer3@example.com',
+            password='testpass123',
+            role='FR'
+        )
+        self.project = Project.objects.create(
+            title='Award Project',
+            description='Test Description',
+            client=self.client_user,
+            budget_min=100.00,
+            budget_max=500.00,
+            deadline=timezone.now() + timedelta(days=30),
+            status='OPEN'
+        )
+        self.bid1 = self.create_bid(self.freelancer1, Decimal('200.00'))
+        self.bid2 = self.create_bid(self.freelancer2, Decimal('300.00'))
+        self.bid3 = self.create_bid(self.freelancer3, Decimal('400.00'), status='WITHDRAWN')
+
+    def create_bid(self, freelancer, amount, **kwargs):
+        return ProjectBid.objects.create(
+            project=self.project,
+            freelancer=freelancer,
+            amount=amount,
+            proposal='Test proposal',
+            delivery_time=7,
+            **kwargs
+        )
+
+    def test_award_writes_project_and_bids_once(self):
+        """Test the award pipeline issues a single project and bid update"""
+        with mock.patch.object(notify_project_update, 'delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                # lock, bid lookup, project update, bid update, plus the savepoint pair
+                with self.assertNumQueries(6):
+                    award_bid(self.project.pk, self.bid1.pk)
+        delay.assert_called_once_with(self.project.pk, 'bid_accepted', mock.ANY)
+
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.status, 'IN_PROGRESS')
+        self.assertEqual(self.project.freelancer, self.freelancer1)
+        self.assertEqual(self.project.bid_count, 3)
+        self.assertEqual(self.project.pending_bid_count, 0)
+        self.assertEqual(self.project.pending_bid_amount_sum, Decimal('0'))
+
+        statuses = dict(self.project.bids.values_list('id', 'status'))
+        self.assertEqual(statuses, {
+            self.bid1.id: 'ACCEPTED',
+            self.bid2.id: 'REJECTED',
+            self.bid3.id: 'WITHDRAWN',
+        })
+
+    def test_second_award_is_rejected(self):
+        """Test that a project can only be awarded once"""
+        award_bid(self.project.pk, self.bid1.pk)
+        with self.assertRaises(AwardError):
+            award_bid(self.project.pk, self.bid2.pk)
+
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.freelancer, self.freelancer1)
+
+    def test_accept_bid_endpoint_and_metrics(self):
+        """Test accept_bid responses and the admin metrics counters"""
+        self.client.force_authenticate(user=self.client_user)
+        url = reverse('project-accept-bid', kwargs={'pk': self.project.id})
+
+        response = self.client.post(url, {'bid_id': self.bid3.id})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(url, {'bid_id': self.bid2.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(reverse('project-award-metrics'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        admin = User.objects.create_superuser(
+            username='awardadmin',
+            email='awardadmin@example.com',
+            password='testpass123'
+        )
+        self.client.force_authenticate(user=admin)
+        response = self.client.get(reverse('project-award-metrics'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['award_attempts'], 2)
+        self.assertEqual(response.data['award_successes'], 1)
+        self.assertEqual(response.data['award_conflicts'], 1)
+        self.assertEqual(response.data['conflict_rate'], 0.5)
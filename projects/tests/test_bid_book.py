@@ -0,0 +1,102 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from datetime import timedelta
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from users.models import User
+from projects.bidbook import BidBook, load_bid_book
+from projects.models import Project, ProjectBid
+
+
+class BidBookTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client_user = User.objects.create_user(
+            username='bookclient',
+            email='bookclient@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        self.project = Project.objects.create(
+            title='Bid Book Project',
+            description='Test Description',
+            client=self.client_user,
+            budget_min=100.00,
+            budget_max=1000.00,
+            deadline=timezone.now() + timedelta(days=30),
+        )
+        self.freelancers = []
+        self.bids = []
+        for i, amount in enumerate(['400.00', '200.00', '300.00', '200.00', '500.00']):
+            freelancer = User.objects.create_user(
+                username=f'bookfreelancer{i}',
+                email=f'bookfreelancer{i}@example.com',
+                password='testpass123',
+                role='FR'
+            )
+            self.freelancers.append(freelancer)
+            self.bids.append(ProjectBid.objects.create(
+                project=self.project,
+                freelancer=freelancer,
+                amount=Decimal(amount),
+                proposal='Test proposal',
+                delivery_time=7
+            ))
+
+    def test_ranks_and_percentiles(self):
+        """Test ranks share ties and percentiles interpolate between bids"""
+        book = BidBook([(Decimal(a), i, i) for i, a in enumerate(['100', '200', '200', '400'])])
+        self.assertEqual(book.rank_of_amount(Decimal('200')), 2)
+        self.assertEqual(book.rank_of_amount(Decimal('150')), 2)
+        self.assertEqual(book.rank_of_amount(Decimal('999')), 5)
+        self.assertEqual(book.percentile(50), Decimal('200.00'))
+        self.assertEqual(book.percentile(90), Decimal('340.00'))
+        self.assertIsNone(BidBook([]).percentile(50))
+
+    def test_book_is_cached_and_invalidated_on_commit(self):
+        """Test the book is built once and rebuilt after a committed bid change"""
+        load_bid_book(self.project.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(len(load_bid_book(self.project.id)), 5)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bids[4].status = 'WITHDRAWN'
+            self.bids[4].save()
+        book = load_bid_book(self.project.id)
+        self.assertEqual(len(book), 4)
+        self.assertEqual(book.stats()['highest'], Decimal('400.00'))
+
+    def test_bid_stats_endpoint(self):
+        """Test the owner sees the top bids and bidders see only their rank"""
+        self.client.force_authenticate(user=self.client_user)
+        response = self.client.get(reverse('project-bid-stats', kwargs={'pk': self.project.id}), {'top': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 5)
+        self.assertEqual(response.data['lowest'], '200.00')
+        self.assertEqual(response.data['median'], '300.00')
+        self.assertEqual(response.data['percentiles']['p90'], '460.00')
+        self.assertEqual(
+            [bid['id'] for bid in response.data['top_bids']],
+            [self.bids[1].id, self.bids[3].id]
+        )
+
+        self.client.force_authenticate(user=self.freelancers[2])
+        response = self.client.get(reverse('project-bid-stats', kwargs={'pk': self.project.id}))
+        self.assertEqual(response.data['your_rank'], 3)
+        self.assertNotIn('top_bids', response.data)
+
+    def test_rank_endpoints(self):
+        """Test ranking a hypothetical amount and an existing bid"""
+        self.client.force_authenticate(user=self.freelancers[0])
+        url = reverse('project-rank', kwargs={'pk': self.project.id})
+        self.assertEqual(self.client.get(url).data['rank'], 4)
+        self.assertEqual(self.client.get(url, {'amount': '250'}).data['rank'], 3)
+        response = self.client.get(url, {'amount': 'cheap'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(reverse('project-bid-rank', kwargs={'pk': self.bids[0].id}))
+        self.assertEqual(response.data, {'amount': '400.00', 'rank': 4, 'count': 5})
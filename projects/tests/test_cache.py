@@ -0,0 +1,86 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.utils import timezone
+from datetime import timedelta
+
+from users.models import User, Skill
+from projects.models import Project, ProjectBid
+
+
+class ProjectListingCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.client_user = User.objects.create_user(
+            username='cacheclient',
+            email='cacheclient@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        self.freelancer = User.objects.create_user(
+            username='cachefreelancer',
+            email='cachefreelancer@example.com',
+            password='testpass123',
+            role='FR'
+        )
+        self.skill = Skill.objects.create(name='Python', category='Programming')
+
+        self.project = Project.objects.create(
+            title='Cached Project',
+            description='Test Description',
+            client=self.client_user,
+            budget_min=100.00,
+            budget_max=500.00,
+            deadline=timezone.now() + timedelta(days=30),
+            status='OPEN'
+        )
+
+    def test_cache_hit_runs_no_queries(self):
+        """Test that a repeated listing is served without SQL"""
+        self.client.force_authenticate(user=self.freelancer)
+        response = self.client.get(reverse('project-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(reverse('project-list'))
+        self.assertEqual(cached.data, response.data)
+
+    def test_query_param_order_shares_cache_entry(self):
+        """Test that equivalent query strings hit the same entry"""
+        self.client.force_authenticate(user=self.freelancer)
+        self.client.get(reverse('project-list') + '?status=OPEN&budget_min=50')
+
+        with self.assertNumQueries(0):
+            self.client.get(reverse('project-list') + '?budget_min=50&status=OPEN')
+
+    def test_project_change_invalidates_listing(self):
+        """Test that saving a project invalidates cached listings"""
+        self.client.force_authenticate(user=self.freelancer)
+        self.client.get(reverse('project-list'))
+
+        self.project.title = 'Renamed Project'
+        self.project.save()
+
+        response = self.client.get(reverse('project-list'))
+        self.assertEqual(response.data['results'][0]['title'], 'Renamed Project')
+
+    def test_bid_and_skill_changes_invalidate_listing(self):
+        """Test that bids and skill changes invalidate cached listings"""
+        self.client.force_authenticate(user=self.client_user)
+        self.client.get(reverse('project-list'))
+
+        ProjectBid.objects.create(
+            project=self.project,
+            freelancer=self.freelancer,
+            amount=300,
+            proposal='Test proposal',
+            delivery_time=7
+        )
+        response = self.client.get(reverse('project-list'))
+        self.assertEqual(response.data['results'][0]['total_bids'], 1)
+
+        self.project.required_skills.add(self.skill)
+        response = self.client.get(reverse('project-list'))
+        self.assertEqual(response.data['results'][0]['required_skills'][0]['name'], 'Python')
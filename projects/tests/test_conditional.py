@@ -0,0 +1,112 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from users.models import User
+from projects.models import Project, ProjectBid, Milestone
+from projects.serializers import ProjectSerializer
+
+
+class ConditionalRequestTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client_user = User.objects.create_user(
+            username='etagclient',
+            email='etagclient@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        self.freelancer = User.objects.create_user(
+            username='etagfreelancer',
+            email='etagfreelancer@example.com',
+            password='testpass123',
+            role='FR'
+        )
+        self.project = Project.objects.create(
+            title='ETag Project',
+            description='Test Description',
+            client=self.client_user,
+            budget_min=100.00,
+            budget_max=500.00,
+            deadline=timezone.now() + timedelta(days=30),
+        )
+        self.url = reverse('project-detail', kwargs={'pk': self.project.id})
+        self.client.force_authenticate(user=self.client_user)
+
+    def test_not_modified_skips_serialization(self):
+        """Test a matching If-None-Match gets 304 without serializing the project"""
+        response = self.client.get(self.url)
+        etag = response['ETag']
+        self.assertTrue(response['Last-Modified'])
+
+        with mock.patch.object(ProjectSerializer, 'to_representation') as to_representation:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertFalse(to_representation.called)
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_counter_change_alters_etag(self):
+        """Test a new bid changes the project's validators"""
+        etag = self.client.get(self.url)['ETag']
+        ProjectBid.objects.create(
+            project=self.project,
+            freelancer=self.freelancer,
+            amount=Decimal('200.00'),
+            proposal='Test proposal',
+            delivery_time=7
+        )
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_bids'], 1)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_if_match_rejects_stale_updates(self):
+        """Test a PATCH carrying an outdated ETag gets 412 and changes nothing"""
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.patch(self.url, {'title': 'First edit'}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        new_etag = response['ETag']
+        self.assertNotEqual(new_etag, etag)
+
+        response = self.client.patch(self.url, {'title': 'Lost edit'}, HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(response['ETag'], new_etag)
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.title, 'First edit')
+
+        # Without If-Match the last write still wins
+        response = self.client.patch(self.url, {'title': 'Unconditional edit'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_bid_and_milestone_validators(self):
+        """Test bid and milestone detail endpoints revalidate too"""
+        bid = ProjectBid.objects.create(
+            project=self.project,
+            freelancer=self.freelancer,
+            amount=Decimal('200.00'),
+            proposal='Test proposal',
+            delivery_time=7
+        )
+        milestone = Milestone.objects.create(
+            project=self.project,
+            title='Design',
+            description='Test Description',
+            amount=Decimal('100.00'),
+            due_date=timezone.now() + timedelta(days=10)
+        )
+        for user, url in ((self.freelancer, reverse('project-bid-detail', kwargs={'pk': bid.id})),
+                          (self.client_user, reverse('milestone-detail', kwargs={'pk': milestone.id}))):
+            self.client.force_authenticate(user=user)
+            etag = self.client.get(url)['ETag']
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=f'"other", W/{etag}')
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
@@ -0,0 +1,240 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.utils import timezone
+from datetime import timedelta
+
+from users.models import User
+from projects.models import Project, ProjectBid, Milestone
+
+
+class BidCounterTests(APITestCase):
+    def setUp(self):
+        self.client_user = User.objects.create_user(
+            username='counterclient',
+            email='counterclient@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        self.freelancer1 = User.objects.create_user(
+            username='counterfreelancer1',
+            email='counterfreelancer1@example.com',
+            password='testpass123',
+            role='FR'
+        )
+        self.freelancer2 = User.objects.create_user(
+            username='counterfreelancer2',
+            email='counterfreelancer2@example.com',
+            password='testpass123',
+            role='FR'
+        )
+        self.project = Project.objects.create(
+            title='Counter Project',
+            description='Test Description',
+            client=self.client_user,
+            budget_min=100.00,
+            budget_max=500.00,
+            deadline=timezone.now() + timedelta(days=30),
+            status='OPEN'
+        )
+
+    def create_bid(self, freelancer, amount):
+        return ProjectBid.objects.create(
+            project=self.project,
+            freelancer=freelancer,
+            amount=amount,
+            proposal='Test proposal',
+            delivery_time=7
+        )
+
+    def test_counters_follow_bid_lifecycle(self):
+        """Test counters on bid creation, withdrawal and deletion"""
+        bid1 = self.create_bid(self.freelancer1, Decimal('200.00'))
+        self.create_bid(self.freelancer2, Decimal('400.00'))
+
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.bid_count, 2)
+        self.assertEqual(self.project.bid_amount_sum, Decimal('600.00'))
+        self.assertEqual(self.project.pending_bid_count, 2)
+        self.assertEqual(self.project.average_bid, Decimal('300.00'))
+
+        bid1 = ProjectBid.objects.get(pk=bid1.pk)
+        bid1.status = 'WITHDRAWN'
+        bid1.save()
+
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.bid_count, 2)
+        self.assertEqual(self.project.pending_bid_count, 1)
+        self.assertEqual(self.project.pending_bid_amount_sum, Decimal('400.00'))
+
+        bid1.delete()
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.bid_count, 1)
+        self.assertEqual(self.project.bid_amount_sum, Decimal('400.00'))
+
+    def test_project_save_does_not_overwrite_counters(self):
+        """Test that a stale project instance keeps counters intact on save"""
+        stale = Project.objects.get(pk=self.project.pk)
+        self.create_bid(self.freelancer1, Decimal('250.00'))
+
+        stale.title = 'Renamed'
+        stale.save()
+
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.bid_count, 1)
+        self.assertEqual(self.project.title, 'Renamed')
+
+    def test_detail_reads_counters_from_row(self):
+        """Test that the detail endpoint serves totals from the counters"""
+        self.create_bid(self.freelancer1, Decimal('200.00'))
+        self.create_bid(self.freelancer2, Decimal('300.00'))
+
+        self.client.force_authenticate(user=self.client_user)
+        response = self.client.get(reverse('project-detail', kwargs={'pk': self.project.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_bids'], 2)
+        self.assertEqual(response.data['average_bid'], Decimal('250.00'))
+
+    def test_recount_bids_repairs_stale_counters(self):
+        """Test that the recount_bids command repairs drifted counters"""
+        self.create_bid(self.freelancer1, Decimal('200.00'))
+        Project.objects.filter(pk=self.project.pk).update(bid_count=5, pending_bid_count=0)
+
+        out = StringIO()
+        call_command('recount_bids', stdout=out)
+        self.assertIn('1 project(s) to recount', out.getvalue())
+
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.bid_count, 1)
+        self.assertEqual(self.project.pending_bid_count, 1)
+        self.assertEqual(self.project.pending_bid_amount_sum, Decimal('200.00'))
+
+
+class MilestoneCounterTests(APITestCase):
+    def setUp(self):
+        self.client_user = User.objects.create_user(
+            username='milestoneclient',
+            email='milestoneclient@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        self.freelancer = User.objects.create_user(
+            username='milestonefreelancer',
+            email='milestonefreelancer@example.com',
+            password='testpass123',
+            role='FR'
+        )
+        self.project = Project.objects.create(
+            title='Milestone Counter Project',
+            description='Test Description',
+            client=self.client_user,
+            freelancer=self.freelancer,
+            budget_min=100.00,
+            budget_max=500.00,
+            deadline=timezone.now() + timedelta(days=30),
+            status='IN_PROGRESS'
+        )
+        self.milestones = [self.create_milestone(f'Milestone {i}') for i in range(3)]
+
+    def create_milestone(self, title, **kwargs):
+        return Milestone.objects.create(
+            project=self.project,
+            title=title,
+            description='Test milestone description',
+            amount=Decimal('100.00'),
+            due_date=timezone.now() + timedelta(days=7),
+            **kwargs
+        )
+
+    def test_completion_is_decided_from_counters(self):
+        """Test counters follow status changes and the last completion closes the project"""
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.milestone_count, 3)
+        self.assertEqual(self.project.completed_milestone_count, 0)
+
+        for milestone in self.milestones[:2]:
+            milestone.status = 'COMPLETED'
+            milestone.save()
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.completed_milestone_count, 2)
+        self.assertEqual(self.project.status, 'IN_PROGRESS')
+
+        last = self.milestones[2]
+        last.status = 'COMPLETED'
+        # counter update plus the conditional completion update; no milestone reads
+        with self.assertNumQueries(3):
+            last.save()
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.status, 'COMPLETED')
+
+        last.delete()
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.milestone_count, 2)
+        self.assertEqual(self.project.completed_milestone_count, 2)
+
+    def test_bulk_status_endpoint(self):
+        """Test bulk status updates adjust counters and complete the project"""
+        other = Project.objects.create(
+            title='Someone else',
+            description='Test Description',
+            client=self.freelancer,
+            budget_min=100.00,
+            budget_max=500.00,
+            deadline=timezone.now() + timedelta(days=30),
+        )
+        foreign = Milestone.objects.create(
+            project=other,
+            title='Foreign',
+            description='Not visible to the client',
+            amount=Decimal('100.00'),
+            due_date=timezone.now() + timedelta(days=7),
+        )
+        ids = [milestone.id for milestone in self.milestones] + [foreign.id]
+
+        self.client.force_authenticate(user=self.client_user)
+        response = self.client.post(
+            reverse('milestone-bulk-status'), {'ids': ids[:2], 'status': 'COMPLETED'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'updated': 2, 'completed_projects': 0})
+
+        response = self.client.post(
+            reverse('milestone-bulk-status'), {'ids': ids[:1], 'status': 'IN_PROGRESS'}, format='json'
+        )
+        self.assertEqual(response.data, {'updated': 1, 'completed_projects': 0})
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.completed_milestone_count, 1)
+
+        response = self.client.post(
+            reverse('milestone-bulk-status'), {'ids': ids, 'status': 'COMPLETED'}, format='json'
+        )
+        self.assertEqual(response.data, {'updated': 2, 'completed_projects': 1})
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.completed_milestone_count, 3)
+        self.assertEqual(self.project.status, 'COMPLETED')
+
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.status, 'PENDING')
+        self.assertIsNotNone(Milestone.objects.get(pk=ids[0]).completed_at)
+
+        response = self.client.post(
+            reverse('milestone-bulk-status'), {'ids': ids, 'status': 'DONE'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_status_ignores_freelancer_milestones(self):
+        """Test the awarded freelancer cannot change statuses or complete the project"""
+        self.client.force_authenticate(user=self.freelancer)
+        response = self.client.post(
+            reverse('milestone-bulk-status'),
+            {'ids': [milestone.id for milestone in self.milestones], 'status': 'COMPLETED'},
+            format='json'
+        )
+        self.assertEqual(response.data, {'updated': 0, 'completed_projects': 0})
+        self.assertFalse(Milestone.objects.filter(status='COMPLETED').exists())
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.status, 'IN_PROGRESS')
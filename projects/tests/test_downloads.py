@@ -0,0 +1,126 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from users.models import User
+from projects.models import Project, ProjectFile
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, CHUNKED_UPLOAD_DIR=os.path.join(MEDIA_ROOT, 'uploads'))
+class FileDownloadTests(APITestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client_user = User.objects.create_user(
+            username='downloadclient',
+            email='downloadclient@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        self.outsider = User.objects.create_user(
+            username='downloadoutsider',
+            email='downloadoutsider@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        self.project = Project.objects.create(
+            title='Download Project',
+            description='Test Description',
+            client=self.client_user,
+            budget_min=100.00,
+            budget_max=500.00,
+            deadline=timezone.now() + timedelta(days=30),
+        )
+        self.content = bytes(range(256)) * 40
+        self.sha256 = hashlib.sha256(self.content).hexdigest()
+
+        # Go through the resumable upload so the file has a content hash
+        self.client.force_authenticate(user=self.client_user)
+        response = self.client.post(reverse('project-file-start-upload'), {
+            'project': self.project.id,
+            'filename': 'report.pdf',
+            'size': len(self.content),
+        }, format='json')
+        response = self.client.patch(
+            reverse('project-file-upload-chunk', kwargs={'upload_id': response.data['id']}),
+            self.content,
+            content_type='application/offset+octet-stream',
+            HTTP_UPLOAD_OFFSET='0'
+        )
+        self.project_file = ProjectFile.objects.get(pk=response.data['file']['id'])
+        self.url = reverse('project-file-download', kwargs={'pk': self.project_file.id})
+
+    def body(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_full_download(self):
+        """Test a plain download carries the content hash ETag"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.body(response), self.content)
+        self.assertEqual(response['ETag'], f'"{self.sha256}"')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('report.pdf', response['Content-Disposition'])
+
+    def test_byte_ranges(self):
+        """Test bounded, open-ended, suffix and unsatisfiable ranges"""
+        response = self.client.get(self.url, HTTP_RANGE='bytes=10-19')
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(self.body(response), self.content[10:20])
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(self.content)}')
+        self.assertEqual(response['Content-Length'], '10')
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=10000-')
+        self.assertEqual(self.body(response), self.content[10000:])
+
+        response = self.client.get(self.url, HTTP_RANGE='bytes=-5')
+        self.assertEqual(self.body(response), self.content[-5:])
+
+        response = self.client.get(self.url, HTTP_RANGE=f'bytes={len(self.content)}-')
+        self.assertEqual(response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+
+        # A stale If-Range falls back to the whole file
+        response = self.client.get(self.url, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_if_none_match(self):
+        """Test revalidation with the content hash"""
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"{self.sha256}"')
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    @override_settings(FILE_DOWNLOAD_OFFLOAD='x-accel-redirect', FILE_DOWNLOAD_ACCEL_PREFIX='/protected/')
+    def test_offload_to_web_server(self):
+        """Test that offloading hands the file to nginx without reading it"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected/{self.project_file.file.name}')
+        self.assertEqual(response.content, b'')
+
+    def test_legacy_file_and_permissions(self):
+        """Test files without a hash get a weak ETag and outsiders get 404"""
+        legacy = ProjectFile.objects.create(
+            project=self.project,
+            uploaded_by=self.client_user,
+            file=SimpleUploadedFile('notes.txt', b'hello')
+        )
+        response = self.client.get(reverse('project-file-download', kwargs={'pk': legacy.id}))
+        self.assertEqual(self.body(response), b'hello')
+        self.assertTrue(response['ETag'].startswith('W/'))
+
+        self.client.force_authenticate(user=self.outsider)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,113 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from communications.models import Notification
+from communications.tasks import notify_projects_expired
+from users.models import User
+from projects.expiry import run_expiry
+from projects.metrics import expiry_metrics
+from projects.models import Project, ProjectBid
+from projects.tasks import expire_overdue_projects
+
+
+class ProjectExpiryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client_user = User.objects.create_user(
+            username='expiryclient',
+            email='expiryclient@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        self.freelancer = User.objects.create_user(
+            username='expiryfreelancer',
+            email='expiryfreelancer@example.com',
+            password='testpass123',
+            role='FR'
+        )
+        now = timezone.now()
+        self.overdue = [self.create_project(now - timedelta(days=i + 1)) for i in range(5)]
+        self.current = self.create_project(now + timedelta(days=10))
+        self.in_progress = self.create_project(now - timedelta(days=3), status='IN_PROGRESS')
+
+        self.pending_bid = self.create_bid(self.overdue[0], 'PENDING')
+        self.rejected_bid = self.create_bid(self.overdue[1], 'REJECTED')
+
+    def create_project(self, deadline, status='OPEN'):
+        return Project.objects.create(
+            title='Expiry Project',
+            description='Test Description',
+            client=self.client_user,
+            budget_min=100.00,
+            budget_max=500.00,
+            deadline=deadline,
+            status=status
+        )
+
+    def create_bid(self, project, status):
+        return ProjectBid.objects.create(
+            project=project,
+            freelancer=self.freelancer,
+            amount=Decimal('200.00'),
+            proposal='Test proposal',
+            delivery_time=7,
+            status=status
+        )
+
+    def test_expires_in_resumable_chunks(self):
+        """Test bounded runs report leftover work and a later run finishes it"""
+        with mock.patch.object(notify_projects_expired, 'delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                expired, more = run_expiry(chunk_size=2, max_chunks=2)
+            self.assertEqual((expired, more), (4, True))
+            self.assertEqual(delay.call_count, 2)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertEqual(run_expiry(chunk_size=2, max_chunks=2), (1, False))
+
+        statuses = dict(Project.objects.values_list('id', 'status'))
+        self.assertTrue(all(statuses[p.id] == 'EXPIRED' for p in self.overdue))
+        self.assertEqual(statuses[self.current.id], 'OPEN')
+        self.assertEqual(statuses[self.in_progress.id], 'IN_PROGRESS')
+
+        metrics = expiry_metrics()
+        self.assertEqual(metrics['expiry_projects'], 5)
+        self.assertEqual(metrics['expiry_chunks'], 3)
+        self.assertEqual(metrics['expiry_bids_withdrawn'], 1)
+        self.assertIsNotNone(metrics['last_run'])
+
+    def test_pending_bids_withdrawn_and_counters_kept(self):
+        """Test pending bids are withdrawn and the pending counters follow"""
+        with mock.patch.object(notify_projects_expired, 'delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                run_expiry()
+
+        self.pending_bid.refresh_from_db()
+        self.rejected_bid.refresh_from_db()
+        self.assertEqual(self.pending_bid.status, 'WITHDRAWN')
+        self.assertEqual(self.rejected_bid.status, 'REJECTED')
+
+        project = Project.objects.get(pk=self.overdue[0].pk)
+        self.assertEqual((project.bid_count, project.pending_bid_count), (1, 0))
+        self.assertEqual(project.pending_bid_amount_sum, 0)
+
+        project_ids, bidders = delay.call_args.args
+        self.assertEqual(bidders, [(self.overdue[0].id, self.freelancer.id)])
+
+        # Fan out the notifications the task would have sent
+        self.assertEqual(notify_projects_expired(project_ids, bidders), 6)
+        self.assertEqual(Notification.objects.filter(recipient=self.client_user).count(), 5)
+        self.assertEqual(Notification.objects.get(recipient=self.freelancer).type, 'BID')
+
+    def test_task_requeues_with_same_cutoff(self):
+        """Test the beat task schedules a follow-up while work remains"""
+        with mock.patch('projects.tasks.run_expiry', return_value=(500, True)) as run, \
+                mock.patch.object(expire_overdue_projects, 'delay') as delay:
+            expire_overdue_projects()
+        cutoff = run.call_args.args[0]
+        delay.assert_called_once_with(cutoff.isoformat())
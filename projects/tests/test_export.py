@@ -0,0 +1,114 @@
+import csv
+import json
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from users.models import User
+from projects.models import Project, ProjectBid
+
+
+class ExportTests(APITestCase):
+    def setUp(self):
+        self.client_user = User.objects.create_user(
+            username='exportclient',
+            email='exportclient@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        self.freelancer = User.objects.create_user(
+            username='exportfreelancer',
+            email='exportfreelancer@example.com',
+            password='testpass123',
+            role='FR'
+        )
+        self.admin = User.objects.create_superuser(
+            username='exportadmin',
+            email='exportadmin@example.com',
+            password='testpass123'
+        )
+        self.projects = [
+            Project.objects.create(
+                title=f'Export Project {i}',
+                description='Line one,\nline "two"',
+                client=self.client_user,
+                budget_min=100.00,
+                budget_max=500.00,
+                deadline=timezone.now() + timedelta(days=30),
+            )
+            for i in range(3)
+        ]
+        self.bid = ProjectBid.objects.create(
+            project=self.projects[0],
+            freelancer=self.freelancer,
+            amount=Decimal('250.00'),
+            proposal='Test proposal',
+            delivery_time=7
+        )
+
+    def stream(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_export(self):
+        """Test NDJSON rows come out in updated_at order with typed values"""
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse('project-export'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        rows = [json.loads(line) for line in self.stream(response).splitlines()]
+        self.assertEqual([row['id'] for row in rows], [p.id for p in self.projects])
+        self.assertNotIn('bid_count', rows[0])
+        self.assertEqual(rows[0]['description'], 'Line one,\nline "two"')
+
+    def test_csv_export_of_bids(self):
+        """Test CSV export has a header and one row per bid"""
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse('project-export'), {'resource': 'bids', 'output': 'csv'})
+        self.assertEqual(response['Content-Type'], 'text/csv')
+
+        rows = list(csv.DictReader(StringIO(self.stream(response))))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['amount'], '250.00')
+
+    def test_incremental_window(self):
+        """Test that X-Export-Until as the next since returns only later changes"""
+        self.client.force_authenticate(user=self.admin)
+        first = self.client.get(reverse('project-export'))
+        self.stream(first)
+        until = first['X-Export-Until']
+
+        changed = self.projects[1]
+        changed.title = 'Changed'
+        changed.save()
+
+        response = self.client.get(reverse('project-export'), {'since': until})
+        rows = [json.loads(line) for line in self.stream(response).splitlines()]
+        self.assertEqual([row['id'] for row in rows], [changed.id])
+
+    def test_export_validation_and_permissions(self):
+        """Test bad parameters and non-admin access"""
+        self.client.force_authenticate(user=self.client_user)
+        response = self.client.get(reverse('project-export'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=self.admin)
+        for params in ({'resource': 'users'}, {'output': 'xml'}, {'since': 'yesterday'}):
+            response = self.client.get(reverse('project-export'), params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_command(self):
+        """Test the export_projects management command"""
+        out = StringIO()
+        call_command('export_projects', 'milestones', stdout=out, stderr=StringIO())
+        self.assertEqual(out.getvalue(), '')
+
+        call_command('export_projects', 'projects', '--format', 'csv', stdout=out, stderr=StringIO())
+        rows = list(csv.DictReader(StringIO(out.getvalue())))
+        self.assertEqual(len(rows), 3)
@@ -0,0 +1,99 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from users.models import User
+from projects.models import Project, ProjectBid
+from projects.serializers import NESTED_COLLECTION_LIMIT
+
+
+class SparseFieldsetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.client_user = User.objects.create_user(
+            username='fieldsclient',
+            email='fieldsclient@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        self.project = Project.objects.create(
+            title='Popular Project',
+            description='Test Description',
+            client=self.client_user,
+            budget_min=100.00,
+            budget_max=500.00,
+            deadline=timezone.now() + timedelta(days=30),
+        )
+        self.bid_count = NESTED_COLLECTION_LIMIT + 5
+        for i in range(self.bid_count):
+            freelancer = User.objects.create_user(
+                username=f'fieldsfreelancer{i}',
+                email=f'fieldsfreelancer{i}@example.com',
+                password='testpass123',
+                role='FR'
+            )
+            ProjectBid.objects.create(
+                project=self.project,
+                freelancer=freelancer,
+                amount=Decimal('100.00') + i,
+                proposal='Test proposal',
+                delivery_time=7
+            )
+        self.url = reverse('project-detail', kwargs={'pk': self.project.id})
+
+    def test_default_payload_embeds_collections(self):
+        """Test the default detail payload still embeds capped collections and hides counters"""
+        self.client.force_authenticate(user=self.client_user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for name in ('bids', 'files', 'milestones'):
+            self.assertIn(name, response.data)
+            self.assertIn(name, response.data['links'])
+        self.assertEqual(len(response.data['bids']), NESTED_COLLECTION_LIMIT)
+        self.assertEqual(response.data['total_bids'], self.bid_count)
+        for name in Project.COUNTER_FIELDS:
+            self.assertNotIn(name, response.data)
+
+    def test_expand_adds_to_trimmed_payload(self):
+        """Test ?expand= embeds a collection ?fields= leaves out, with one prefetch query"""
+        self.client.force_authenticate(user=self.client_user)
+        response = self.client.get(self.url, {'fields': 'id,title', 'expand': 'bids'})
+        self.assertEqual(set(response.data), {'id', 'title', 'bids'})
+        self.assertEqual(len(response.data['bids']), NESTED_COLLECTION_LIMIT)
+
+        # project, skills and bids-with-freelancers
+        with self.assertNumQueries(3):
+            self.client.get(self.url, {'expand': 'bids', 'fields': 'id,title'})
+
+    def test_fields_trims_payload(self):
+        """Test ?fields= on detail and list"""
+        self.client.force_authenticate(user=self.client_user)
+        response = self.client.get(self.url, {'fields': 'id,title,status'})
+        self.assertEqual(set(response.data), {'id', 'title', 'status'})
+
+        response = self.client.get(reverse('project-list'), {'fields': 'id,total_bids'})
+        self.assertEqual(response.data['results'][0], {'id': self.project.id, 'total_bids': self.bid_count})
+
+    def test_sub_resource_pages_every_bid(self):
+        """Test the bids link pages through all bids"""
+        self.client.force_authenticate(user=self.client_user)
+        response = self.client.get(self.url)
+        url = response.data['links']['bids']
+
+        seen = []
+        response = self.client.get(url, {'page_size': 4})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(item['id'] for item in response.data['results'])
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+
+        expected = list(self.project.bids.order_by('amount', 'id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
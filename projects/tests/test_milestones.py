@@ -97,7 +97,7 @@ class MilestoneTests(APITestCase):
         # Test listing
         response = self.client.get(reverse('milestone-list'))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data['results']), 2)
 
     def test_invalid_milestone_creation(self):
         """Test creating milestone with invalid data"""
@@ -161,4 +161,60 @@ class MilestoneTests(APITestCase):
 
         # Verify project status is automatically updated
         project = Project.objects.get(id=self.project.id)
-        self.assertEqual(project.status, 'COMPLETED')
\ No newline at end of file
+        self.assertEqual(project.status, 'COMPLETED')
+
+    def test_bulk_milestone_creation(self):
+        """Test creating a milestone schedule in one request"""
+        schedule = [
+            {
+                'title': f'Milestone {i}',
+                'description': 'Scheduled milestone',
+                'amount': '50.00',
+                'due_date': (timezone.now() + timedelta(days=7 * i)).isoformat()
+            }
+            for i in range(1, 31)
+        ]
+
+        self.client.force_authenticate(user=self.client_user)
+        # project lookup, savepoint pair, insert and counter update
+        with self.assertNumQueries(5):
+            response = self.client.post(
+                reverse('milestone-bulk-create'),
+                {'project': self.project.id, 'milestones': schedule},
+                format='json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 30)
+        self.assertTrue(all(item['id'] for item in response.data))
+
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.milestone_count, 30)
+
+    def test_bulk_milestone_creation_validation(self):
+        """Test that one invalid milestone rejects the whole batch"""
+        schedule = [
+            {
+                'title': 'Valid',
+                'description': 'Scheduled milestone',
+                'amount': '50.00',
+                'due_date': (timezone.now() + timedelta(days=7)).isoformat()
+            },
+            {
+                'title': 'Too expensive',
+                'description': 'Scheduled milestone',
+                'amount': '1000.00',
+                'due_date': (timezone.now() + timedelta(days=7)).isoformat()
+            },
+        ]
+        payload = {'project': self.project.id, 'milestones': schedule}
+
+        self.client.force_authenticate(user=self.client_user)
+        response = self.client.post(reverse('milestone-bulk-create'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(1, response.data['milestones'])
+
+        # Ownership is checked first, so a non-owner never sees the schedule errors
+        self.client.force_authenticate(user=self.freelancer)
+        response = self.client.post(reverse('milestone-bulk-create'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Milestone.objects.exists())
@@ -0,0 +1,117 @@
+import json
+from base64 import b64encode
+from datetime import timedelta
+from decimal import Decimal
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from users.models import User
+from projects.models import Project, ProjectBid
+
+
+class KeysetPaginationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.client_user = User.objects.create_user(
+            username='pageclient',
+            email='pageclient@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        self.projects = [
+            Project.objects.create(
+                title=f'Project {i}',
+                description='Test Description',
+                client=self.client_user,
+                budget_min=100.00,
+                budget_max=500.00,
+                deadline=timezone.now() + timedelta(days=30),
+            )
+            for i in range(5)
+        ]
+        # Identical timestamps force the id tiebreaker to do its job
+        Project.objects.update(created_at=timezone.now())
+
+    def collect_pages(self, url, **params):
+        seen = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(item['id'] for item in response.data['results'])
+            if not response.data['next']:
+                return seen
+            response = self.client.get(response.data['next'])
+
+    def test_project_pages_cover_every_row_once(self):
+        """Test walking all project pages with tied created_at values"""
+        self.client.force_authenticate(user=self.client_user)
+        seen = self.collect_pages(reverse('project-list'), page_size=2)
+
+        expected = sorted((p.id for p in self.projects), reverse=True)
+        self.assertEqual(seen, expected)
+
+    def test_cursor_page_seeks_on_leading_column(self):
+        """Test a cursor page bounds created_at, so the index is entered at the cursor"""
+        self.client.force_authenticate(user=self.client_user)
+        response = self.client.get(reverse('project-list'), {'page_size': 2})
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(response.data['next'])
+
+        sql = next(q['sql'] for q in queries if q['sql'].startswith('SELECT') and 'ORDER BY' in q['sql'])
+        self.assertIn('"projects_project"."created_at" <= ', sql)
+
+    def test_previous_link_returns_prior_page(self):
+        """Test that the previous cursor walks backwards"""
+        self.client.force_authenticate(user=self.client_user)
+        first = self.client.get(reverse('project-list'), {'page_size': 2})
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(back.data['results'], first.data['results'])
+
+    def test_bids_are_paginated_by_amount(self):
+        """Test that bids page over (amount, id)"""
+        project = self.projects[0]
+        freelancers = [
+            User.objects.create_user(
+                username=f'pagefreelancer{i}',
+                email=f'pagefreelancer{i}@example.com',
+                password='testpass123',
+                role='FR'
+            )
+            for i in range(3)
+        ]
+        for freelancer, amount in zip(freelancers, ['300.00', '200.00', '200.00']):
+            ProjectBid.objects.create(
+                project=project,
+                freelancer=freelancer,
+                amount=Decimal(amount),
+                proposal='Test proposal',
+                delivery_time=7
+            )
+
+        self.client.force_authenticate(user=freelancers[0])
+        response = self.client.get(reverse('project-bid-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNone(response.data['next'])
+
+    def test_invalid_cursor_returns_404(self):
+        """Test that a tampered cursor is rejected"""
+        self.client.force_authenticate(user=self.client_user)
+        response = self.client.get(reverse('project-list'), {'cursor': 'cD1ub3Rqc29u'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        # Well-formed cursors whose values do not fit the ordering fields
+        for position in (['garbage', 1], [None, 1], [str(timezone.now()), [1]]):
+            cursor = b64encode(urlencode({'p': json.dumps(position)}).encode()).decode()
+            response = self.client.get(reverse('project-list'), {'cursor': cursor})
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            self.assertEqual(response.data['detail'], 'Invalid cursor')
@@ -0,0 +1,143 @@
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from users.models import User
+from projects.access import ProjectAccess
+from projects.models import Milestone, Project, ProjectBid
+
+
+def create_project(client, **kwargs):
+    return Project.objects.create(
+        title='Access Project',
+        description='Test Description',
+        client=client,
+        budget_min=100.00,
+        budget_max=500.00,
+        deadline=timezone.now() + timedelta(days=30),
+        **kwargs
+    )
+
+
+class ProjectAccessTests(TestCase):
+    def setUp(self):
+        self.client_user = User.objects.create_user(
+            username='accessclient',
+            email='accessclient@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        self.freelancer = User.objects.create_user(
+            username='accessfreelancer',
+            email='accessfreelancer@example.com',
+            password='testpass123',
+            role='FR'
+        )
+        self.open_project = create_project(self.client_user)
+        self.bid_project = create_project(self.client_user)
+        self.awarded_project = create_project(
+            self.client_user, freelancer=self.freelancer, status='IN_PROGRESS'
+        )
+        ProjectBid.objects.create(
+            project=self.bid_project,
+            freelancer=self.freelancer,
+            amount=200.00,
+            proposal='Test proposal',
+            delivery_time=7
+        )
+
+    def test_roles_load_in_one_query(self):
+        """Test every role and bid check is answered from a single query"""
+        request = SimpleNamespace(user=self.freelancer)
+        with self.assertNumQueries(1):
+            access = ProjectAccess.for_request(request)
+            self.assertTrue(access.is_freelancer(self.awarded_project.id))
+            self.assertTrue(access.has_bid(self.bid_project.id))
+            self.assertTrue(access.is_participant(self.bid_project.id))
+            self.assertFalse(access.is_member(self.bid_project.id))
+            self.assertFalse(access.is_client(self.open_project.id))
+            self.assertEqual(
+                [access.can_bid(p) for p in (self.open_project, self.bid_project, self.awarded_project)],
+                [True, False, False]
+            )
+            # Memoized on the request
+            self.assertIs(ProjectAccess.for_request(request), access)
+
+    def test_can_submit_bid_matches_query(self):
+        """Test the access context gives the same answer as the per-object query"""
+        access = ProjectAccess(self.freelancer)
+        for project in (self.open_project, self.bid_project, self.awarded_project):
+            self.assertEqual(
+                project.can_submit_bid(self.freelancer),
+                project.can_submit_bid(self.freelancer, access=access)
+            )
+
+
+class PermissionEndpointTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client_user = User.objects.create_user(
+            username='permclient',
+            email='permclient@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        self.freelancer = User.objects.create_user(
+            username='permfreelancer',
+            email='permfreelancer@example.com',
+            password='testpass123',
+            role='FR'
+        )
+
+    def test_can_bid_flag_on_list_page(self):
+        """Test list pages carry can_bid without a query per project"""
+        projects = [create_project(self.client_user) for _ in range(5)]
+        self.client.force_authenticate(user=self.freelancer)
+        self.client.post(
+            reverse('project-submit-bid', kwargs={'pk': projects[0].id}),
+            {'project': projects[0].id, 'amount': '200.00', 'proposal': 'Test proposal', 'delivery_time': 7},
+            format='json'
+        )
+
+        response = self.client.get(reverse('project-list'))
+        flags = {item['id']: item['can_bid'] for item in response.data['results']}
+        self.assertFalse(flags[projects[0].id])
+        self.assertTrue(all(flags[p.id] for p in projects[1:]))
+
+        # Bidding again is refused from the same context
+        response = self.client.post(
+            reverse('project-submit-bid', kwargs={'pk': projects[0].id}),
+            {'project': projects[0].id, 'amount': '250.00', 'proposal': 'Again', 'delivery_time': 5},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_object_checks_resolve_project(self):
+        """Test milestone permissions check the milestone's project"""
+        project = create_project(self.client_user, freelancer=self.freelancer, status='IN_PROGRESS')
+        milestone = Milestone.objects.create(
+            project=project,
+            title='Design',
+            description='Test Description',
+            amount=100.00,
+            due_date=timezone.now() + timedelta(days=7),
+            status='IN_PROGRESS'
+        )
+        self.client.force_authenticate(user=self.freelancer)
+        response = self.client.patch(
+            reverse('milestone-detail', kwargs={'pk': milestone.id}), {'title': 'Changed'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.client.delete(reverse('milestone-detail', kwargs={'pk': milestone.id}))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertTrue(Milestone.objects.filter(pk=milestone.id).exists())
+
+        response = self.client.post(reverse('milestone-complete-milestone', kwargs={'pk': milestone.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
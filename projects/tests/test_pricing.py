@@ -0,0 +1,113 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from users.models import User, Skill
+from projects.models import Project, ProjectBid
+from projects.archive import run_archive
+from projects.pricing import compute_skill_prices, price_distribution, refresh_skill_prices, skill_prices
+
+
+class SkillPriceTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client_user = User.objects.create_user(
+            username='priceclient',
+            email='priceclient@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        self.python = Skill.objects.create(name='Python', category='Programming')
+        self.design = Skill.objects.create(name='Design', category='Creative')
+        self.unused = Skill.objects.create(name='Cobol', category='Programming')
+
+        python_project = self.create_project([self.python])
+        self.both_project = self.create_project([self.python, self.design])
+        for i, (amount, days) in enumerate([('100.00', 2), ('200.00', 4), ('300.00', 6)]):
+            self.create_bid(python_project, i, amount, days)
+        self.create_bid(self.both_project, 3, '400.00', 8)
+        self.create_bid(self.both_project, 4, '999.00', 1, status='WITHDRAWN')
+
+    def create_project(self, skills):
+        project = Project.objects.create(
+            title='Pricing Project',
+            description='Test Description',
+            client=self.client_user,
+            budget_min=100.00,
+            budget_max=500.00,
+            deadline=timezone.now() + timedelta(days=30),
+        )
+        project.required_skills.set(skills)
+        return project
+
+    def create_bid(self, project, index, amount, days, status='PENDING'):
+        freelancer = User.objects.create_user(
+            username=f'pricefreelancer{index}',
+            email=f'pricefreelancer{index}@example.com',
+            password='testpass123',
+            role='FR'
+        )
+        return ProjectBid.objects.create(
+            project=project,
+            freelancer=freelancer,
+            amount=Decimal(amount),
+            proposal='Test proposal',
+            delivery_time=days,
+            status=status
+        )
+
+    def test_price_distribution(self):
+        """Test percentiles, histogram and correlation of known columns"""
+        stats = price_distribution(np.array([100.0, 200.0, 300.0, 400.0]), np.array([2.0, 4.0, 6.0, 8.0]))
+        self.assertEqual(stats['percentiles']['p50'], 250.0)
+        self.assertEqual(sum(b['count'] for b in stats['histogram']), 4)
+        self.assertEqual(stats['delivery_correlation'], 1.0)
+
+        single = price_distribution(np.array([150.0]), np.array([3.0]))
+        self.assertIsNone(single['delivery_correlation'])
+        self.assertEqual(price_distribution(np.array([]), np.array([])), {'count': 0})
+
+    def test_nightly_refresh_serves_from_cache(self):
+        """Test the refresh caches every priced skill and the endpoint reads it without SQL"""
+        self.assertEqual(refresh_skill_prices(), 2)
+        self.client.force_authenticate(user=self.client_user)
+        url = reverse('project-bid-prices')
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, {'skills': [self.design.id, self.python.id]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        python, design = response.data[0], response.data[1]
+        self.assertEqual(python['skill'], self.python.id)
+        self.assertEqual((python['count'], python['max']), (4, 400.0))
+        self.assertEqual(python['percentiles']['p50'], 250.0)
+        self.assertEqual(design['count'], 1)
+
+    def test_cache_miss_computed_per_skill(self):
+        """Test a skill missing from the cache is computed and invalid input rejected"""
+        self.client.force_authenticate(user=self.client_user)
+        url = reverse('project-bid-prices')
+        response = self.client.get(url, {'skills': [self.unused.id, self.design.id]})
+        self.assertEqual([row['count'] for row in response.data], [1, 0])
+        self.assertEqual(response.data[0]['mean'], 400.0)
+
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url, {'skills': 'python'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_archived_bids_still_priced(self):
+        """Test bids of an archived project count while they are inside the price window"""
+        Project.objects.filter(pk=self.both_project.pk).update(
+            status='COMPLETED', updated_at=timezone.now() - timedelta(days=settings.PROJECT_ARCHIVE_AFTER_DAYS + 1)
+        )
+        self.assertEqual(run_archive(), (1, False))
+        self.assertEqual(ProjectBid.objects.count(), 3)
+
+        self.assertEqual(refresh_skill_prices(), 2)
+        self.assertEqual(skill_prices([self.python.id])[self.python.id]['count'], 4)
+        self.assertEqual(compute_skill_prices(self.design.id)['mean'], 400.0)
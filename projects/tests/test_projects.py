@@ -108,13 +108,13 @@ class ProjectManagementTests(APITestCase):
         # Test filtering by budget
         response = self.client.get(reverse('project-list'), {'budget_min': '150.00'})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data['results']), 1)
 
         # Test searching by title
         response = self.client.get(reverse('project-list'), {'search': 'Python'})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['title'], 'Python Project')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['title'], 'Python Project')
 
     def test_project_complete_lifecycle(self):
         """Test complete project lifecycle from creation to completion"""
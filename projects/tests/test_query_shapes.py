@@ -0,0 +1,39 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from freelancerPlatform.query_shapes import discover
+from projects.management.commands.explain_queries import plan_usage
+
+
+class ExplainQueriesTests(TestCase):
+    def test_reports_every_registered_shape(self):
+        """Test the command explains the shapes of both apps and lists the new indexes"""
+        shapes = discover()
+        self.assertIn('project listing, client', shapes)
+        self.assertIn('notification listing', shapes)
+
+        out = StringIO()
+        call_command('explain_queries', quiet_plans=True, stdout=out)
+        output = out.getvalue()
+        for name in shapes:
+            self.assertIn(f'== {name} ==', output)
+        self.assertIn('project_open_created_idx', output)
+
+    def test_plan_usage_parses_postgres_and_sqlite(self):
+        """Test index names and full scans are picked out of both plan formats"""
+        postgres = (
+            'Limit\n'
+            '  ->  Index Scan Backward using project_open_created_idx on projects_project\n'
+            '  ->  Bitmap Index Scan on "projects_pr_project_ada2db_idx"\n'
+            '  ->  Seq Scan on projects_projectbid'
+        )
+        self.assertEqual(plan_usage(postgres), (
+            {'project_open_created_idx', 'projects_pr_project_ada2db_idx'}, {'projects_projectbid'}
+        ))
+        sqlite = (
+            '5 0 0 SEARCH projects_project USING COVERING INDEX project_open_budget_idx (budget_max>?)\n'
+            '9 0 0 SCAN projects_milestone'
+        )
+        self.assertEqual(plan_usage(sqlite), ({'project_open_budget_idx'}, {'projects_milestone'}))
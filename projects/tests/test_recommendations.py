@@ -0,0 +1,128 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from users.models import User, Skill, Profile
+from projects.models import Project, ProjectBid
+from projects.recommendations import pack_skills, recommend_projects
+
+
+class ProjectRecommendationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.client_user = User.objects.create_user(
+            username='recclient',
+            email='recclient@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        self.freelancer = User.objects.create_user(
+            username='recfreelancer',
+            email='recfreelancer@example.com',
+            password='testpass123',
+            role='FR'
+        )
+        self.python = Skill.objects.create(name='Python', category='Programming')
+        self.django = Skill.objects.create(name='Django', category='Web Development')
+        self.design = Skill.objects.create(name='Design', category='Art')
+
+        profile, _ = Profile.objects.get_or_create(user=self.freelancer)
+        profile.hourly_rate = 50
+        profile.save()
+        profile.skills.set([self.python, self.django])
+
+        self.full_match = self.create_project('Full match', [self.python, self.django])
+        self.half_match = self.create_project('Half match', [self.python, self.design])
+        self.no_match = self.create_project('No match', [self.design])
+
+    def create_project(self, title, skills, budget_max=5000):
+        project = Project.objects.create(
+            title=title,
+            description='Test Description',
+            client=self.client_user,
+            budget_min=100.00,
+            budget_max=budget_max,
+            deadline=timezone.now() + timedelta(days=30),
+        )
+        project.required_skills.set(skills)
+        return project
+
+    def test_pack_skills_sets_one_bit_per_skill(self):
+        """Test the bitset layout"""
+        self.assertEqual(pack_skills([0, 3, 9]), bytes([0b00001001, 0b00000010]))
+        self.assertEqual(pack_skills([]), b'')
+
+    def test_ranks_by_skill_overlap(self):
+        """Test that better skill coverage ranks higher and misses are dropped"""
+        ranked = [pk for pk, _ in recommend_projects(self.freelancer)]
+        self.assertEqual(ranked, [self.full_match.id, self.half_match.id])
+
+    def test_budget_fit_and_existing_bids(self):
+        """Test that underpaying projects drop and bid-on projects are excluded"""
+        cheap = self.create_project('Cheap full match', [self.python, self.django], budget_max=100)
+        ranked = [pk for pk, _ in recommend_projects(self.freelancer)]
+        self.assertLess(ranked.index(self.full_match.id), ranked.index(cheap.id))
+
+        ProjectBid.objects.create(
+            project=self.full_match,
+            freelancer=self.freelancer,
+            amount=300,
+            proposal='Test proposal',
+            delivery_time=7
+        )
+        ranked = [pk for pk, _ in recommend_projects(self.freelancer)]
+        self.assertNotIn(self.full_match.id, ranked)
+
+    def test_closed_and_retagged_projects_refresh(self):
+        """Test that status and skill changes refresh the cached matrix"""
+        recommend_projects(self.freelancer)
+
+        self.full_match.status = 'IN_PROGRESS'
+        self.full_match.save()
+        self.no_match.required_skills.add(self.django)
+
+        ranked = [pk for pk, _ in recommend_projects(self.freelancer)]
+        self.assertNotIn(self.full_match.id, ranked)
+        self.assertIn(self.no_match.id, ranked)
+
+    def test_unrelated_saves_keep_the_matrix(self):
+        """Test that saving fields the matrix does not read leaves it cached"""
+        Project.objects.filter(pk=self.no_match.pk).update(status='IN_PROGRESS')
+        recommend_projects(self.freelancer)
+
+        project = Project.objects.get(pk=self.half_match.pk)
+        project.title = 'Half match, renamed'
+        project.save()
+        closed = Project.objects.get(pk=self.no_match.pk)
+        closed.status = 'CANCELLED'
+        closed.save()
+        closed.status = 'EXPIRED'
+        closed.save()
+
+        with mock.patch('projects.recommendations._build_matrix', return_value=None) as build:
+            recommend_projects(self.freelancer)
+        build.assert_not_called()
+
+        project.budget_max = 6000
+        project.save()
+        with mock.patch('projects.recommendations._build_matrix', return_value=None) as build:
+            recommend_projects(self.freelancer)
+        build.assert_called_once()
+
+    def test_recommended_action(self):
+        """Test the recommended endpoint for freelancers and clients"""
+        self.client.force_authenticate(user=self.freelancer)
+        response = self.client.get(reverse('project-recommended'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]['id'], self.full_match.id)
+        self.assertIn('score', response.data[0])
+
+        self.client.force_authenticate(user=self.client_user)
+        response = self.client.get(reverse('project-recommended'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
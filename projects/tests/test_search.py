@@ -0,0 +1,104 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from users.models import User, Skill
+from projects.models import Project, ProjectSearchPosting
+from projects.search import search_projects, tokenize
+
+
+class ProjectSearchTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.client_user = User.objects.create_user(
+            username='searchclient',
+            email='searchclient@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        self.freelancer = User.objects.create_user(
+            username='searchfreelancer',
+            email='searchfreelancer@example.com',
+            password='testpass123',
+            role='FR'
+        )
+        self.django = Skill.objects.create(name='Django', category='Web Development')
+
+        self.api_project = self.create_project(
+            'Django REST API', 'Build an API for an online store'
+        )
+        self.api_project.required_skills.add(self.django)
+        self.logo_project = self.create_project(
+            'Logo design', 'Design a logo for a store that sells django merchandise'
+        )
+
+    def create_project(self, title, description, **kwargs):
+        kwargs.setdefault('client', self.client_user)
+        return Project.objects.create(
+            title=title,
+            description=description,
+            budget_min=100.00,
+            budget_max=500.00,
+            deadline=timezone.now() + timedelta(days=30),
+            **kwargs
+        )
+
+    def test_tokenize_drops_stop_words_and_punctuation(self):
+        """Test tokenizer normalization"""
+        self.assertEqual(tokenize('Build a REST-API, for the Store!'), ['build', 'rest', 'api', 'store'])
+
+    def test_title_and_skill_matches_rank_first(self):
+        """Test BM25 ranking prefers title and skill matches"""
+        ranked = [project_id for project_id, _ in search_projects('django')]
+        self.assertEqual(ranked, [self.api_project.id, self.logo_project.id])
+
+    def test_candidates_restricted_before_the_cut(self):
+        """Test a visible match is ranked even when invisible ones outscore it"""
+        other = User.objects.create_user(
+            username='searchother',
+            email='searchother@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        self.create_project('Django Django', 'Django store work', client=other, status='COMPLETED')
+
+        self.assertNotIn(self.logo_project.id, dict(search_projects('django', limit=2)))
+        mine = Project.objects.filter(client=self.client_user, title__startswith='Logo')
+        self.assertEqual([pk for pk, _ in search_projects('django', limit=1, projects=mine)], [self.logo_project.id])
+
+    def test_index_follows_edits(self):
+        """Test that saving and re-tagging a project updates its postings"""
+        self.logo_project.title = 'Brand kit'
+        self.logo_project.save()
+        frequencies = dict(
+            ProjectSearchPosting.objects
+            .filter(document__project=self.logo_project)
+            .values_list('term', 'frequency')
+        )
+        self.assertEqual(frequencies['brand'], 3)
+        # "logo" now only appears in the description
+        self.assertEqual(frequencies['logo'], 1)
+
+        # Title weight plus skill weight, then title weight alone
+        posting = ProjectSearchPosting.objects.get(document__project=self.api_project, term='django')
+        self.assertEqual(posting.frequency, 5)
+        self.api_project.required_skills.remove(self.django)
+        posting.refresh_from_db()
+        self.assertEqual(posting.frequency, 3)
+
+    def test_q_mode_returns_ranked_visible_projects(self):
+        """Test ?q= on the project list honours visibility and ranking"""
+        self.create_project('Django admin', 'Private work', status='IN_PROGRESS')
+
+        self.client.force_authenticate(user=self.freelancer)
+        response = self.client.get(reverse('project-list'), {'q': 'django store'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        titles = [item['title'] for item in response.data['results']]
+        self.assertEqual(titles, ['Django REST API', 'Logo design'])
+        self.assertGreater(response.data['results'][0]['score'], response.data['results'][1]['score'])
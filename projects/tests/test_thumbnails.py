@@ -0,0 +1,113 @@
+import io
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from users.models import User
+from projects.models import FileBlob, Project, ProjectFile
+from projects.tasks import generate_project_file_thumbnails
+from projects.thumbnails import THUMBNAIL_SIZES, thumbnail_name
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def image_upload(name='photo.jpg', size=(2400, 1600), image_format='JPEG', mode='RGB', color='orange'):
+    buffer = io.BytesIO()
+    Image.new(mode, size, color).save(buffer, image_format)
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, CHUNKED_UPLOAD_DIR=os.path.join(MEDIA_ROOT, 'uploads'))
+class ThumbnailTests(APITestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client_user = User.objects.create_user(
+            username='thumbclient',
+            email='thumbclient@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        self.project = Project.objects.create(
+            title='Thumbnail Project',
+            description='Test Description',
+            client=self.client_user,
+            budget_min=100.00,
+            budget_max=500.00,
+            deadline=timezone.now() + timedelta(days=30),
+        )
+        self.client.force_authenticate(user=self.client_user)
+
+    def upload(self, upload):
+        with mock.patch.object(generate_project_file_thumbnails, 'delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(reverse('project-file-list'), {
+                    'project': self.project.id,
+                    'file': upload,
+                }, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response, delay
+
+    def test_upload_queues_thumbnails(self):
+        """Test image uploads are stored by hash and queue thumbnail rendering"""
+        response, delay = self.upload(image_upload())
+        project_file = ProjectFile.objects.get(pk=response.data['id'])
+        self.assertEqual(project_file.blob, FileBlob.objects.get())
+        self.assertEqual(project_file.filename, 'photo.jpg')
+        delay.assert_called_once_with(project_file.id)
+        self.assertEqual(set(response.data['thumbnails']), set(THUMBNAIL_SIZES))
+
+        response, delay = self.upload(SimpleUploadedFile('notes.txt', b'plain text'))
+        delay.assert_not_called()
+        self.assertIsNone(response.data['thumbnails'])
+
+    def test_render_and_serve_thumbnails(self):
+        """Test every size is rendered once per hash and served inline"""
+        response, _ = self.upload(image_upload())
+        project_file = ProjectFile.objects.get(pk=response.data['id'])
+        url = response.data['thumbnails']['medium']['webp']
+
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+        self.assertEqual(generate_project_file_thumbnails(project_file.id), len(THUMBNAIL_SIZES) * 2)
+        # Thumbnails are keyed by content, so a re-run has nothing to do
+        self.assertEqual(generate_project_file_thumbnails(project_file.id), 0)
+
+        for size, edge in THUMBNAIL_SIZES.items():
+            with default_storage.open(thumbnail_name(project_file.blob_id, size, 'jpg')) as stored:
+                with Image.open(stored) as thumbnail:
+                    self.assertEqual(max(thumbnail.size), edge)
+                    self.assertEqual(thumbnail.format, 'JPEG')
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'image/webp')
+        self.assertTrue(response['Content-Disposition'].startswith('inline'))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_transparent_and_broken_images(self):
+        """Test alpha is kept for WebP and undecodable images are skipped"""
+        response, _ = self.upload(image_upload('logo.png', (300, 200), 'PNG', 'RGBA', (255, 165, 0, 128)))
+        project_file = ProjectFile.objects.get(pk=response.data['id'])
+        generate_project_file_thumbnails(project_file.id)
+        with default_storage.open(thumbnail_name(project_file.blob_id, 'small', 'webp')) as stored:
+            with Image.open(stored) as thumbnail:
+                self.assertEqual(thumbnail.mode, 'RGBA')
+
+        response, _ = self.upload(SimpleUploadedFile('broken.png', b'not really a png'))
+        self.assertEqual(generate_project_file_thumbnails(response.data['id']), 0)
@@ -0,0 +1,168 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from freelancerPlatform.celery import app as celery_app
+from users.models import User
+from projects.models import FileBlob, Project, ProjectFile, UploadSession
+from projects.tasks import purge_stale_upload_sessions
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, CHUNKED_UPLOAD_DIR=os.path.join(MEDIA_ROOT, 'uploads'))
+class ChunkedUploadTests(APITestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client_user = User.objects.create_user(
+            username='uploadclient',
+            email='uploadclient@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        self.outsider = User.objects.create_user(
+            username='uploadoutsider',
+            email='uploadoutsider@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        self.project = self.create_project(self.client_user)
+        self.content = os.urandom(300 * 1024)
+        self.sha256 = hashlib.sha256(self.content).hexdigest()
+
+    def create_project(self, client):
+        return Project.objects.create(
+            title='Upload Project',
+            description='Test Description',
+            client=client,
+            budget_min=100.00,
+            budget_max=500.00,
+            deadline=timezone.now() + timedelta(days=30),
+        )
+
+    def start(self, project=None, **extra):
+        data = {
+            'project': (project or self.project).id,
+            'filename': 'deliverable.bin',
+            'size': len(self.content),
+            **extra
+        }
+        return self.client.post(reverse('project-file-start-upload'), data, format='json')
+
+    def send_chunk(self, upload_id, offset, chunk):
+        return self.client.patch(
+            reverse('project-file-upload-chunk', kwargs={'upload_id': upload_id}),
+            chunk,
+            content_type='application/offset+octet-stream',
+            HTTP_UPLOAD_OFFSET=str(offset)
+        )
+
+    def upload(self, chunk_size=128 * 1024, **extra):
+        response = self.start(**extra)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        upload_id = response.data['id']
+        for offset in range(0, len(self.content), chunk_size):
+            response = self.send_chunk(upload_id, offset, self.content[offset:offset + chunk_size])
+        return response
+
+    def test_chunked_upload_is_resumable(self):
+        """Test chunks append in order, resume from the stored offset and complete"""
+        self.client.force_authenticate(user=self.client_user)
+        upload_id = self.start(sha256=self.sha256).data['id']
+
+        response = self.send_chunk(upload_id, 0, self.content[:100 * 1024])
+        self.assertEqual(response.data['offset'], 100 * 1024)
+
+        # A retried chunk with a stale offset is refused with the real offset
+        response = self.send_chunk(upload_id, 0, self.content[:100 * 1024])
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['offset'], 100 * 1024)
+
+        response = self.client.get(reverse('project-file-upload-chunk', kwargs={'upload_id': upload_id}))
+        offset = response.data['offset']
+        response = self.send_chunk(upload_id, offset, self.content[offset:])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['file']['sha256'], self.sha256)
+
+        blob = FileBlob.objects.get()
+        with default_storage.open(blob.file.name) as stored:
+            self.assertEqual(stored.read(), self.content)
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertEqual(os.listdir(os.path.join(MEDIA_ROOT, 'uploads')), [])
+
+    def test_duplicate_upload_reuses_blob(self):
+        """Test a declared hash the user already uploaded skips the transfer"""
+        self.client.force_authenticate(user=self.client_user)
+        self.upload()
+
+        other_project = self.create_project(self.client_user)
+        response = self.start(project=other_project, sha256=self.sha256)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(response.data['deduplicated'])
+        self.assertEqual(FileBlob.objects.count(), 1)
+        self.assertEqual(
+            set(ProjectFile.objects.values_list('file', flat=True)),
+            {FileBlob.objects.get().file.name}
+        )
+
+    def test_hash_alone_does_not_grant_access(self):
+        """Test another user's declared hash still requires uploading the bytes"""
+        self.client.force_authenticate(user=self.client_user)
+        self.upload()
+
+        self.client.force_authenticate(user=self.outsider)
+        outsider_project = self.create_project(self.outsider)
+        response = self.start(project=outsider_project, sha256=self.sha256)
+        self.assertNotIn('deduplicated', response.data)
+
+        # Uploading the same bytes still ends up sharing the stored blob
+        upload_id = response.data['id']
+        response = self.send_chunk(upload_id, 0, self.content)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(FileBlob.objects.count(), 1)
+
+    def test_rejects_bad_uploads(self):
+        """Test hash mismatches, oversized chunks and non-participants"""
+        self.client.force_authenticate(user=self.client_user)
+        response = self.upload(sha256='0' * 64)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(FileBlob.objects.exists())
+
+        upload_id = self.start().data['id']
+        response = self.send_chunk(upload_id, 0, self.content + b'extra')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(UploadSession.objects.get(pk=upload_id).offset, 0)
+
+        self.client.force_authenticate(user=self.outsider)
+        response = self.start()
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.send_chunk(upload_id, 0, self.content)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_stale_sessions_purged_on_schedule(self):
+        """Test beat runs the purge task and it drops abandoned sessions"""
+        entry = celery_app.conf.beat_schedule['purge-stale-upload-sessions']
+        self.assertEqual(entry['task'], purge_stale_upload_sessions.name)
+
+        self.client.force_authenticate(user=self.client_user)
+        upload_id = self.start().data['id']
+        self.send_chunk(upload_id, 0, self.content[:1024])
+        fresh_id = self.start().data['id']
+        UploadSession.objects.filter(pk=upload_id).update(updated_at=timezone.now() - timedelta(days=2))
+
+        self.assertEqual(purge_stale_upload_sessions(), 1)
+        self.assertFalse(UploadSession.objects.filter(pk=upload_id).exists())
+        self.assertTrue(UploadSession.objects.filter(pk=fresh_id).exists())
@@ -0,0 +1,113 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from users.models import User, Skill
+from projects.models import Project, ProjectBid
+from projects.visibility import VISIBILITY_STRATEGIES, filter_visible_to_freelancer
+
+
+class VisibilityTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client_user = User.objects.create_user(
+            username='visibilityclient',
+            email='visibilityclient@example.com',
+            password='testpass123',
+            role='CL'
+        )
+        self.freelancer = User.objects.create_user(
+            username='visibilityfreelancer',
+            email='visibilityfreelancer@example.com',
+            password='testpass123',
+            role='FR'
+        )
+        self.open_project = self.create_project('OPEN')
+        self.awarded_project = self.create_project('IN_PROGRESS', freelancer=self.freelancer)
+        self.bid_project = self.create_project('COMPLETED')
+        self.hidden_project = self.create_project('COMPLETED')
+        # A bid on an open project must not duplicate it
+        for project in (self.open_project, self.bid_project):
+            ProjectBid.objects.create(
+                project=project,
+                freelancer=self.freelancer,
+                amount=200.00,
+                proposal='Test proposal',
+                delivery_time=7
+            )
+
+    def create_project(self, status, **kwargs):
+        return Project.objects.create(
+            title='Visibility Project',
+            description='Test Description',
+            client=self.client_user,
+            budget_min=100.00,
+            budget_max=500.00,
+            deadline=timezone.now() + timedelta(days=30),
+            status=status,
+            **kwargs
+        )
+
+    def test_strategies_agree(self):
+        """Test the join and union strategies return the same projects once each"""
+        expected = [self.open_project.id, self.awarded_project.id, self.bid_project.id]
+        for strategy in VISIBILITY_STRATEGIES:
+            ids = list(filter_visible_to_freelancer(
+                Project.objects.all(), self.freelancer, strategy
+            ).values_list('id', flat=True))
+            self.assertEqual(sorted(ids), sorted(expected), strategy)
+
+    def test_listing_with_each_strategy(self):
+        """Test the project listing honours the configured strategy and skill filter"""
+        skills = [Skill.objects.create(name='Python'), Skill.objects.create(name='Django')]
+        self.open_project.required_skills.set(skills)
+        self.client.force_authenticate(user=self.freelancer)
+
+        for strategy in VISIBILITY_STRATEGIES:
+            with override_settings(PROJECT_VISIBILITY_STRATEGY=strategy):
+                cache.clear()
+                response = self.client.get(reverse('project-list'))
+                self.assertEqual(len(response.data['results']), 3)
+
+                response = self.client.get(reverse('project-list'), {'skills': [s.id for s in skills]})
+                self.assertEqual([p['id'] for p in response.data['results']], [self.open_project.id])
+
+    @override_settings(PROJECT_VISIBILITY_STRATEGY='union')
+    def test_union_listing_pages_merge_branches(self):
+        """Test pages read per branch interleave in listing order, both ways, without repeats"""
+        self.create_project('OPEN')
+        self.client.force_authenticate(user=self.freelancer)
+        expected = list(filter_visible_to_freelancer(
+            Project.objects.all(), self.freelancer, 'join'
+        ).order_by('-created_at', '-id').values_list('id', flat=True))
+
+        seen, url, params = [], reverse('project-list'), {'page_size': 1}
+        while url:
+            response = self.client.get(url, params)
+            seen += [p['id'] for p in response.data['results']]
+            previous, url, params = response.data['previous'], response.data['next'], None
+        self.assertEqual(seen, expected)
+
+        back = []
+        while previous:
+            response = self.client.get(previous)
+            back = [p['id'] for p in response.data['results']] + back
+            previous = response.data['previous']
+        self.assertEqual(back, expected[:-1])
+
+
+class BenchmarkVisibilityCommandTests(TestCase):
+    def test_benchmark_rolls_back(self):
+        """Test the benchmark reports both strategies and leaves no data behind"""
+        output = StringIO()
+        call_command('benchmark_visibility', projects=200, bids=10, runs=1, stdout=output)
+        for strategy in VISIBILITY_STRATEGIES:
+            self.assertIn(f'== {strategy} ==', output.getvalue())
+        self.assertFalse(Project.objects.exists())
+        self.assertFalse(User.objects.exists())
@@ -0,0 +1,112 @@
+import io
+import logging
+import os
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+from rest_framework.reverse import reverse
+
+from .downloads import file_download_response
+
+logger = logging.getLogger(__name__)
+
+# Longest edge in pixels for each preview size
+THUMBNAIL_SIZES = {
+    'small': 128,
+    'medium': 480,
+    'large': 1024,
+}
+THUMBNAIL_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpg': ('JPEG', {'quality': 85, 'optimize': True, 'progressive': True}),
+}
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.tif', '.tiff'}
+
+THUMBNAIL_SIZE_PATTERN = '|'.join(THUMBNAIL_SIZES)
+THUMBNAIL_FORMAT_PATTERN = '|'.join(THUMBNAIL_FORMATS)
+
+
+def is_image(filename):
+    return os.path.splitext(filename or '')[1].lower() in IMAGE_EXTENSIONS
+
+
+def thumbnail_name(sha256, size, ext):
+    """Thumbnails are keyed by content hash, so duplicate uploads share them"""
+    return f'thumbnails/{sha256[:2]}/{sha256}/{size}.{ext}'
+
+
+def thumbnail_etag(sha256, size, ext):
+    return f'"{sha256}-{size}.{ext}"'
+
+
+def thumbnail_urls(route, kwargs, request=None):
+    """URLs of every size and format for a detail route taking size and ext"""
+    return {
+        size: {
+            ext: reverse(route, kwargs={**kwargs, 'size': size, 'ext': ext}, request=request)
+            for ext in THUMBNAIL_FORMATS
+        }
+        for size in THUMBNAIL_SIZES
+    }
+
+
+def _flatten_alpha(image):
+    """JPEG has no alpha channel; composite transparent images onto white"""
+    if image.mode != 'RGBA':
+        return image
+    background = Image.new('RGB', image.size, 'white')
+    background.paste(image, mask=image.getchannel('A'))
+    return background
+
+
+def render_thumbnails(storage, name, sha256):
+    """
+    Write any missing thumbnails for the stored image and return how many
+    were written. Images that cannot be decoded are logged and skipped.
+    """
+    missing = {
+        (size, ext)
+        for size in THUMBNAIL_SIZES
+        for ext in THUMBNAIL_FORMATS
+        if not default_storage.exists(thumbnail_name(sha256, size, ext))
+    }
+    if not missing:
+        return 0
+
+    written = 0
+    try:
+        with storage.open(name, 'rb') as source, Image.open(source) as image:
+            # JPEG can decode straight to a 1/2, 1/4 or 1/8 scale that still
+            # covers the largest thumbnail, so huge photos never sit in memory
+            # at full resolution. Other formats ignore the hint.
+            largest = max(THUMBNAIL_SIZES.values())
+            image.draft('RGB', (largest, largest))
+            image = ImageOps.exif_transpose(image)
+            has_alpha = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+            image = image.convert('RGBA' if has_alpha else 'RGB')
+
+            # Shrink in place from the largest size down, reusing each result
+            for size, edge in sorted(THUMBNAIL_SIZES.items(), key=lambda item: -item[1]):
+                image.thumbnail((edge, edge))
+                for ext, (pil_format, options) in THUMBNAIL_FORMATS.items():
+                    if (size, ext) not in missing:
+                        continue
+                    output = _flatten_alpha(image) if pil_format == 'JPEG' else image
+                    buffer = io.BytesIO()
+                    output.save(buffer, pil_format, **options)
+                    default_storage.save(thumbnail_name(sha256, size, ext), ContentFile(buffer.getvalue()))
+                    written += 1
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        logger.warning("Skipping thumbnails for %s: %s", name, e)
+    return written
+
+
+def thumbnail_response(request, sha256, size, ext):
+    """Serve a rendered thumbnail inline, or None if it does not exist yet"""
+    name = thumbnail_name(sha256, size, ext)
+    if not default_storage.exists(name):
+        return None
+    return file_download_response(
+        request, default_storage, name, thumbnail_etag(sha256, size, ext), as_attachment=False
+    )
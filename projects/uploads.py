@@ -0,0 +1,182 @@
+import hashlib
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import FileBlob, ProjectFile, UploadSession
+
+READ_BLOCK_SIZE = 1024 * 1024
+STALE_UPLOAD_AGE = timedelta(days=1)
+
+
+class UploadError(Exception):
+    """The upload request cannot be applied; the message is safe to show"""
+
+
+class UploadOffsetMismatch(UploadError):
+    def __init__(self, offset):
+        super().__init__(f"Expected Upload-Offset {offset}")
+        self.offset = offset
+
+
+class _PartFile(File):
+    """Lets FileSystemStorage move the finished part file instead of copying it"""
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as part:
+        for block in iter(lambda: part.read(READ_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def blob_name(sha256):
+    return f'{sha256[:2]}/{sha256[2:4]}/{sha256}'
+
+
+def reusable_blob(sha256, size, user):
+    """
+    An existing blob the user may link by hash alone. Knowing a hash must
+    not grant access to bytes the user has never had, so only blobs they
+    uploaded or can already see on one of their projects qualify.
+    """
+    return FileBlob.objects.filter(sha256=sha256, size=size).filter(
+        Q(uploaded_by=user) |
+        Q(project_files__project__client=user) |
+        Q(project_files__project__freelancer=user)
+    ).first()
+
+
+def store_blob(sha256, size, user, content):
+    """Return the blob for sha256, saving content as a new one if it is not stored yet"""
+    blob = FileBlob.objects.filter(pk=sha256).first()
+    if blob is not None:
+        return blob
+
+    blob = FileBlob(sha256=sha256, size=size, uploaded_by=user)
+    blob.file.save(blob_name(sha256), content, save=False)
+    try:
+        with transaction.atomic():
+            blob.save(force_insert=True)
+    except IntegrityError:
+        # Another upload of the same bytes finished first
+        blob.file.delete(save=False)
+        blob = FileBlob.objects.get(pk=sha256)
+    return blob
+
+
+def attach_blob(project, user, blob, filename, description=''):
+    project_file = ProjectFile(
+        project=project,
+        uploaded_by=user,
+        blob=blob,
+        filename=filename,
+        size=blob.size,
+        description=description,
+    )
+    project_file.file.name = blob.file.name
+    project_file.save()
+    return project_file
+
+
+def start_upload(project, user, filename, size, sha256='', description=''):
+    """
+    Open an upload session. When the declared hash matches a blob the user
+    may reuse, the file is attached at once and no bytes are transferred.
+    Returns (project_file, None) for a duplicate, else (None, session).
+    """
+    sha256 = sha256.lower()
+    if sha256:
+        blob = reusable_blob(sha256, size, user)
+        if blob is not None:
+            return attach_blob(project, user, blob, filename, description), None
+
+    session = UploadSession.objects.create(
+        project=project,
+        user=user,
+        filename=filename,
+        description=description,
+        size=size,
+        sha256=sha256,
+    )
+    os.makedirs(settings.CHUNKED_UPLOAD_DIR, exist_ok=True)
+    open(session.part_path, 'wb').close()
+    return None, session
+
+
+def append_chunk(session_id, user, offset, stream):
+    """
+    Stream one chunk from a file-like object to the end of the part file.
+    The client must send the offset the server last acknowledged; bytes a
+    failed request left past that offset are discarded. The final chunk
+    completes the upload. Returns (project_file or None, session).
+    """
+    with transaction.atomic():
+        session = UploadSession.objects.select_for_update().get(pk=session_id, user=user)
+        if offset != session.offset:
+            raise UploadOffsetMismatch(session.offset)
+
+        remaining = session.size - session.offset
+        written = 0
+        with open(session.part_path, 'r+b') as part:
+            part.seek(session.offset)
+            part.truncate()
+            while True:
+                # Ask for one byte more than allowed to detect oversized chunks
+                block = stream.read(min(READ_BLOCK_SIZE, remaining - written + 1))
+                if not block:
+                    break
+                written += len(block)
+                if written > remaining:
+                    raise UploadError("Chunk runs past the declared file size")
+                part.write(block)
+
+        session.offset += written
+        session.save(update_fields=['offset', 'updated_at'])
+
+    if session.offset < session.size:
+        return None, session
+    return finish_upload(session), session
+
+
+def finish_upload(session):
+    """Hash the assembled file, store or reuse its blob and attach it to the project"""
+    sha256 = hash_file(session.part_path)
+    if session.sha256 and sha256 != session.sha256:
+        discard_upload(session)
+        raise UploadError("Uploaded content does not match the declared SHA-256")
+
+    with open(session.part_path, 'rb') as part:
+        blob = store_blob(sha256, session.size, session.user, _PartFile(part))
+
+    with transaction.atomic():
+        project_file = attach_blob(
+            session.project, session.user, blob, session.filename, session.description
+        )
+        discard_upload(session)
+    return project_file
+
+
+def discard_upload(session):
+    if os.path.exists(session.part_path):
+        os.remove(session.part_path)
+    session.delete()
+
+
+def purge_stale_uploads(age=STALE_UPLOAD_AGE):
+    """Drop sessions, and their part files, that have not received a chunk in a while"""
+    stale = UploadSession.objects.filter(updated_at__lt=timezone.now() - age)
+    count = 0
+    for session in stale.iterator():
+        discard_upload(session)
+        count += 1
+    return count
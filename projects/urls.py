@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from . import views
+from . import async_views, views
 
 router = DefaultRouter()
 router.register(r'projects', views.ProjectViewSet, basename='project')
@@ -9,5 +9,9 @@ router.register(r'files', views.ProjectFileViewSet, basename='project-file')
 router.register(r'milestones', views.MilestoneViewSet, basename='milestone')
 
 urlpatterns = [
+    path('async/projects/', async_views.project_list, name='async-project-list'),
+    path('async/projects/<int:pk>/', async_views.project_detail, name='async-project-detail'),
+    path('async/bids/', async_views.bid_list, name='async-bid-list'),
+    path('async/bids/<int:pk>/', async_views.bid_detail, name='async-bid-detail'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -1,20 +1,53 @@
+from decimal import Decimal, InvalidOperation
+
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from django.db.models import Prefetch, Q
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.core.cache import cache
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from rest_framework.throttling import UserRateThrottle
 
-from .models import Project, ProjectBid, ProjectFile, Milestone
+from .access import ProjectAccess
+from .analytics import analytics_summary
+from .archive import archived_projects_for
+from .bidbook import BOOK_STATUSES, load_bid_book
+from .conditional import ConditionalMixin, ProjectValidators
+from .cache import listing_cache_key, get_cached_listing, set_cached_listing
+from .downloads import file_download_response, file_sha256
+from .export import EXPORTS, EXPORT_FORMATS, ExportError, parse_window, stream_export
+from .metrics import award_metrics, expiry_metrics
+from .models import (
+    Project, ProjectBid, ProjectFile, Milestone, UploadSession,
+    ArchivedProjectBid, ArchivedProjectFile, ArchivedMilestone
+)
+from .pricing import skill_prices
+from .pagination import (
+    ProjectCursorPagination, BidCursorPagination, MilestoneCursorPagination,
+    FileCursorPagination, SearchResultPagination
+)
+from .recommendations import recommend_projects
+from .search import search_projects
+from .thumbnails import THUMBNAIL_FORMAT_PATTERN, THUMBNAIL_SIZE_PATTERN, thumbnail_response
+from .visibility import filter_project_listing
+from .uploads import UploadError, UploadOffsetMismatch, start_upload, append_chunk, store_blob
+from .services import award_bid, AwardError, bulk_update_milestone_status, create_milestones
+from users.permissions import IsFreelancer
+from freelancerPlatform.replicas import ReplicaReadMixin, primary_reads
 from .serializers import (
     ProjectSerializer, ProjectListSerializer, ProjectBidSerializer,
-    ProjectFileSerializer, MilestoneSerializer, ProjectCreateSerializer
+    ProjectFileSerializer, MilestoneSerializer, ProjectCreateSerializer,
+    MilestoneBulkStatusSerializer, MilestoneBatchCreateSerializer, UploadSessionSerializer,
+    BidStatsSerializer, BidRankSerializer, AnalyticsQuerySerializer, AnalyticsSerializer,
+    SkillPriceStatsSerializer, ArchivedProjectSerializer,
+    NESTED_COLLECTION_LIMIT, CAPPED_ATTR
 )
 from .permissions import (
     IsProjectOwner, IsProjectParticipant, CanSubmitBid,
@@ -24,7 +57,35 @@ from .permissions import (
 import logging
 logger = logging.getLogger(__name__)
 
-class ProjectViewSet(viewsets.ModelViewSet):
+DEFAULT_TOP_BIDS = 5
+MAX_TOP_BIDS = 50
+MAX_PRICE_SKILLS = 20
+
+def nested_prefetches(expand, bids=ProjectBid, files=ProjectFile, milestones=Milestone):
+    """
+    Capped prefetches of a project's bids, files and milestones, for the
+    names in expand. Pass the archive models to prefetch an archived project.
+    """
+    collections = {
+        'bids': bids.objects.select_related('freelancer').order_by('amount', 'id'),
+        'files': files.objects.select_related('uploaded_by').order_by('-uploaded_at', '-id'),
+        'milestones': milestones.objects.order_by('due_date', 'id'),
+    }
+    return [
+        # Sliced prefetches of reverse relations need to_attr
+        Prefetch(name, queryset=queryset[:NESTED_COLLECTION_LIMIT], to_attr=CAPPED_ATTR.format(name))
+        for name, queryset in collections.items() if name in expand
+    ]
+
+
+def archived_prefetches(request):
+    return nested_prefetches(
+        ArchivedProjectSerializer.embedded_fields(request),
+        ArchivedProjectBid, ArchivedProjectFile, ArchivedMilestone
+    )
+
+
+class ProjectViewSet(ReplicaReadMixin, ConditionalMixin, viewsets.ModelViewSet):
     """
     ViewSet for handling project-related operations.
     """
@@ -33,6 +94,8 @@ class ProjectViewSet(viewsets.ModelViewSet):
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['title', 'description', 'required_skills__name']
     ordering_fields = ['created_at', 'deadline', 'budget_min', 'budget_max']
+    pagination_class = ProjectCursorPagination
+    validators = ProjectValidators()
 
     throttle_classes = [UserRateThrottle]
 
@@ -55,45 +118,74 @@ class ProjectViewSet(viewsets.ModelViewSet):
         if getattr(self, 'swagger_fake_view', False):
             return Project.objects.none()
 
-        queryset = Project.objects.select_related('client', 'freelancer') \
-            .prefetch_related('required_skills', 'bids', 'files', 'milestones')
-
-        # Cache handling
-        cache_key = f'projects_query_{self.request.user.id}_{str(self.request.query_params)}'
-        cached_queryset = cache.get(cache_key)
-        if cached_queryset is not None:
-            return cached_queryset
-
-        # Filter by status
-        status_param = self.request.query_params.get('status', None)
-        if status_param:
-            queryset = queryset.filter(status=status_param)
-
-        # Filter by skills
-        skills = self.request.query_params.getlist('skills')
-        if skills:
-            queryset = queryset.filter(required_skills__id__in=skills)
-
-        # Filter by budget range
-        budget_min = self.request.query_params.get('budget_min', None)
-        budget_max = self.request.query_params.get('budget_max', None)
-        if budget_min:
-            queryset = queryset.filter(budget_max__gte=budget_min)
-        if budget_max:
-            queryset = queryset.filter(budget_min__lte=budget_max)
-
-        # Role-based filtering
-        if self.request.user.role == 'FR':
-            queryset = queryset.filter(
-                Q(status='OPEN') |
-                Q(freelancer=self.request.user) |
-                Q(bids__freelancer=self.request.user)
-            ).distinct()
-        elif self.request.user.role == 'CL':
-            queryset = queryset.filter(client=self.request.user)
-
-        cache.set(cache_key, queryset, timeout=300)
-        return queryset
+        queryset = Project.objects.select_related('client', 'freelancer')
+        if self.action == 'list':
+            # ProjectListSerializer reads bid totals from the row itself
+            queryset = queryset.prefetch_related('required_skills')
+        else:
+            queryset = queryset.prefetch_related('required_skills', *self.get_nested_prefetches())
+
+        return filter_project_listing(queryset, self.request.user, self.request.query_params)
+
+    def get_nested_prefetches(self):
+        """Capped prefetches for the collections the response embeds"""
+        return nested_prefetches(ProjectSerializer.embedded_fields(self.request))
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            pass
+        # Long-finished projects live in the archive tables, read-only
+        queryset = archived_projects_for(request.user).prefetch_related(*archived_prefetches(request))
+        instance = get_object_or_404(queryset, pk=kwargs[self.lookup_field])
+        if self.validators.not_modified(request, instance):
+            return self.validators.apply(Response(status=status.HTTP_304_NOT_MODIFIED), instance)
+        serializer = ArchivedProjectSerializer(instance, context=self.get_serializer_context())
+        return self.validators.apply(Response(serializer.data), instance)
+
+    def paginated_collection(self, queryset, pagination_class, serializer_class):
+        """Page a project's sub-resource with its own keyset ordering"""
+        paginator = pagination_class()
+        # No view, so the project ordering filter does not apply here
+        page = paginator.paginate_queryset(queryset, self.request)
+        serializer = serializer_class(page, many=True, context=self.get_serializer_context())
+        return paginator.get_paginated_response(serializer.data)
+
+    def list(self, request, *args, **kwargs):
+        # Serve the rendered payload straight from the cache; hits run no SQL
+        cache_key = listing_cache_key(request.user, request.query_params)
+        payload = get_cached_listing(cache_key)
+        if payload is not None:
+            return Response(payload)
+
+        # The page is cached under the current generation, so it must not lag
+        with primary_reads():
+            if request.query_params.get('q'):
+                response = self.search_list(request)
+            else:
+                response = super().list(request, *args, **kwargs)
+        set_cached_listing(cache_key, response.data)
+        return response
+
+    def search_list(self, request):
+        """Rank the projects visible to the user against ?q= using the local inverted index"""
+        # Visibility is applied before ranking, so the candidate cap only drops
+        # matches the user could not see anyway
+        scores = dict(search_projects(
+            request.query_params['q'], projects=self.filter_queryset(self.get_queryset())
+        ))
+        # Best first, as search_projects returned them
+        ranked = list(scores)
+
+        paginator = SearchResultPagination()
+        page = paginator.paginate_queryset(ranked, request, view=self)
+        projects = self.get_queryset().in_bulk(page)
+
+        data = self.get_serializer([projects[pk] for pk in page if pk in projects], many=True).data
+        for item in data:
+            item['score'] = round(scores[item['id']], 4)
+        return paginator.get_paginated_response(data)
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -105,6 +197,105 @@ class ProjectViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(client=self.request.user)
 
+    @swagger_auto_schema(
+        operation_summary="Recommended Projects",
+        manual_parameters=[
+            openapi.Parameter('limit', openapi.IN_QUERY, type=openapi.TYPE_INTEGER)
+        ],
+        responses={
+            200: ProjectListSerializer(many=True),
+            403: "Forbidden - Not a freelancer"
+        }
+    )
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated, IsFreelancer])
+    def recommended(self, request):
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 100)
+        except ValueError:
+            limit = 20
+
+        ranked = recommend_projects(request.user, limit=limit)
+        projects = Project.objects.select_related('client') \
+            .prefetch_related('required_skills') \
+            .in_bulk([pk for pk, _ in ranked])
+
+        results = []
+        for pk, score in ranked:
+            if pk in projects:
+                item = ProjectListSerializer(projects[pk], context=self.get_serializer_context()).data
+                item['score'] = round(score, 4)
+                results.append(item)
+        return Response(results)
+
+    @swagger_auto_schema(
+        operation_summary="Export Projects, Bids or Milestones",
+        manual_parameters=[
+            openapi.Parameter('resource', openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=sorted(EXPORTS)),
+            openapi.Parameter('output', openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=sorted(EXPORT_FORMATS)),
+            openapi.Parameter('since', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATETIME),
+            openapi.Parameter('until', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATETIME),
+        ],
+        responses={
+            200: "NDJSON or CSV stream ordered by updated_at",
+            400: "Bad Request",
+            403: "Forbidden - Not an admin"
+        }
+    )
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def export(self, request):
+        # ?format= is reserved by DRF for renderer selection
+        export_format = request.query_params.get('output', 'ndjson')
+        try:
+            since, until = parse_window(
+                request.query_params.get('since'), request.query_params.get('until')
+            )
+            stream = stream_export(
+                request.query_params.get('resource', 'projects'), export_format, since, until
+            )
+        except ExportError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(
+            stream,
+            content_type='text/csv' if export_format == 'csv' else 'application/x-ndjson'
+        )
+        # Pass this back as ?since= to pull only what changed afterwards
+        response['X-Export-Until'] = until.isoformat()
+        return response
+
+    @swagger_auto_schema(
+        operation_summary="Project Bids",
+        responses={200: ProjectBidSerializer(many=True)}
+    )
+    @action(detail=True, methods=['get'], url_path='bids', url_name='bids')
+    def list_bids(self, request, pk=None):
+        project = self.get_object()
+        return self.paginated_collection(
+            project.bids.select_related('freelancer'), BidCursorPagination, ProjectBidSerializer
+        )
+
+    @swagger_auto_schema(
+        operation_summary="Project Files",
+        responses={200: ProjectFileSerializer(many=True)}
+    )
+    @action(detail=True, methods=['get'], url_path='files', url_name='files')
+    def list_files(self, request, pk=None):
+        project = self.get_object()
+        return self.paginated_collection(
+            project.files.select_related('uploaded_by'), FileCursorPagination, ProjectFileSerializer
+        )
+
+    @swagger_auto_schema(
+        operation_summary="Project Milestones",
+        responses={200: MilestoneSerializer(many=True)}
+    )
+    @action(detail=True, methods=['get'], url_path='milestones', url_name='milestones')
+    def list_milestones(self, request, pk=None):
+        project = self.get_object()
+        return self.paginated_collection(
+            project.milestones.all(), MilestoneCursorPagination, MilestoneSerializer
+        )
+
     @swagger_auto_schema(
         operation_summary="Submit Bid",
         request_body=ProjectBidSerializer,
@@ -117,6 +308,11 @@ class ProjectViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'], permission_classes=[CanSubmitBid])
     def submit_bid(self, request, pk=None):
         project = self.get_object()
+        if not ProjectAccess.for_request(request).can_bid(project):
+            return Response(
+                {"detail": "You cannot bid on this project"},
+                status=status.HTTP_403_FORBIDDEN
+            )
         serializer = ProjectBidSerializer(data=request.data)
 
         if serializer.is_valid():
@@ -142,26 +338,162 @@ class ProjectViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'], permission_classes=[IsProjectOwner])
     def accept_bid(self, request, pk=None):
         project = self.get_object()
-        bid_id = request.data.get('bid_id')
 
         try:
-            bid = project.bids.get(id=bid_id, status='PENDING')
-            bid.status = 'ACCEPTED'
-            bid.save()
+            award_bid(project.pk, int(request.data.get('bid_id')))
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'Invalid bid ID or bid already processed'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except AwardError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-            project.status = 'IN_PROGRESS'
-            project.freelancer = bid.freelancer
-            project.save()
+        return Response({'message': 'Bid accepted successfully'})
 
-            project.bids.exclude(id=bid_id).update(status='REJECTED')
+    @swagger_auto_schema(
+        operation_summary="Bid Award Metrics",
+        responses={
+            200: "Award attempt, conflict and lock wait counters",
+            403: "Forbidden - Not an admin"
+        }
+    )
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def award_metrics(self, request):
+        return Response(award_metrics())
+
+    @swagger_auto_schema(
+        operation_summary="Deadline Expiry Metrics",
+        responses={
+            200: "Expired project, withdrawn bid and notification counters and the last run",
+            403: "Forbidden - Not an admin"
+        }
+    )
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def expiry_metrics(self, request):
+        return Response(expiry_metrics())
+
+    @swagger_auto_schema(
+        operation_summary="Marketplace Analytics",
+        query_serializer=AnalyticsQuerySerializer,
+        responses={
+            200: AnalyticsSerializer,
+            400: "Bad Request - Invalid date range",
+            403: "Forbidden - Not an admin"
+        }
+    )
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def analytics(self, request):
+        query = AnalyticsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        summary = analytics_summary(
+            query.validated_data['start'],
+            query.validated_data['end'],
+            query.validated_data.get('skill')
+        )
+        return Response(AnalyticsSerializer(summary).data)
 
-            return Response({'message': 'Bid accepted successfully'})
-        except ProjectBid.DoesNotExist:
+    @swagger_auto_schema(
+        operation_summary="Bid Prices per Skill",
+        manual_parameters=[
+            openapi.Parameter('skills', openapi.IN_QUERY, type=openapi.TYPE_ARRAY,
+                              items=openapi.Items(type=openapi.TYPE_INTEGER), required=True,
+                              description=f'Skill IDs, at most {MAX_PRICE_SKILLS}')
+        ],
+        responses={
+            200: SkillPriceStatsSerializer(many=True),
+            400: "Bad Request - Missing or invalid skill IDs"
+        }
+    )
+    @action(detail=False, methods=['get'])
+    def bid_prices(self, request):
+        try:
+            skill_ids = sorted({int(skill) for skill in request.query_params.getlist('skills')})
+        except ValueError:
+            return Response({'error': 'Skill IDs must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+        if not skill_ids or len(skill_ids) > MAX_PRICE_SKILLS:
             return Response(
-                {'error': 'Invalid bid ID or bid already processed'},
+                {'error': f'Provide between 1 and {MAX_PRICE_SKILLS} skill IDs'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        prices = skill_prices(skill_ids)
+        data = [{'skill': skill_id, **prices[skill_id]} for skill_id in skill_ids]
+        return Response(SkillPriceStatsSerializer(data, many=True).data)
+
+    @swagger_auto_schema(
+        operation_summary="Bid Statistics",
+        manual_parameters=[
+            openapi.Parameter('top', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description='Number of lowest bids to include (owner only)')
+        ],
+        responses={
+            200: BidStatsSerializer,
+            403: "Forbidden - Not project participant"
+        }
+    )
+    @action(detail=True, methods=['get'])
+    def bid_stats(self, request, pk=None):
+        project = self.get_object()
+        access = ProjectAccess.for_request(request)
+        if not access.is_participant(project.id):
+            return Response(
+                {"detail": "Only project participants can see bid statistics"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        book = load_bid_book(project.id)
+        data = book.stats()
+        data['your_rank'] = book.rank_of_freelancer(request.user.id)
+        if access.is_client(project.id):
+            try:
+                top = min(max(int(request.query_params.get('top', DEFAULT_TOP_BIDS)), 0), MAX_TOP_BIDS)
+            except ValueError:
+                top = DEFAULT_TOP_BIDS
+            bid_ids = book.top(top)
+            bids = ProjectBid.objects.select_related('freelancer').in_bulk(bid_ids)
+            data['top_bids'] = [bids[bid_id] for bid_id in bid_ids if bid_id in bids]
+        return Response(BidStatsSerializer(data, context=self.get_serializer_context()).data)
+
+    @swagger_auto_schema(
+        operation_summary="Bid Rank",
+        manual_parameters=[
+            openapi.Parameter('amount', openapi.IN_QUERY, type=openapi.TYPE_NUMBER,
+                              description="Amount to rank; defaults to the user's own bid")
+        ],
+        responses={
+            200: BidRankSerializer,
+            400: "Bad Request",
+            403: "Forbidden - Not project participant"
+        }
+    )
+    @action(detail=True, methods=['get'])
+    def rank(self, request, pk=None):
+        project = self.get_object()
+        if not ProjectAccess.for_request(request).is_participant(project.id):
+            return Response(
+                {"detail": "Only project participants can see bid ranks"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        book = load_bid_book(project.id)
+        amount = request.query_params.get('amount')
+        if amount is None:
+            amount = book.freelancer_amounts.get(request.user.id)
+        else:
+            try:
+                amount = Decimal(amount)
+            except InvalidOperation:
+                return Response({'error': 'amount must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+            if not amount.is_finite():
+                return Response({'error': 'amount must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(BidRankSerializer({
+            'amount': amount,
+            'rank': None if amount is None else book.rank_of_amount(amount),
+            'count': len(book),
+        }).data)
+
     @swagger_auto_schema(
         operation_summary="Complete Project",
         responses={
@@ -181,17 +513,19 @@ class ProjectViewSet(viewsets.ModelViewSet):
             )
 
         project.status = 'COMPLETED'
+        project.completed_at = timezone.now()
         project.save()
         return Response({'message': 'Project marked as completed'})
 
 
 
-class ProjectBidViewSet(viewsets.ModelViewSet):
+class ProjectBidViewSet(ConditionalMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing project bids.
     """
     serializer_class = ProjectBidSerializer
     permission_classes = [CanSubmitBid]
+    pagination_class = BidCursorPagination
 
     def get_queryset(self):
 
@@ -258,6 +592,21 @@ class ProjectBidViewSet(viewsets.ModelViewSet):
         bid.save()
         return Response({"detail": "Bid withdrawn successfully"})
 
+    @swagger_auto_schema(
+        operation_summary="Bid Rank",
+        responses={200: BidRankSerializer}
+    )
+    @action(detail=True, methods=['get'])
+    def rank(self, request, pk=None):
+        bid = self.get_object()
+        book = load_bid_book(bid.project_id)
+        # Withdrawn and rejected bids are not in the book
+        return Response(BidRankSerializer({
+            'amount': bid.amount,
+            'rank': book.rank_of_amount(bid.amount) if bid.status in BOOK_STATUSES else None,
+            'count': len(book),
+        }).data)
+
 class ProjectFileViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing project files.
@@ -275,15 +624,150 @@ class ProjectFileViewSet(viewsets.ModelViewSet):
         ).select_related('project', 'uploaded_by')
 
     def perform_create(self, serializer):
-        serializer.save(uploaded_by=self.request.user)
+        upload = serializer.validated_data['file']
+        # Plain uploads are stored content-addressed too, sharing blobs and thumbnails
+        blob = store_blob(file_sha256(upload), upload.size, self.request.user, upload)
+        serializer.save(
+            uploaded_by=self.request.user,
+            blob=blob,
+            file=blob.file.name,
+            filename=upload.name,
+            size=upload.size
+        )
+
+    @swagger_auto_schema(
+        operation_summary="Download File",
+        responses={
+            200: "File content",
+            206: "Requested byte range",
+            304: "Not Modified",
+            416: "Range Not Satisfiable"
+        }
+    )
+    @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
+    def download(self, request, pk=None):
+        # get_queryset only holds files of the user's own projects
+        project_file = self.get_object()
+        return file_download_response(
+            request, project_file.file.storage, project_file.file.name,
+            project_file.etag, project_file.filename or None
+        )
 
+    @swagger_auto_schema(
+        operation_summary="Image Thumbnail",
+        responses={
+            200: "Thumbnail image",
+            304: "Not Modified",
+            404: "Not an image, or the thumbnail has not been rendered yet"
+        }
+    )
+    @action(
+        detail=True,
+        methods=['get'],
+        permission_classes=[IsAuthenticated],
+        url_path=rf'thumbnails/(?P<size>{THUMBNAIL_SIZE_PATTERN})\.(?P<ext>{THUMBNAIL_FORMAT_PATTERN})'
+    )
+    def thumbnail(self, request, pk=None, size=None, ext=None):
+        project_file = self.get_object()
+        response = None
+        if project_file.blob_id:
+            response = thumbnail_response(request, project_file.blob_id, size, ext)
+        if response is None:
+            return Response({"detail": "Thumbnail not available"}, status=status.HTTP_404_NOT_FOUND)
+        return response
 
-class MilestoneViewSet(viewsets.ModelViewSet):
+    @swagger_auto_schema(
+        operation_summary="Start Resumable Upload",
+        request_body=UploadSessionSerializer,
+        responses={
+            201: "Upload session, or the attached file when the declared SHA-256 is already stored",
+            400: "Bad Request",
+            403: "Forbidden - Not project participant"
+        }
+    )
+    @action(detail=False, methods=['post'], url_path='uploads')
+    def start_upload(self, request):
+        serializer = UploadSessionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        project = serializer.validated_data['project']
+        if request.user.id not in (project.client_id, project.freelancer_id):
+            return Response(
+                {"detail": "Only project participants can upload files"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        project_file, session = start_upload(
+            project,
+            request.user,
+            serializer.validated_data['filename'],
+            serializer.validated_data['size'],
+            sha256=serializer.validated_data.get('sha256', ''),
+            description=serializer.validated_data.get('description', ''),
+        )
+        if project_file is not None:
+            data = ProjectFileSerializer(project_file, context=self.get_serializer_context()).data
+            return Response({'deduplicated': True, 'file': data}, status=status.HTTP_201_CREATED)
+        return Response(UploadSessionSerializer(session).data, status=status.HTTP_201_CREATED)
+
+    @swagger_auto_schema(
+        methods=['patch'],
+        operation_summary="Upload Chunk",
+        manual_parameters=[
+            openapi.Parameter('Upload-Offset', openapi.IN_HEADER, type=openapi.TYPE_INTEGER, required=True)
+        ],
+        responses={
+            200: UploadSessionSerializer,
+            201: ProjectFileSerializer,
+            400: "Bad Request",
+            409: "Conflict - Offset does not match the stored length"
+        }
+    )
+    @action(detail=False, methods=['get', 'patch'], url_path=r'uploads/(?P<upload_id>[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})')
+    def upload_chunk(self, request, upload_id=None):
+        """GET reports the stored offset to resume from; PATCH appends the raw request body"""
+        if request.method == 'GET':
+            try:
+                session = UploadSession.objects.get(pk=upload_id, user=request.user)
+            except UploadSession.DoesNotExist:
+                return Response({"detail": "Upload not found"}, status=status.HTTP_404_NOT_FOUND)
+            return Response(UploadSessionSerializer(session).data)
+
+        try:
+            offset = int(request.headers['Upload-Offset'])
+        except (KeyError, ValueError):
+            return Response(
+                {"detail": "Upload-Offset header is required"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            # Read the raw stream; touching request.data would buffer the chunk
+            project_file, session = append_chunk(upload_id, request.user, offset, request._request)
+        except UploadSession.DoesNotExist:
+            return Response({"detail": "Upload not found"}, status=status.HTTP_404_NOT_FOUND)
+        except UploadOffsetMismatch as e:
+            return Response(
+                {"detail": str(e), "offset": e.offset},
+                status=status.HTTP_409_CONFLICT
+            )
+        except UploadError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if project_file is None:
+            return Response(UploadSessionSerializer(session).data)
+        data = ProjectFileSerializer(project_file, context=self.get_serializer_context()).data
+        return Response({'deduplicated': False, 'file': data}, status=status.HTTP_201_CREATED)
+
+
+class MilestoneViewSet(ConditionalMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing project milestones.
     """
     serializer_class = MilestoneSerializer
     permission_classes = [IsAuthenticated, CanManageMilestones]
+    pagination_class = MilestoneCursorPagination
 
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
@@ -296,8 +780,8 @@ class MilestoneViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         project = serializer.validated_data['project']
-        if project.client != self.request.user:
-            raise PermissionError("Only project owner can create milestones")
+        if not ProjectAccess.for_request(self.request).is_client(project.id):
+            raise PermissionDenied("Only project owner can create milestones")
         serializer.save()
 
     @swagger_auto_schema(
@@ -322,4 +806,49 @@ class MilestoneViewSet(viewsets.ModelViewSet):
         milestone.completed_at = timezone.now()
         milestone.save()
 
-        return Response({'message': 'Milestone marked as completed'})
\ No newline at end of file
+        return Response({'message': 'Milestone marked as completed'})
+
+    @swagger_auto_schema(
+        operation_summary="Bulk Create Milestones",
+        request_body=MilestoneBatchCreateSerializer,
+        responses={
+            201: MilestoneSerializer(many=True),
+            400: "Bad Request",
+            403: "Forbidden - Not project owner"
+        }
+    )
+    @action(detail=False, methods=['post'])
+    def bulk_create(self, request):
+        serializer = MilestoneBatchCreateSerializer(data=request.data, context={'request': request})
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        milestones = create_milestones(serializer.validated_data['project'], serializer.validated_data['milestones'])
+        return Response(
+            MilestoneSerializer(milestones, many=True).data,
+            status=status.HTTP_201_CREATED
+        )
+
+    @swagger_auto_schema(
+        operation_summary="Bulk Update Milestone Status",
+        request_body=MilestoneBulkStatusSerializer,
+        responses={
+            200: "Number of milestones updated and projects completed",
+            400: "Bad Request"
+        }
+    )
+    @action(detail=False, methods=['post'])
+    def bulk_status(self, request):
+        serializer = MilestoneBulkStatusSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        # Only the project owner may change statuses, as for single updates;
+        # get_queryset() would also admit the awarded freelancer
+        milestones = Milestone.objects.filter(
+            project__client=request.user, pk__in=serializer.validated_data['ids']
+        )
+        updated, completed = bulk_update_milestone_status(
+            milestones, serializer.validated_data['status']
+        )
+        return Response({'updated': updated, 'completed_projects': completed})
@@ -0,0 +1,92 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Q
+
+from .models import Project, ProjectBid
+
+VISIBILITY_JOIN = 'join'
+VISIBILITY_UNION = 'union'
+VISIBILITY_STRATEGIES = (VISIBILITY_JOIN, VISIBILITY_UNION)
+
+
+def freelancer_project_ids(user):
+    """
+    IDs of projects the freelancer was awarded or bid on. Each branch is
+    answered from its own freelancer index and UNION removes duplicates,
+    so no join against the bids table reaches the outer query.
+    """
+    return Project.objects.order_by().filter(freelancer=user).values('id').union(
+        ProjectBid.objects.order_by().filter(freelancer=user).values('project_id')
+    )
+
+
+def filter_visible_to_freelancer(queryset, user, strategy=None):
+    """
+    Restrict projects to those a freelancer may see: open ones, plus any
+    they were awarded or bid on.
+
+    'join' is the original OR across a join on bids, which needs DISTINCT
+    and sorts every joined row. 'union' keeps the open-status predicate on
+    the project row and checks membership in the small per-user UNION; this
+    filterable form serves counts, lookups and further filters, while
+    listing pages are read per branch (see freelancer_listing_branches).
+    """
+    strategy = strategy or settings.PROJECT_VISIBILITY_STRATEGY
+    if strategy == VISIBILITY_JOIN:
+        return queryset.filter(
+            Q(status='OPEN') |
+            Q(freelancer=user) |
+            Q(bids__freelancer=user)
+        ).distinct()
+    if strategy == VISIBILITY_UNION:
+        return queryset.filter(Q(status='OPEN') | Q(pk__in=freelancer_project_ids(user)))
+    raise ImproperlyConfigured(
+        f"PROJECT_VISIBILITY_STRATEGY must be one of {', '.join(VISIBILITY_STRATEGIES)}"
+    )
+
+
+def freelancer_listing_branches(user, strategy=None):
+    """
+    The two halves of a freelancer's listing under the 'union' strategy:
+    open projects, read from the partial open-listing index, and their own
+    projects. Paging each up to the page size and merging the rows is a
+    UNION of two LIMITed listing queries, where the OR on one query makes
+    the planner collect and sort every open project.
+    """
+    if getattr(user, 'role', None) != 'FR':
+        return None
+    if (strategy or settings.PROJECT_VISIBILITY_STRATEGY) != VISIBILITY_UNION:
+        return None
+    return [Q(status='OPEN'), Q(pk__in=freelancer_project_ids(user))]
+
+
+def filter_project_listing(queryset, user, query_params):
+    """Apply the ?status=, ?skills= and ?budget_* filters and the user's role scope"""
+    # Filter by status
+    status_param = query_params.get('status', None)
+    if status_param:
+        queryset = queryset.filter(status=status_param)
+
+    # Filter by skills
+    skills = query_params.getlist('skills')
+    if skills:
+        # A subquery rather than a join, so projects with several matching skills appear once
+        queryset = queryset.filter(pk__in=Project.required_skills.through.objects.filter(
+            skill_id__in=skills
+        ).values('project_id'))
+
+    # Filter by budget range
+    budget_min = query_params.get('budget_min', None)
+    budget_max = query_params.get('budget_max', None)
+    if budget_min:
+        queryset = queryset.filter(budget_max__gte=budget_min)
+    if budget_max:
+        queryset = queryset.filter(budget_min__lte=budget_max)
+
+    # Role-based filtering
+    if user.role == 'FR':
+        queryset = filter_visible_to_freelancer(queryset, user)
+    elif user.role == 'CL':
+        queryset = queryset.filter(client=user)
+
+    return queryset
@@ -0,0 +1,59 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import check_password, make_password
+from django.db import connections
+from django.db.models import Case, IntegerField, Value, When
+
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+# Re-hashing costs as much as a login; it runs here instead of in the request
+_hash_upgrades = ThreadPoolExecutor(max_workers=2, thread_name_prefix='password-upgrade')
+
+
+def upgrade_password_hash(user_id, old_encoded, raw_password):
+    """
+    Store raw_password under the preferred hasher, unless the password was
+    changed since old_encoded was read.
+    """
+    try:
+        User.objects.filter(pk=user_id, password=old_encoded).update(password=make_password(raw_password))
+    except Exception:
+        logger.exception('Password hash upgrade failed for user %s', user_id)
+    finally:
+        connections.close_all()
+
+
+class UsernameOrEmailBackend(ModelBackend):
+    """
+    Authenticate with a username or an email address, matched without
+    regard to case by a single query that the Upper() indexes on User serve.
+    """
+
+    def authenticate(self, request, username=None, password=None, login=None, **kwargs):
+        login = login or username or kwargs.get(User.USERNAME_FIELD)
+        if not login or password is None:
+            return None
+
+        field = 'email' if '@' in login else 'username'
+        user = User._default_manager.filter(**{f'{field}__iexact': login}).order_by(
+            # Prefer an exact match should two accounts differ only by case
+            Case(When(**{field: login}, then=Value(0)), default=Value(1), output_field=IntegerField()),
+            'pk'
+        ).first()
+        if user is None:
+            # Hash anyway, so unknown logins take as long as wrong passwords
+            make_password(password)
+            return None
+
+        encoded = user.password
+
+        def setter(raw_password):
+            _hash_upgrades.submit(upgrade_password_hash, user.pk, encoded, raw_password)
+
+        if check_password(password, encoded, setter) and self.user_can_authenticate(user):
+            return user
+        return None
@@ -0,0 +1,85 @@
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from users.models import User
+
+USERNAME_PREFIX = 'login-bench-'
+PASSWORD = 'benchmark-password'
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure login throughput and latency by username and by email on a "
+        "generated set of users, then delete them"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10_000)
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--batch-size', type=int, default=5_000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        # Lets the test client's Host through and keeps any mail in memory
+        setup_test_environment()
+        try:
+            usernames = self.generate(options['users'], options['batch_size'])
+            for label, login in (('username', str.upper), ('email', lambda name: f'{name}@EXAMPLE.com')):
+                logins = [login(random.choice(usernames)) for _ in range(options['requests'])]
+                self.report(label, logins, options['threads'])
+        finally:
+            User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
+            teardown_test_environment()
+
+    def generate(self, total, batch_size):
+        started = time.perf_counter()
+        # One hash shared by every user; hashing each would dominate the setup
+        password = make_password(PASSWORD)
+        usernames = [f'{USERNAME_PREFIX}{i}' for i in range(total)]
+        User.objects.bulk_create([
+            User(username=name, email=f'{name}@example.com', password=password)
+            for name in usernames
+        ], batch_size=batch_size)
+        self.stdout.write(f"Generated {total} user(s) in {time.perf_counter() - started:.1f}s")
+        return usernames
+
+    def report(self, label, logins, threads):
+        url = reverse('token_obtain_pair')
+        with CaptureQueriesContext(connection) as queries:
+            Client().post(url, {'login': logins[0], 'password': PASSWORD})
+
+        local = threading.local()
+
+        def login(value):
+            if not hasattr(local, 'client'):
+                local.client = Client()
+            started = time.perf_counter()
+            response = local.client.post(url, {'login': value, 'password': PASSWORD})
+            return time.perf_counter() - started, response.status_code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            results = list(executor.map(login, logins))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency for latency, _ in results)
+        failures = sum(1 for _, status_code in results if status_code != 200)
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\n== by {label}, {threads} thread(s) =="))
+        self.stdout.write(
+            f"{len(results) / elapsed:.0f} logins/s, "
+            f"p50 {statistics.median(latencies) * 1000:.1f} ms, "
+            f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f} ms, "
+            f"{len(queries)} query(ies) per login, {failures} failure(s)"
+        )
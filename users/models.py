@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import MinValueValidator, MaxValueValidator
 
@@ -88,6 +89,11 @@ class User(AbstractUser):
     class Meta:
             verbose_name = _('user')
             verbose_name_plural = _('users')
+            indexes = [
+                # Case-insensitive login lookups; PostgreSQL compares iexact as UPPER(col)
+                models.Index(Upper('username'), name='user_username_upper_idx'),
+                models.Index(Upper('email'), name='user_email_upper_idx'),
+            ]
 
 class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
@@ -81,30 +81,15 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
                 'detail': 'Both login and password are required.'
             })
 
-            # Try to find the user
-        if '@' in login:
-            user = User.objects.filter(email=login).first()
-        else:
-            user = User.objects.filter(username=login).first()
-
+        # One lookup by username or email, see users.backends
+        user = authenticate(self.context.get('request'), login=login, password=password)
         if not user:
             raise serializers.ValidationError({
                 'detail': 'No active account found with the given credentials.'
             })
 
-            # Authenticate the user
-        authenticated_user = authenticate(
-            username=user.username,
-            password=password
-        )
-
-        if not authenticated_user:
-            raise serializers.ValidationError({
-                'detail': 'Invalid credentials.'
-            })
-
         # Create the token
-        refresh = self.get_token(authenticated_user)
+        refresh = self.get_token(user)
         return {
             'refresh': str(refresh),
             'access': str(refresh.access_token)
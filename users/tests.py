@@ -1,3 +1,69 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.hashers import make_password
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from users import backends
+from users.models import User
+
+
+class LoginTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='loginuser',
+            email='Login.User@example.com',
+            password='testpass123',
+            role='FR'
+        )
+        self.url = reverse('token_obtain_pair')
+
+    def test_login_by_username_or_email_in_one_query(self):
+        """Test either identifier logs in, ignoring case, with a single user lookup"""
+        for login in ('loginuser', 'LOGINUSER', 'login.user@EXAMPLE.com'):
+            with self.assertNumQueries(1):
+                response = self.client.post(self.url, {'login': login, 'password': 'testpass123'})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertIn('access', response.data)
+
+        for login, password in (('loginuser', 'wrong'), ('nobody', 'testpass123')):
+            response = self.client.post(self.url, {'login': login, 'password': password})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_login_prints_nothing(self):
+        """Test the login path writes no request data to stdout"""
+        with mock.patch('builtins.print') as print_:
+            self.client.post(self.url, {'login': 'loginuser', 'password': 'testpass123'})
+            self.client.post(self.url, {'login': 'loginuser', 'password': 'wrong'})
+        self.assertFalse(print_.called)
+
+    @override_settings(PASSWORD_HASHERS=[
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+    ])
+    def test_outdated_hash_is_upgraded_off_the_request(self):
+        """Test a legacy hash is queued for upgrade, and a changed password is not overwritten"""
+        legacy = make_password('testpass123', hasher='md5')
+        User.objects.filter(pk=self.user.pk).update(password=legacy)
+
+        with mock.patch.object(backends._hash_upgrades, 'submit') as submit:
+            response = self.client.post(self.url, {'login': 'loginuser', 'password': 'testpass123'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password, legacy)
+
+        job, *args = submit.call_args.args
+        with mock.patch.object(backends.connections, 'close_all'):
+            job(*args)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$'))
+        self.assertTrue(self.user.check_password('testpass123'))
+
+        # A stale upgrade leaves the newer password alone
+        upgraded = self.user.password
+        with mock.patch.object(backends.connections, 'close_all'):
+            job(*args)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password, upgraded)
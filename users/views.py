@@ -20,6 +20,7 @@ from django.views.decorators.cache import cache_page
 from rest_framework.throttling import UserRateThrottle, AnonRateThrottle
 
 from .utils import verify_token
+from freelancerPlatform.replicas import ReplicaReadMixin
 
 
 class UserViewSet(viewsets.ModelViewSet):
@@ -75,13 +76,11 @@ class LoginView(TokenObtainPairView):
         }
     )
     def post(self, request, *args, **kwargs):
-        print(f"Received login data: {request.data}")  # Debug print
         serializer = self.get_serializer(data=request.data)
 
         try:
             serializer.is_valid(raise_exception=True)
-        except Exception as e:
-            print(f"Validation error: {str(e)}")  # Debug print
+        except Exception:
             return Response(
                 {"detail": "Invalid credentials"},
                 status=status.HTTP_400_BAD_REQUEST
@@ -89,7 +88,7 @@ class LoginView(TokenObtainPairView):
 
         return Response(serializer.validated_data, status=status.HTTP_200_OK)
 
-class SkillViewSet(viewsets.ModelViewSet):
+class SkillViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     queryset = Skill.objects.all()
     serializer_class = SkillSerializer
     permission_classes = [IsAuthenticated]